@@ -0,0 +1,5 @@
+"""Benchmarks
+Times docker-pretty-ps's pipeline against synthetic `docker ps` output, from a handful of containers up to very large
+hosts. Run with `python -m benchmarks.run`.
+
+"""
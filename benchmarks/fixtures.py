@@ -0,0 +1,227 @@
+"""Fixtures
+Generates realistic `docker ps -a` output for any number of containers, in both the text table and the
+`--format '{{json .}}'` forms. Containers get a seeded mix of running, healthy, unhealthy, starting, paused,
+restarting, exited and created states, with anything from no ports to long lists of published ports and ranges, so
+the same seed always gives the same output.
+
+"""
+import json
+import random
+
+HEADERS = ["CONTAINER ID", "IMAGE", "COMMAND", "CREATED", "STATUS", "PORTS", "NAMES"]
+
+# Docker pads each column to it's widest value, plus this many spaces.
+COLUMN_PADDING = 3
+
+# Docker truncates commands past this many characters, ending them with an ellipsis.
+COMMAND_WIDTH = 20
+
+IMAGES = [
+    "nginx:latest",
+    "postgres:11",
+    "redis:5-alpine",
+    "diginc/pi-hole:latest",
+    "puckel/docker-airflow",
+    "owncloud/server:latest",
+    "tvial/docker-mailserver:latest",
+    "danielguerra/alpine-sshd",
+    "registry.example.com/team/web:2019.01.15",
+    "prom/prometheus:v2.6.0",
+]
+
+COMMANDS = [
+    "nginx -g 'daemon off;'",
+    "docker-entrypoint.sh postgres",
+    "docker-entrypoint.sh redis-server",
+    "/s6-init",
+    "/entrypoint.sh airflow webserver",
+    "/usr/bin/entrypoint /usr/bin/owncloud server",
+    "supervisord -c /etc/supervisor/supervisord.conf",
+    "/usr/sbin/sshd -D",
+    "gunicorn -b 0.0.0.0:5000 app:app",
+    "/bin/prometheus --config.file=/etc/prometheus/prometheus.yml",
+]
+
+PROJECTS = ["web", "api", "billing", "airflow", "pihole", "mail", "metrics", "search", "auth", "queue"]
+SERVICES = ["app", "worker", "db", "cache", "proxy", "scheduler", "exporter", "sshd"]
+
+AGE_UNITS = ["seconds", "minutes", "hours", "days", "weeks", "months"]
+
+# The share of containers in each state, roughly like a busy shared host.
+STATES = [
+    ("up", 40),
+    ("healthy", 20),
+    ("unhealthy", 4),
+    ("starting", 2),
+    ("paused", 2),
+    ("restarting", 4),
+    ("exited", 23),
+    ("created", 5),
+]
+
+
+def generate_containers(count, seed=0):
+    """
+    Generates the fields docker ps would print for a number of containers.
+    Unit tested: test_generate_containers
+
+    :param count: The number of containers.
+    :type count: int
+    :param seed: Seed for the random choices, the same seed always gives the same containers.
+    :type seed: int
+    :returns: The containers, as dicts keyed like `docker ps --format '{{json .}}'`.
+    :rtype: list
+    """
+    rng = random.Random(seed)
+    states = [state for state, _ in STATES]
+    weights = [weight for _, weight in STATES]
+    containers = []
+    for i in range(count):
+        container_id = "%064x" % rng.getrandbits(256)
+        state = rng.choices(states, weights)[0]
+        containers.append({
+            "ID": container_id,
+            "Image": rng.choice(IMAGES),
+            "Command": '"%s"' % rng.choice(COMMANDS),
+            "CreatedAt": "2019-01-%02d %02d:%02d:%02d -0700 MST" % (
+                rng.randint(1, 15), rng.randint(0, 23), rng.randint(0, 59), rng.randint(0, 59)),
+            "RunningFor": _ago(rng, "%s ago"),
+            "Status": _status(rng, state),
+            "Ports": _ports(rng) if state not in ["exited", "created"] else "",
+            "Names": "%s_%s_%s" % (rng.choice(PROJECTS), rng.choice(SERVICES), i + 1),
+        })
+    return containers
+
+
+def generate_ps_output(count, seed=0):
+    """
+    Generates `docker ps -a` text table output, as read by clean_output().
+    Unit tested: test_generate_ps_output
+
+    :param count: The number of containers.
+    :type count: int
+    :param seed: Seed for the random choices.
+    :type seed: int
+    :returns: The text table, header included.
+    :rtype: str
+    """
+    rows = []
+    for container in generate_containers(count, seed):
+        command = container["Command"][1:-1]
+        if len(command) > COMMAND_WIDTH:
+            command = command[:COMMAND_WIDTH - 1] + "…"
+        rows.append([
+            container["ID"][:12],
+            container["Image"],
+            '"%s"' % command,
+            container["RunningFor"],
+            container["Status"],
+            container["Ports"],
+            container["Names"]])
+
+    widths = [len(header) for header in HEADERS]
+    for row in rows:
+        for column, value in enumerate(row):
+            widths[column] = max(widths[column], len(value))
+
+    lines = [_ps_line(HEADERS, widths)]
+    for row in rows:
+        lines.append(_ps_line(row, widths))
+    return "\n".join(lines) + "\n"
+
+
+def generate_json_output(count, seed=0):
+    """
+    Generates `docker ps -a --no-trunc --format '{{json .}}'` output, as read by clean_json_output().
+    Unit tested: test_generate_json_output
+
+    :param count: The number of containers.
+    :type count: int
+    :param seed: Seed for the random choices.
+    :type seed: int
+    :returns: One JSON object per container per line.
+    :rtype: str
+    """
+    lines = []
+    for container in generate_containers(count, seed):
+        lines.append(json.dumps(container, sort_keys=True))
+    return "\n".join(lines) + "\n"
+
+
+def _ps_line(values, widths):
+    """
+    Lays out one line of the docker ps table, the last column unpadded.
+
+    :param values: The column values.
+    :type values: list
+    :param widths: The column widths.
+    :type widths: list
+    :rtype: str
+    """
+    padded = [value.ljust(width + COLUMN_PADDING) for value, width in zip(values[:-1], widths)]
+    return "".join(padded) + values[-1]
+
+
+def _ago(rng, template):
+    """
+    Creates a humanized duration like docker prints, ie "5 weeks ago" or "About an hour ago".
+
+    :param rng: The random number generator.
+    :type rng: <Random obj>
+    :param template: Where the duration goes, ie "%s ago".
+    :type template: str
+    :rtype: str
+    """
+    unit = rng.choice(AGE_UNITS)
+    amount = rng.randint(1, 59)
+    if amount == 1:
+        return template % ("About an hour" if unit == "hours" else "About a minute")
+    return template % ("%s %s" % (amount, unit))
+
+
+def _status(rng, state):
+    """
+    Creates a docker ps status for a container state.
+
+    :param rng: The random number generator.
+    :type rng: <Random obj>
+    :param state: One of the STATES.
+    :type state: str
+    :rtype: str
+    """
+    if state == "up":
+        return _ago(rng, "Up %s")
+    elif state in ["healthy", "unhealthy"]:
+        return _ago(rng, "Up %%s (%s)" % state)
+    elif state == "starting":
+        return _ago(rng, "Up %s (health: starting)")
+    elif state == "paused":
+        return _ago(rng, "Up %s (Paused)")
+    elif state == "restarting":
+        return _ago(rng, "Restarting (%s) %%s ago" % rng.choice([1, 2, 137]))
+    elif state == "exited":
+        return _ago(rng, "Exited (%s) %%s ago" % rng.choice([0, 0, 0, 1, 137, 143]))
+
+    return "Created"
+
+
+def _ports(rng):
+    """
+    Creates a docker ps ports column, from nothing up to many published ports and ranges.
+
+    :param rng: The random number generator.
+    :type rng: <Random obj>
+    :rtype: str
+    """
+    ports = []
+    for _ in range(rng.choice([0, 0, 1, 1, 1, 2, 3, 6])):
+        private = rng.choice([22, 53, 80, 443, 5000, 5432, 6379, 8080, 9090])
+        kind = rng.random()
+        if kind < 0.3:
+            ports.append("%s/tcp" % private)
+        elif kind < 0.9:
+            ports.append("0.0.0.0:%s->%s/%s" % (rng.randint(1024, 65000), private, rng.choice(["tcp", "tcp", "udp"])))
+        else:
+            low = rng.randint(1024, 60000)
+            ports.append("0.0.0.0:%s-%s->%s-%s/tcp" % (low, low + 3, low, low + 3))
+    return ", ".join(ports)
@@ -0,0 +1,385 @@
+"""Run
+Times each stage of the docker-pretty-ps pipeline, and the CLI from start to finish, against synthetic `docker ps`
+output of growing sizes. Results are written as JSON, and compared against a stored baseline to catch regressions.
+
+    python -m benchmarks.run --sizes 10,1000,10000 --output bench.json
+    python -m benchmarks.run --save-baseline benchmarks/baseline.json
+    python -m benchmarks.run --baseline benchmarks/baseline.json --threshold 0.25
+
+Each stage is timed as the best of --repeat runs, which is the run least disturbed by anything else on the machine.
+
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+
+import dockerprettyps
+from dockerprettyps import search
+from dockerprettyps import where
+from benchmarks import fixtures
+
+DEFAULT_SIZES = [10, 1000, 10000, 100000]
+
+# Stages quicker than this in both runs are left out of comparisons, their timings are mostly noise.
+MIN_COMPARE_SECONDS = 0.001
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Stands in for the docker cli in the end to end run, printing the fixture for `docker ps`.
+FAKE_DOCKER = """#!/bin/sh
+if [ "$1" = "ps" ]; then
+    cat "%(fixture)s"
+else
+    echo "%(total)s %(running)s 0"
+fi
+"""
+
+
+def main():
+    """
+    Runs the benchmarks from the command line.
+
+    """
+    args = _parsed_args()
+    sizes = [int(size) for size in args.sizes.split(",")]
+    results = run_benchmarks(sizes, args.repeat, not args.no_cli)
+
+    print(format_results(results))
+    print(format_ingest_comparison(results))
+    if args.output:
+        _write_json(args.output, results)
+    if args.save_baseline:
+        _write_json(args.save_baseline, results)
+
+    if args.baseline:
+        with open(args.baseline) as baseline_file:
+            baseline = json.load(baseline_file)
+        regressions = compare_results(baseline, results, args.threshold)
+        print(format_comparison(baseline, results, regressions))
+        if regressions:
+            exit(1)
+
+
+def _parsed_args():
+    """
+    Parses the benchmark args from the cli.
+
+    :returns: Parsed arguments
+    :rtype: <Namespace> obj
+    """
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument(
+        "--sizes",
+        default=",".join(str(size) for size in DEFAULT_SIZES),
+        help="Comma separated numbers of containers to benchmark with.")
+    parser.add_argument(
+        "--repeat",
+        default=5,
+        type=int,
+        help="Times to run each stage, keeping the quickest.")
+    parser.add_argument(
+        "--output",
+        default="",
+        help="Write the results as JSON to this file.")
+    parser.add_argument(
+        "--baseline",
+        default="",
+        help="Compare the results against a baseline JSON file, exiting non zero on any regression.")
+    parser.add_argument(
+        "--save-baseline",
+        default="",
+        help="Write the results as JSON to this file, to compare later runs against.")
+    parser.add_argument(
+        "--threshold",
+        default=0.25,
+        type=float,
+        help="How much slower than the baseline a stage may be before it's a regression, ie 0.25 for 25%%.")
+    parser.add_argument(
+        "--no-cli",
+        action="store_true",
+        default=False,
+        help="Skip the end to end CLI runs.")
+    return parser.parse_args()
+
+
+def run_benchmarks(sizes, repeat=5, cli=True):
+    """
+    Times every stage for each number of containers.
+
+    :param sizes: The numbers of containers to benchmark with.
+    :type sizes: list
+    :param repeat: Times to run each stage, keeping the quickest.
+    :type repeat: int
+    :param cli: Also time the CLI from start to finish.
+    :type cli: bool
+    :returns: The results, with the python version, platform and seconds taken by each stage keyed by size.
+    :rtype: dict
+    """
+    results = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "repeat": repeat,
+        "sizes": {},
+    }
+    for size in sizes:
+        timings = time_stages(size, repeat)
+        if cli:
+            timings["cli"] = time_cli(size, repeat)
+        results["sizes"][str(size)] = timings
+    return results
+
+
+def time_stages(size, repeat=5):
+    """
+    Times each stage of the pipeline in process, parsing, date parsing, filtering, ordering and rendering.
+    Unit tested: test_time_stages
+
+    :param size: The number of containers.
+    :type size: int
+    :param repeat: Times to run each stage, keeping the quickest.
+    :type repeat: int
+    :returns: The seconds taken by each stage.
+    :rtype: dict
+    """
+    text_output = fixtures.generate_ps_output(size)
+    json_output = fixtures.generate_json_output(size)
+    containers = dockerprettyps.clean_output(text_output)
+    total_running = dockerprettyps._get_num_running_containers(containers)
+    dates = [c.created for c in containers] + [c.status for c in containers]
+
+    args = dockerprettyps._parsed_args([])
+    all_args = _args(all=True)
+    search_args = _args(search=["web", "db"])
+    where_args = _args(all=True, where="health=unhealthy or (port>=5000 and age>2d) or image~postgres")
+    order_args = _args(all=True, order="running,-created,name")
+    limit_args = _args(all=True, order="running,-created,name", limit=10)
+    filtered = dockerprettyps.filter_containers(containers, args)
+
+    stages = {
+        "clean_output": lambda: dockerprettyps.clean_output(text_output),
+        "clean_json_output": lambda: dockerprettyps.clean_json_output(json_output),
+        "parse_ps_date": lambda: [dockerprettyps._parse_ps_date(date) for date in dates],
+        "filter_running": lambda: dockerprettyps.filter_containers(containers, args),
+        "filter_search": lambda: dockerprettyps.filter_containers(containers, search_args),
+        "filter_where": lambda: dockerprettyps.filter_containers(containers, where_args),
+        "order": lambda: dockerprettyps.order_containers(containers, order_args),
+        "order_limit": lambda: dockerprettyps.order_containers(containers, limit_args),
+        "format_output": lambda: dockerprettyps.format_output(
+            filtered, len(containers), total_running, args),
+        "format_table": lambda: dockerprettyps.format_table(
+            containers, len(containers), total_running, all_args, max_width=120),
+        "format_json": lambda: dockerprettyps.format_json(filtered),
+    }
+
+    timings = {}
+    for name, stage in stages.items():
+        timings[name] = _best_of(stage, repeat)
+    return timings
+
+
+def time_cli(size, repeat=5):
+    """
+    Times the CLI from start to finish, interpreter start up included, reading the fixture through a fake docker cli
+    with the text engine.
+
+    :param size: The number of containers.
+    :type size: int
+    :param repeat: Times to run the CLI, keeping the quickest.
+    :type repeat: int
+    :returns: The seconds taken.
+    :rtype: float
+    """
+    containers = dockerprettyps.clean_output(fixtures.generate_ps_output(size))
+    with tempfile.TemporaryDirectory() as bin_dir:
+        fixture_path = os.path.join(bin_dir, "ps.txt")
+        with open(fixture_path, "w") as fixture_file:
+            fixture_file.write(fixtures.generate_ps_output(size))
+        docker_path = os.path.join(bin_dir, "docker")
+        with open(docker_path, "w") as docker_file:
+            docker_file.write(FAKE_DOCKER % {
+                "fixture": fixture_path,
+                "total": len(containers),
+                "running": dockerprettyps._get_num_running_containers(containers),
+            })
+        os.chmod(docker_path, 0o755)
+
+        env = dict(os.environ)
+        env["PATH"] = bin_dir + os.pathsep + env.get("PATH", "")
+        env["PYTHONPATH"] = REPO_DIR + os.pathsep + env.get("PYTHONPATH", "")
+        env["DOCKER_PRETTY_PS_CACHE_TTL"] = "0"
+        cmds = [
+            sys.executable, "-c", "import dockerprettyps; dockerprettyps.run_cli()",
+            "-a", "--engine", "text", "--no-daemon"]
+
+        def run_cli():
+            subprocess.run(cmds, env=env, stdout=subprocess.DEVNULL, check=True)
+
+        return _best_of(run_cli, repeat)
+
+
+def compare_results(baseline, results, threshold=0.25):
+    """
+    Finds the stages which got slower than the baseline by more than the threshold.
+    Unit tested: test_compare_results
+
+    :param baseline: Earlier results, as returned by run_benchmarks().
+    :type baseline: dict
+    :param results: The new results.
+    :type results: dict
+    :param threshold: How much slower a stage may get, ie 0.25 for 25%.
+    :type threshold: float
+    :returns: The (size, stage, baseline seconds, new seconds) of each regression.
+    :rtype: list
+    """
+    regressions = []
+    for size, timings in results["sizes"].items():
+        baseline_timings = baseline.get("sizes", {}).get(size, {})
+        for stage, seconds in timings.items():
+            if stage not in baseline_timings:
+                continue
+            baseline_seconds = baseline_timings[stage]
+            if max(seconds, baseline_seconds) < MIN_COMPARE_SECONDS:
+                continue
+            if seconds > baseline_seconds * (1 + threshold):
+                regressions.append((size, stage, baseline_seconds, seconds))
+    return regressions
+
+
+def format_results(results):
+    """
+    Lays out the results as a table, a row per stage and a column per size.
+
+    :param results: The results, as returned by run_benchmarks().
+    :type results: dict
+    :rtype: str
+    """
+    sizes = list(results["sizes"])
+    stages = []
+    for timings in results["sizes"].values():
+        stages += [stage for stage in timings if stage not in stages]
+
+    lines = ["%-20s" % "stage" + "".join("%14s" % size for size in sizes)]
+    for stage in stages:
+        cells = []
+        for size in sizes:
+            seconds = results["sizes"][size].get(stage)
+            cells.append("%14s" % ("-" if seconds is None else _format_seconds(seconds)))
+        lines.append("%-20s" % stage + "".join(cells))
+    return "\n".join(lines)
+
+
+def format_ingest_comparison(results):
+    """
+    Compares reading `docker ps` as JSON lines with reading it as a text table, for each size. The JSON ingest gets
+    it's dates from CreatedAt, so this is where the cost of parsing docker's timestamps shows up.
+    Unit tested: test_format_ingest_comparison
+
+    :param results: The results, as returned by run_benchmarks().
+    :type results: dict
+    :rtype: str
+    """
+    lines = ["", "clean_json_output vs clean_output"]
+    for size, timings in results["sizes"].items():
+        json_seconds = timings.get("clean_json_output")
+        text_seconds = timings.get("clean_output")
+        if not json_seconds or not text_seconds:
+            continue
+        lines.append("%14s containers  %s vs %s  (%.2fx)" % (
+            size, _format_seconds(json_seconds), _format_seconds(text_seconds), json_seconds / text_seconds))
+    return "\n".join(lines)
+
+
+def format_comparison(baseline, results, regressions):
+    """
+    Describes how the results compare to the baseline.
+
+    :param baseline: Earlier results, as returned by run_benchmarks().
+    :type baseline: dict
+    :param results: The new results.
+    :type results: dict
+    :param regressions: The regressions, as returned by compare_results().
+    :type regressions: list
+    :rtype: str
+    """
+    lines = ["", "Compared to a baseline from python %s on %s" % (
+        baseline.get("python", "?"), baseline.get("platform", "?"))]
+    if not regressions:
+        lines.append("No regressions")
+    for size, stage, baseline_seconds, seconds in regressions:
+        lines.append("%sRegression:%s %s with %s containers took %s, was %s (%+.0f%%)" % (
+            dockerprettyps.RED, dockerprettyps.ENDC, stage, size, _format_seconds(seconds),
+            _format_seconds(baseline_seconds), (seconds / baseline_seconds - 1) * 100))
+    return "\n".join(lines)
+
+
+def _args(**values):
+    """
+    Gets the default CLI args, with some values changed.
+
+    :rtype: <Namespace> obj
+    """
+    args = dockerprettyps._parsed_args([])
+    for name, value in values.items():
+        setattr(args, name, value)
+    return args
+
+
+def _best_of(stage, repeat):
+    """
+    Times a stage, keeping the quickest of a number of runs. The memoized parts of the pipeline are cleared before
+    each run, so every run starts as cold as a new process would.
+
+    :param stage: The stage to time.
+    :type stage: function
+    :param repeat: Times to run the stage.
+    :type repeat: int
+    :returns: The quickest run's seconds.
+    :rtype: float
+    """
+    best = None
+    for _ in range(max(repeat, 1)):
+        dockerprettyps._ps_date_offset.cache_clear()
+        dockerprettyps._docker_timezone.cache_clear()
+        dockerprettyps.parse_order.cache_clear()
+        search.search_index.cache_clear()
+        where.port_ranges.cache_clear()
+        start = time.perf_counter()
+        stage()
+        seconds = time.perf_counter() - start
+        if best is None or seconds < best:
+            best = seconds
+    return best
+
+
+def _format_seconds(seconds):
+    """
+    Formats seconds for reading, in milliseconds below a second.
+
+    :rtype: str
+    """
+    if seconds < 1:
+        return "%.2fms" % (seconds * 1000)
+    return "%.3fs" % seconds
+
+
+def _write_json(path, results):
+    """
+    Writes results to a JSON file.
+
+    :param path: The file to write.
+    :type path: str
+    :param results: The results, as returned by run_benchmarks().
+    :type results: dict
+    """
+    with open(path, "w") as results_file:
+        json.dump(results, results_file, indent=2, sort_keys=True)
+        results_file.write("\n")
+
+
+if __name__ == "__main__":
+    main()
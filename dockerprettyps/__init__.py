@@ -28,13 +28,35 @@ Total containers:   9
 Total running:      2
 
 """
-import argparse
-from datetime import datetime, timedelta
-import json
-from operator import itemgetter
-import subprocess
-
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+import heapq
+from itertools import islice
+from operator import attrgetter
+import os
+import re
+import sys
+import time
+from types import SimpleNamespace
+
+from dockerprettyps.container import Container
 from dockerprettyps import errors
+from dockerprettyps.lazy import LazyModule
+from dockerprettyps import profiling
+from dockerprettyps.query import ContainerQuery, QueryResult  # noqa: F401
+
+# Submodules only some runs need are imported when first used, see dockerprettyps.lazy. So are argparse, json,
+# subprocess, shutil and concurrent.futures, in the functions which use them.
+aio = LazyModule("dockerprettyps.aio")
+cache = LazyModule("dockerprettyps.cache")
+client = LazyModule("dockerprettyps.client")
+diff = LazyModule("dockerprettyps.diff")
+engine = LazyModule("dockerprettyps.engine")
+hosts = LazyModule("dockerprettyps.hosts")
+search = LazyModule("dockerprettyps.search")
+serve = LazyModule("dockerprettyps.serve")
+watch = LazyModule("dockerprettyps.watch")
+where = LazyModule("dockerprettyps.where")
 
 __version__ = "1.0.2"
 __title__ = """
@@ -50,47 +72,305 @@ BOLD = '\033[1m'
 RED = '\033[91m'
 GREEN = '\033[92m'
 
+# Docker container states which we consider "running", in line with _clean_status().
+RUNNING_STATES = ["running", "restarting", "paused"]
+
+# Docker's humanized durations, ie "Up 5 days", "Up About an hour", "Exited (0) Less than a second ago".
+PS_DATE_RE = re.compile(
+    r"\b(less than a|an?|\d+)\s+(second|minute|hour|day|week|month|year)s?\b",
+    re.IGNORECASE)
+RFC3339_RE = re.compile(r"^(\d{4}-\d\d-\d\dT\d\d:\d\d:\d\d)(\.\d+)?(Z|[+-]\d\d:\d\d)?$")
+
+# The most container IDs to pass to a single `docker inspect`, keeping us well under argv limits.
+INSPECT_BATCH_SIZE = 500
+
+# The compact table's columns, by include letter, in display order. Every table starts with the container name.
+TABLE_COLUMNS = [
+    ("n", "CONTAINER ID"),
+    ("i", "IMAGE"),
+    ("m", "COMMAND"),
+    ("c", "CREATED"),
+    ("s", "STATUS"),
+    ("r", "STATE"),
+    ("p", "PORTS"),
+    ("u", "CPU %"),
+    ("e", "MEM USAGE / LIMIT"),
+    ("t", "NET I/O"),
+    ("b", "BLOCK I/O"),
+]
+TABLE_GAP = "  "
+
+# The resource usage include letters and the stats they display, fetched only when one of them is included.
+STATS_INCLUDES = {
+    "u": "cpu",
+    "e": "memory",
+    "t": "net",
+    "b": "block",
+}
+
+# Size units as the docker cli formats them, binary for memory and decimal for network and disk I/O.
+BINARY_SIZE_UNITS = ["B", "KiB", "MiB", "GiB", "TiB", "PiB"]
+DECIMAL_SIZE_UNITS = ["B", "kB", "MB", "GB", "TB", "PB"]
+
+# Health states in the order they sort, the ones needing attention first.
+HEALTH_ORDER = {"unhealthy": 0, "starting": 1, "healthy": 2, "": 3}
+
+# The keys containers can be ordered by, as (getter, whether the getter returns a number).
+ORDER_KEYS = {
+    "status": (attrgetter("status_date"), False),
+    "created": (attrgetter("created_date"), False),
+    "name": (attrgetter("name"), False),
+    "image": (attrgetter("image"), False),
+    "id": (attrgetter("container_id"), False),
+    "host": (lambda container: container.host or "", False),
+    # Running containers first.
+    "running": (lambda container: 0 if container.running else 1, True),
+    "health": (lambda container: HEALTH_ORDER.get(container.health, 3), True),
+    "ports": (lambda container: len(container.ports), True),
+}
+ORDER_ALIASES = {
+    "container": "name",
+    "create": "created",
+    "started": "status",
+}
+
+# The flags _fast_args() reads without argparse, and the args they set.
+FAST_ARGS = {
+    "-a": "all",
+    "--all": "all",
+    "-s": "slim",
+    "--slim": "slim",
+}
+
+PS_DATE_UNITS = {
+    "second": 1,
+    "minute": 60,
+    "hour": 60 * 60,
+    "day": 60 * 60 * 24,
+    "week": 60 * 60 * 24 * 7,
+    "month": 60 * 60 * 24 * 30,
+    "year": 60 * 60 * 24 * 365,
+}
+
 
 def run_cli():
     """
     Primary start of the CLI application
 
     """
-    args = _parsed_args()
+    args = _fast_args(sys.argv[1:]) or _parsed_args()
 
     if args.version:
         version()
         exit()
 
+    if args.serve:
+        serve.run_server(args)
+        exit()
+
+    # Hand the query to a running --serve daemon if there is one, running it here if not. Profiled runs stay here,
+    # so the breakdown is of this run.
+    if not args.no_daemon and not args.watch and not profiling.wanted(args):
+        status = client.run_client(sys.argv[1:], args)
+        if status is not None:
+            exit(status)
+
+    run(args)
+
+
+def run(args, fetcher=None):
+    """
+    Runs a query from parsed CLI args, fetching, filtering, ordering and printing the containers, through a
+    ContainerQuery. With --profile each stage is timed, the breakdown written to stderr once the run is done.
+
+    :param args: The CLI args
+    :type args: <class 'argparse.Namespace'>
+    :param fetcher: Function taking the CLI args and returning a snapshot, like fetch_snapshot(), ie the --serve
+        daemon's warm snapshots. Defaults to fetching from Docker, through the snapshot cache if it's enabled.
+    :type fetcher: function
+    """
+    profiler = profiling.start(args)
+    try:
+        _run(args, fetcher)
+    finally:
+        profiling.stop(profiler, args)
+
+
+def _run(args, fetcher=None):
+    """
+    Runs a query from parsed CLI args, see run().
+
+    :param args: The CLI args
+    :type args: <class 'argparse.Namespace'>
+    :param fetcher: Function taking the CLI args and returning a snapshot.
+    :type fetcher: function
+    """
     try:
-        raw_containers = get_raw_containers()
+        container_query = ContainerQuery.from_args(args)
+    except errors.InvalidWhere as e:
+        print("%sError:%s Invalid --where expression, %s" % (RED, ENDC, e))
+        exit(1)
+    except errors.InvalidOrder as e:
+        print("%sError:%s Invalid --order, %s" % (RED, ENDC, e))
+        exit(1)
+
+    try:
+        if args.watch:
+            watch.run_watch(args)
+            exit()
+        if _streams(args, fetcher):
+            with profiling.stage("stream"):
+                stream_ndjson(args)
+            return
+        with profiling.stage("fetch"):
+            if fetcher:
+                snapshot = fetcher(args)
+            elif args.cache_ttl > 0 and not args.no_cache:
+                snapshot_cache = cache.SnapshotCache(args.cache_ttl)
+                snapshot = snapshot_cache.fetch(cache.cache_key(args), container_query.fetch, args.refresh)
+                if args.verbose or snapshot_cache.stale:
+                    sys.stderr.write(snapshot_cache.stats() + "\n")
+            else:
+                snapshot = container_query.fetch()
     except errors.BadResponseDockerEngine:
         print("%sError:%s Bad response from the Docker Engine" % (RED, ENDC))
         exit(1)
+    except errors.EngineUnavailable:
+        print("%sError:%s Could not connect to the Docker Engine socket" % (RED, ENDC))
+        exit(1)
+    except errors.EngineTimeout:
+        print("%sError:%s Timed out waiting for the Docker Engine" % (RED, ENDC))
+        exit(1)
 
-    containers = clean_output(raw_containers)
-    total_containers = len(containers)
-    total_running_containers = _get_num_running_containers(containers)
-    containers = filter_containers(containers, args)
-    containers = order_containers(containers, args)
+    if args.diff:
+        with profiling.stage("diff"):
+            output = diff.run_diff(container_query.filter(snapshot[0]), args)
+        sys.stdout.write(output)
+        sys.stdout.flush()
+        return
+
+    if args.ndjson:
+        containers, total_containers, total_running_containers, unreachable_hosts = snapshot
+        containers = iter_filter_containers(containers, args)
+        if args.order or args.reverse:
+            containers = order_containers(list(containers), args)
+        elif args.limit is not None or args.offset:
+            # Unordered output keeps streaming, just skipping and stopping early.
+            stop = None if args.limit is None else args.offset + args.limit
+            containers = islice(containers, args.offset, stop)
+        # Filtering is lazy here, so it's timed along with the writing.
+        with profiling.stage("stream"):
+            give_ndjson(containers, total_containers, total_running_containers, args)
+        return
+
+    result = container_query.run(snapshot)
+    with profiling.stage("render"):
+        if args.json:
+            output = container_query.render(result, "json")
+        elif args.table:
+            output = container_query.render(result, "table", _terminal_width())
+        else:
+            output = container_query.render(result)
+    with profiling.stage("write"):
+        sys.stdout.write(output)
+        sys.stdout.flush()
+    profiling.count("bytes_written", len(output.encode("utf-8")))
 
-    if args.json:
-        give_json(containers, args)
-    else:
-        print_format(
-            containers,
-            total_containers,
-            total_running_containers,
-            args)
+
+def _fast_args(argv):
+    """
+    Reads the most common CLI args, like no args at all or just -s, without argparse, which takes longer to import
+    and set up than the rest of a warm --serve daemon query.
+    Unit tested: test__fast_args
+
+    :param argv: The args to read, ie ["-s"].
+    :type argv: list
+    :returns: The same args _parsed_args() would give, or None if there's anything more to read, leaving it to
+        _parsed_args().
+    :rtype: <SimpleNamespace obj>
+    """
+    values = _default_args()
+    for arg in argv:
+        if arg not in FAST_ARGS:
+            return None
+        values[FAST_ARGS[arg]] = True
+    return SimpleNamespace(**values)
+
+
+def _default_args():
+    """
+    Gets the default CLI args, as _parsed_args() gives them with no args.
+
+    :returns: The default value for each arg.
+    :rtype: dict
+    """
+    return {
+        "search": [],
+        "all": False,
+        "slim": False,
+        "include": [],
+        "where": "",
+        "order": "",
+        "reverse": False,
+        "limit": None,
+        "offset": 0,
+        "json": "",
+        "table": False,
+        "ndjson": False,
+        "diff": False,
+        "inspect": False,
+        "watch": False,
+        "engine": "auto",
+        "hosts": [],
+        "concurrency": 8,
+        "timeout": 10,
+        "retries": 0,
+        "backoff": 0.5,
+        "cache_ttl": float(os.environ.get("DOCKER_PRETTY_PS_CACHE_TTL", 0)),
+        "no_cache": False,
+        "refresh": False,
+        "verbose": False,
+        "serve": False,
+        "socket": "",
+        "serve_interval": 5,
+        "no_daemon": False,
+        "profile": False,
+        "profile_json": False,
+        "profile_dump": "",
+        "version": False,
+    }
+
+
+def _streams(args, fetcher=None):
+    """
+    Checks if a run can stream containers from docker straight to the output, for --ndjson without an order. Anything
+    which needs every container first, --hosts, --inspect, stats, the snapshot cache or a --serve daemon's snapshots,
+    fetches them all as usual.
+
+    :param args: The CLI args
+    :type args: <class 'argparse.Namespace'>
+    :param fetcher: The run's snapshot fetcher, if it has one.
+    :type fetcher: function
+    :rtype: bool
+    """
+    if not args.ndjson or args.diff or args.order or args.reverse or fetcher:
+        return False
+    if args.hosts or args.inspect or _wants_stats(args):
+        return False
+    return args.cache_ttl <= 0 or args.no_cache
 
 
-def _parsed_args():
+def _parsed_args(argv=None):
     """
     Parses args from the cli with ArgumentParser
 
+    :param argv: The args to parse, defaults to the process's args.
+    :type argv: list
     :returns: Parsed arguments
     :rtype: <Namespace> obj
     """
+    import argparse
+
     parser = argparse.ArgumentParser()
     parser.add_argument(
         "search",
@@ -114,25 +394,161 @@ def _parsed_args():
         "-i",
         "--include",
         default=[],
-        help="Data points to add to display, (c)reated, (p)orts, (i)mage_id, co(m)mand")
+        help="Data points to add to display, (c)reated, (p)orts, (i)mage_id, co(m)mand, cp(u), m(e)mory, ne(t) "
+             "I/O, (b)lock I/O")
+    parser.add_argument(
+        "--where",
+        default="",
+        help="Filter on container fields, ie \"image~postgres and health=unhealthy and age>2d and port=5432\". "
+             "Fields are name, image, command, status, id, host, health, port, running and age.")
     parser.add_argument(
         "-o",
         "--order",
         nargs='?',
         default='',
-        help="Order by, defaults to container start, allows 'container', 'pretty_print_fmt_containers'.")
+        help="Order by, defaults to container start. Comma separate keys to break ties, suffixed with :desc for "
+             "descending, ie 'running,created:desc,name'. A - prefix works too, given with an =, ie "
+             "--order=-created. Keys are status, created, name, image, id, host, running, health and ports.")
     parser.add_argument(
         "-r",
         "--reverse",
         default=False,
         action='store_true',
         help="Reverses the display order.")
+    parser.add_argument(
+        "-l",
+        "--limit",
+        default=None,
+        type=int,
+        help="Only show this many containers, from the top of the order.")
+    parser.add_argument(
+        "--offset",
+        default=0,
+        type=int,
+        help="Skip this many containers from the top of the order, use with --limit to page through them.")
     parser.add_argument(
         "-j",
         "--json",
         default="",
         action='store_true',
         help="Instead of printing, creates a json response of the container data.")
+    parser.add_argument(
+        "-t",
+        "--table",
+        default=False,
+        action='store_true',
+        help="Shows a compact table, one row per container, with the columns picked by --include.")
+    parser.add_argument(
+        "--ndjson",
+        default=False,
+        action='store_true',
+        help="Stream one compact JSON object per container, as Docker lists them unless ordered, then a summary.")
+    parser.add_argument(
+        "--diff",
+        default=False,
+        action='store_true',
+        help="Show only the containers which appeared, disappeared, stopped, restarted or changed health since the "
+             "last --diff run of the same query.")
+    parser.add_argument(
+        "-x",
+        "--inspect",
+        default=False,
+        action='store_true',
+        help="Fetch exact created, started and finished times with docker inspect, for exact date ordering.")
+    parser.add_argument(
+        "-w",
+        "--watch",
+        default=False,
+        action='store_true',
+        help="Keep the display open, updating containers as Docker events come in.")
+    parser.add_argument(
+        "-e",
+        "--engine",
+        default="auto",
+        choices=["auto", "api", "cli", "text"],
+        help="How to talk to Docker, the engine (api) socket, the docker (cli) as JSON, the docker cli's (text) "
+             "table or (auto) to try the api first, then the cli.")
+    parser.add_argument(
+        "-H",
+        "--hosts",
+        default="",
+        help="Docker hosts or contexts to query at once, comma separate multiples.")
+    parser.add_argument(
+        "--concurrency",
+        default=8,
+        type=int,
+        help="Number of hosts to query at the same time.")
+    parser.add_argument(
+        "--timeout",
+        default=10,
+        type=float,
+        help="Seconds to wait on each Docker host before giving up on it.")
+    parser.add_argument(
+        "--retries",
+        default=0,
+        type=int,
+        help="Times to retry a Docker host which times out or gives a bad response.")
+    parser.add_argument(
+        "--backoff",
+        default=0.5,
+        type=float,
+        help="Seconds to wait before the first retry, doubling for each retry after it.")
+    parser.add_argument(
+        "--cache-ttl",
+        default=float(os.environ.get("DOCKER_PRETTY_PS_CACHE_TTL", 0)),
+        type=float,
+        help="Serve containers from an on disk snapshot up to this many seconds old, defaults to "
+             "$DOCKER_PRETTY_PS_CACHE_TTL or 0 for no caching.")
+    parser.add_argument(
+        "--no-cache",
+        default=False,
+        action='store_true',
+        help="Don't read or write the snapshot cache.")
+    parser.add_argument(
+        "--refresh",
+        default=False,
+        action='store_true',
+        help="Ignore the cached snapshot, fetching and caching a new one.")
+    parser.add_argument(
+        "--verbose",
+        default=False,
+        action='store_true',
+        help="Print extra information, such as cache hits and misses, to stderr.")
+    parser.add_argument(
+        "--serve",
+        default=False,
+        action='store_true',
+        help="Run a daemon keeping the containers warm, answering queries from other docker-pretty-ps runs over a "
+             "unix socket.")
+    parser.add_argument(
+        "--socket",
+        default="",
+        help="The --serve daemon's unix socket, defaults to $DOCKER_PRETTY_PS_SOCKET or one under "
+             "$XDG_RUNTIME_DIR.")
+    parser.add_argument(
+        "--serve-interval",
+        default=5,
+        type=float,
+        help="Seconds the --serve daemon reuses containers for, when no Docker events say they changed.")
+    parser.add_argument(
+        "--no-daemon",
+        default=False,
+        action='store_true',
+        help="Don't use a running --serve daemon, always query Docker directly.")
+    parser.add_argument(
+        "--profile",
+        default=False,
+        action='store_true',
+        help="Time each stage of the run, printing the breakdown to stderr.")
+    parser.add_argument(
+        "--profile-json",
+        default=False,
+        action='store_true',
+        help="Time each stage of the run, printing the breakdown to stderr as JSON.")
+    parser.add_argument(
+        "--profile-dump",
+        default="",
+        help="Profile the run with cProfile, writing the stats to this file, ie for `python -m pstats`.")
     parser.add_argument(
         "-v",
         "--version",
@@ -140,7 +556,11 @@ def _parsed_args():
         action='store_true',
         help="Print the binary version information.")
 
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
+    if args.limit is not None and args.limit < 0:
+        parser.error("--limit can't be negative")
+    if args.offset < 0:
+        parser.error("--offset can't be negative")
 
     # Parse includes
     includes = []
@@ -158,6 +578,9 @@ def _parsed_args():
         searches = [args.search]
     args.search = searches
 
+    # Parse hosts
+    args.hosts = [host.strip() for host in args.hosts.split(',') if host.strip()]
+
     return args
 
 
@@ -176,29 +599,682 @@ def version():
     return True
 
 
-def get_raw_containers():
+def fetch_snapshot(args):
+    """
+    Fetches containers from the hosts in the CLI args, or the local engine if there aren't any. Runs with more than
+    one request to overlap, or --retries, are fetched on an asyncio event loop, see dockerprettyps.aio.
+
+    :param args: The CLI args
+    :type args: <class 'argparse.Namespace'>
+    :returns: The containers, total containers, total running containers and the (host, reason) tuples for hosts which
+        could not be reached.
+    :rtype: tuple
+    """
+    if _fetches_async(args):
+        return aio.fetch_snapshot(args)
+
+    containers, total_containers, total_running_containers = get_containers(args)
+    return containers, total_containers, total_running_containers, []
+
+
+def _fetches_async(args):
+    """
+    Checks if a fetch goes through the asyncio fetch layer, for --hosts, --retries, --inspect and stats. A plain single
+    host query stays synchronous, since importing asyncio takes longer than the query.
+
+    :param args: The CLI args
+    :type args: <class 'argparse.Namespace'>
+    :rtype: bool
+    """
+    return bool(args.hosts or args.retries or args.inspect or _wants_stats(args))
+
+
+def get_containers(args, host=None):
+    """
+    Gets the cleaned container data from the engine backend selected by the CLI args. The running state and search
+    phrases are handed to the daemon as filters so it only sends us what we will show, the totals for the footer then
+    come from a cheap count query rather than the full container list. Resource usage stats, when included, are
+    fetched at the same time as the containers.
+    Unit tested: test_get_containers
+
+    :param args: The CLI args
+    :type args: <class 'argparse.Namespace'>
+    :param host: A DOCKER_HOST style url or docker context name, defaults to the local engine.
+    :type host: str
+    :returns: Cleaned container data, the total number of containers and the total number of running containers.
+    :rtype: tuple
+    """
+    filters = _engine_filters(args)
+    stats_future = None
+    if _wants_stats(args):
+        from concurrent.futures import ThreadPoolExecutor
+
+        # Docker takes a moment to sample stats, so they're fetched alongside the containers rather than after them.
+        stats_pool = ThreadPoolExecutor(max_workers=1)
+        stats_future = stats_pool.submit(fetch_stats, args, host)
+        stats_pool.shutdown(wait=False)
+
+    containers = fetch_containers(args, filters, host)
+    if args.inspect:
+        with profiling.stage("inspect"):
+            containers = inspect_containers(args, containers, host)
+    if stats_future:
+        with profiling.stage("stats"):
+            containers = add_stats(containers, stats_future.result())
+    if not filters:
+        return containers, len(containers), _get_num_running_containers(containers)
+
+    with profiling.stage("totals"):
+        total_containers, total_running_containers = fetch_totals(args, host)
+    return containers, total_containers, total_running_containers
+
+
+def fetch_containers(args, filters=None, host=None):
+    """
+    Fetches cleaned container data matching the daemon filters from the engine backend selected by the CLI args, see
+    iter_containers().
+
+    :param args: The CLI args
+    :type args: <class 'argparse.Namespace'>
+    :param filters: Filters for the daemon to apply, ie {"status": ["running"], "name": ["web"]}.
+    :type filters: dict
+    :param host: A DOCKER_HOST style url or docker context name, defaults to the local engine.
+    :type host: str
+    :returns: Cleaned, usable container data.
+    :rtype: list
+    """
+    with profiling.stage("containers"):
+        containers = list(iter_containers(args, filters, host))
+    profiling.count("rows_parsed", len(containers))
+    return containers
+
+
+def iter_containers(args, filters=None, host=None):
+    """
+    Yields cleaned containers matching the daemon filters from the engine backend selected by the CLI args. In "auto"
+    mode the Docker Engine API socket is tried first, falling back to the docker cli's JSON output if the socket can
+    not be reached. The docker cli's output is parsed a line at a time as docker writes it, so each container is
+    yielded while docker is still listing the rest.
+    Unit tested: test_iter_containers
+
+    :param args: The CLI args
+    :type args: <class 'argparse.Namespace'>
+    :param filters: Filters for the daemon to apply, ie {"status": ["running"], "name": ["web"]}.
+    :type filters: dict
+    :param host: A DOCKER_HOST style url or docker context name, defaults to the local engine.
+    :type host: str
+    :returns: Generator of the cleaned containers.
+    :rtype: generator
+    """
+    if args.engine in ["auto", "api"]:
+        try:
+            client = engine.EngineClient.from_host(host, timeout=args.timeout)
+            with profiling.stage("engine"):
+                api_containers = client.containers(filters=filters)
+        except errors.EngineUnavailable:
+            if args.engine == "api":
+                raise
+        else:
+            with profiling.stage("parse"):
+                containers = clean_api_output(api_containers)
+            yield from containers
+            return
+
+    if args.engine == "text":
+        yield from iter_clean_output(iter_raw_containers(filters=filters, host=host, timeout=args.timeout))
+        return
+
+    yield from iter_clean_json_output(
+        iter_raw_containers(json_lines=True, filters=filters, host=host, timeout=args.timeout))
+
+
+def fetch_totals(args, host=None):
+    """
+    Fetches the total number of containers and running containers from the engine backend selected by the CLI args.
+
+    :param args: The CLI args
+    :type args: <class 'argparse.Namespace'>
+    :param host: A DOCKER_HOST style url or docker context name, defaults to the local engine.
+    :type host: str
+    :returns: The total number of containers and the total number of running containers.
+    :rtype: tuple
+    """
+    if args.engine in ["auto", "api"]:
+        try:
+            info = engine.EngineClient.from_host(host, timeout=args.timeout).info()
+            return info["Containers"], info["ContainersRunning"] + info.get("ContainersPaused", 0)
+        except errors.EngineUnavailable:
+            if args.engine == "api":
+                raise
+
+    return get_raw_totals(host=host, timeout=args.timeout)
+
+
+def inspect_containers(args, containers, host=None):
+    """
+    Enriches containers with their exact created, started and finished times from `docker inspect`, which makes
+    ordering by date exact rather than "about N units". All containers are inspected in one batch, rather than one
+    docker process per container.
+    Unit tested: test_inspect_containers
+
+    :param args: The CLI args
+    :type args: <class 'argparse.Namespace'>
+    :param containers: The containers found from docker ps.
+    :type containers: list
+    :param host: A DOCKER_HOST style url or docker context name, defaults to the local engine.
+    :type host: str
+    :returns: Copies of the containers with exact dates.
+    :rtype: list
+    """
+    if not containers:
+        return containers
+
+    inspect_times = fetch_inspect_times(args, [c.container_id for c in containers], host)
+    inspected_containers = []
+    for container in containers:
+        if container.container_id not in inspect_times:
+            inspected_containers.append(container)
+            continue
+
+        created_date, started_date, finished_date = [
+            _parse_rfc3339_date(val) for val in inspect_times[container.container_id]]
+        created_date = created_date or container.created_date
+        if container.status.startswith("Up"):
+            status_date = started_date
+        elif container.status == "Created":
+            status_date = created_date
+        else:
+            status_date = finished_date
+
+        inspected_containers.append(container.replace(
+            created_date=created_date,
+            status_date=status_date or container.status_date,
+            started_date=started_date,
+            finished_date=finished_date))
+
+    return inspected_containers
+
+
+def fetch_inspect_times(args, container_ids, host=None):
+    """
+    Fetches the created, started and finished timestamps for containers from the engine backend selected by the CLI
+    args.
+
+    :param args: The CLI args
+    :type args: <class 'argparse.Namespace'>
+    :param container_ids: The IDs of the containers to inspect.
+    :type container_ids: list
+    :param host: A DOCKER_HOST style url or docker context name, defaults to the local engine.
+    :type host: str
+    :returns: The (created, started, finished) RFC 3339 timestamps keyed by short container ID.
+    :rtype: dict
+    """
+    if args.engine in ["auto", "api"]:
+        try:
+            inspected = engine.EngineClient.from_host(host, timeout=args.timeout).inspect(container_ids)
+            inspect_times = {}
+            for container in inspected:
+                state = container.get("State") or {}
+                inspect_times[container["Id"][:12]] = (
+                    container.get("Created", ""),
+                    state.get("StartedAt", ""),
+                    state.get("FinishedAt", ""))
+            return inspect_times
+        except errors.EngineUnavailable:
+            if args.engine == "api":
+                raise
+
+    inspect_times = {}
+    for start in range(0, len(container_ids), INSPECT_BATCH_SIZE):
+        batch = container_ids[start:start + INSPECT_BATCH_SIZE]
+        inspect_times.update(_parse_raw_inspect(get_raw_inspect(batch, host, args.timeout)))
+    return inspect_times
+
+
+def fetch_stats(args, host=None):
+    """
+    Fetches a single resource usage sample for the running containers from the engine backend selected by the CLI
+    args. Through the engine API only the containers matching the search are sampled, all at the same time. Stats are
+    a nice to have, so if they can't be fetched the containers are shown without them.
+    Unit tested: test_fetch_stats
+
+    :param args: The CLI args
+    :type args: <class 'argparse.Namespace'>
+    :param host: A DOCKER_HOST style url or docker context name, defaults to the local engine.
+    :type host: str
+    :returns: The stats keyed by short container ID, ie {"42df45bdc8b3": {"cpu": "0.15%", ...}}.
+    :rtype: dict
+    """
+    try:
+        if args.engine in ["auto", "api"]:
+            try:
+                return _fetch_api_stats(args, host)
+            except errors.EngineUnavailable:
+                if args.engine == "api":
+                    raise
+
+        return _parse_raw_stats(get_raw_stats(host, args.timeout))
+    except (errors.Error, OSError):
+        return {}
+
+
+def _fetch_api_stats(args, host=None):
+    """
+    Fetches stats from the engine API for the running containers matching the search, one request per container, all
+    at once.
+
+    :param args: The CLI args
+    :type args: <class 'argparse.Namespace'>
+    :param host: A DOCKER_HOST style url or docker context name, defaults to the local engine.
+    :type host: str
+    :returns: The stats keyed by short container ID.
+    :rtype: dict
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    client = engine.EngineClient.from_host(host, timeout=args.timeout)
+    filters = {"status": ["running"]}
+    if args.search:
+        filters["name"] = list(args.search)
+    container_ids = [api_container["Id"] for api_container in client.containers(filters=filters)]
+    if not container_ids:
+        return {}
+
+    def sample(container_id):
+        try:
+            return client.stats(container_id)
+        except errors.BadResponseDockerEngine:
+            # The container stopped since it was listed.
+            return None
+
+    with ThreadPoolExecutor(max_workers=max(min(args.concurrency, len(container_ids)), 1)) as pool:
+        samples = list(pool.map(sample, container_ids))
+
+    stats = {}
+    for container_id, api_stats in zip(container_ids, samples):
+        if api_stats:
+            stats[container_id[:12]] = clean_api_stats(api_stats)
+    return stats
+
+
+def add_stats(containers, stats):
+    """
+    Adds fetched stats to their containers.
+
+    :param containers: The containers found from docker ps.
+    :type containers: list
+    :param stats: The stats keyed by short container ID, from fetch_stats().
+    :type stats: dict
+    :returns: Copies of the containers with their stats, None for containers without any.
+    :rtype: list
+    """
+    return [container.replace(stats=stats.get(container.container_id)) for container in containers]
+
+
+def _wants_stats(args):
+    """
+    Checks if any of the resource usage stats are included for display.
+
+    :param args: The CLI args
+    :type args: <class 'argparse.Namespace'>
+    :rtype: bool
+    """
+    for letter in get_selected_includes(args):
+        if letter in STATS_INCLUDES:
+            return True
+    return False
+
+
+def _engine_filters(args):
+    """
+    Translates the CLI args into filters for the Docker daemon to apply. Docker matches name filters as a substring
+    or regex, so this only ever narrows down to a superset of what filter_containers() keeps.
+    Unit tested: test__engine_filters
+
+    :param args: The CLI args
+    :type args: <class 'argparse.Namespace'>
+    :returns: The daemon filters, ie {"status": ["running"], "name": ["web"]}.
+    :rtype: dict
+    """
+    filters = {}
+    if not args.all:
+        filters["status"] = list(RUNNING_STATES)
+    if args.search:
+        filters["name"] = list(args.search)
+    return filters
+
+
+def get_raw_containers(json_lines=False, filters=None, host=None, timeout=None):
     """
     Runs the shell command to get the container all data from Docker.
 
+    :param json_lines: Ask docker for one untruncated JSON object per container instead of the text table.
+    :type json_lines: bool
+    :param filters: Filters for the daemon to apply, ie {"status": ["running"], "name": ["web"]}.
+    :type filters: dict
+    :param host: A DOCKER_HOST style url or docker context name, defaults to the local engine.
+    :type host: str
+    :param timeout: Seconds to wait for docker before giving up.
+    :type timeout: int
     :returns: The raw information from the `docker ps` command.
     :rtype: str
     """
-    cmds = ["docker", "ps", "-a"]
+    return "".join(iter_raw_containers(json_lines, filters, host, timeout))
+
+
+def iter_raw_containers(json_lines=False, filters=None, host=None, timeout=None):
+    """
+    Runs `docker ps`, yielding each line of it's output as soon as docker writes it.
+    Unit tested: test_iter_raw_containers
+
+    :param json_lines: Ask docker for one untruncated JSON object per container instead of the text table.
+    :type json_lines: bool
+    :param filters: Filters for the daemon to apply, ie {"status": ["running"], "name": ["web"]}.
+    :type filters: dict
+    :param host: A DOCKER_HOST style url or docker context name, defaults to the local engine.
+    :type host: str
+    :param timeout: Seconds to wait for docker before giving up.
+    :type timeout: int
+    :returns: Generator of the output's lines, each ending with it's newline.
+    :rtype: generator
+    """
+    for line in _iter_docker(_docker_ps_cmd(json_lines, filters, host), timeout):
+        if not json_lines and ("Error" in line or "Cannot connect" in line):
+            raise errors.BadResponseDockerEngine
+        yield line
+
+
+def get_raw_inspect(container_ids, host=None, timeout=None):
+    """
+    Runs a single `docker inspect` over many containers, asking for just the timestamps we need.
+
+    :param container_ids: The IDs of the containers to inspect.
+    :type container_ids: list
+    :param host: A DOCKER_HOST style url or docker context name, defaults to the local engine.
+    :type host: str
+    :param timeout: Seconds to wait for docker before giving up.
+    :type timeout: int
+    :returns: The raw output, one "id|created|started|finished" line per container.
+    :rtype: str
+    """
+    cmds = _docker_cmd(host) + [
+        "inspect",
+        "--type", "container",
+        "--format", "{{.Id}}|{{.Created}}|{{.State.StartedAt}}|{{.State.FinishedAt}}"]
+    cmds += container_ids
+
+    # Containers removed since they were listed make docker exit non zero, but the rest are still printed.
+    return _run_docker(cmds, timeout, check=False)
+
+
+def get_raw_stats(host=None, timeout=None):
+    """
+    Runs `docker stats` for a single sample of every running container's resource usage.
+
+    :param host: A DOCKER_HOST style url or docker context name, defaults to the local engine.
+    :type host: str
+    :param timeout: Seconds to wait for docker before giving up.
+    :type timeout: int
+    :returns: The raw output, one JSON object per container.
+    :rtype: str
+    """
+    return _run_docker(_docker_cmd(host) + ["stats", "--no-stream", "--format", "{{json .}}"], timeout)
+
+
+def _parse_raw_stats(output):
+    """
+    Parses the output of get_raw_stats().
+    Unit tested: test__parse_raw_stats
+
+    :param output: The raw output, one JSON object per container.
+    :type output: str
+    :returns: The stats keyed by short container ID.
+    :rtype: dict
+    """
+    import json
+
+    stats = {}
+    for line in output.splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError:
+            raise errors.BadResponseDockerEngine
+        stats[row["ID"][:12]] = {
+            "cpu": row.get("CPUPerc", ""),
+            "memory": row.get("MemUsage", ""),
+            "memory_percent": row.get("MemPerc", ""),
+            "net": row.get("NetIO", ""),
+            "block": row.get("BlockIO", ""),
+        }
+    return stats
+
+
+def _parse_raw_inspect(output):
+    """
+    Parses the output of get_raw_inspect().
+    Unit tested: test__parse_raw_inspect
+
+    :param output: The raw output, one "id|created|started|finished" line per container.
+    :type output: str
+    :returns: The (created, started, finished) RFC 3339 timestamps keyed by short container ID.
+    :rtype: dict
+    """
+    inspect_times = {}
+    for line in output.splitlines():
+        pieces = line.strip().split("|")
+        # Skip any error lines, ie "Error: No such container: 1a31fcaccf59"
+        if len(pieces) != 4 or ":" in pieces[0]:
+            continue
+        inspect_times[pieces[0][:12]] = tuple(pieces[1:])
+    return inspect_times
+
+
+def get_raw_totals(host=None, timeout=None):
+    """
+    Runs `docker info` to count all containers and running containers, without listing them.
+
+    :param host: A DOCKER_HOST style url or docker context name, defaults to the local engine.
+    :type host: str
+    :param timeout: Seconds to wait for docker before giving up.
+    :type timeout: int
+    :returns: The total number of containers and the total number of running containers.
+    :rtype: tuple
+    """
+    return _parse_raw_totals(_run_docker(_docker_info_cmd(host), timeout))
+
+
+def _parse_raw_totals(output):
+    """
+    Parses the container counts from `docker info`.
+
+    :param output: The output of the `docker info` command from _docker_info_cmd().
+    :type output: str
+    :returns: The total number of containers and the total number of running containers.
+    :rtype: tuple
+    """
+    try:
+        total, running, paused = [int(count) for count in output.split()]
+    except ValueError:
+        raise errors.BadResponseDockerEngine
+
+    return total, running + paused
+
+
+def _docker_cmd(host=None):
+    """
+    Gets the docker cli command pointed at a host, using --host for urls and --context for docker context names.
+    Unit tested: test__docker_cmd
+
+    :param host: A DOCKER_HOST style url or docker context name, defaults to the local engine.
+    :type host: str
+    :returns: The start of the docker command.
+    :rtype: list
+    """
+    if not host:
+        return ["docker"]
+    elif "://" in host:
+        return ["docker", "--host", host]
+
+    return ["docker", "--context", host]
+
+
+def _docker_ps_cmd(json_lines=False, filters=None, host=None):
+    """
+    Gets the `docker ps` command listing all containers matching the daemon filters.
+
+    :param json_lines: Ask docker for one untruncated JSON object per container instead of the text table.
+    :type json_lines: bool
+    :param filters: Filters for the daemon to apply, ie {"status": ["running"], "name": ["web"]}.
+    :type filters: dict
+    :param host: A DOCKER_HOST style url or docker context name, defaults to the local engine.
+    :type host: str
+    :returns: The command and arguments to run.
+    :rtype: list
+    """
+    cmds = _docker_cmd(host) + ["ps", "-a"]
+    if json_lines:
+        cmds += ["--no-trunc", "--format", "{{json .}}"]
+    if filters:
+        for key in sorted(filters):
+            for value in filters[key]:
+                cmds += ["--filter", "%s=%s" % (key, value)]
+    return cmds
+
+
+def _docker_info_cmd(host=None):
+    """
+    Gets the `docker info` command printing just the container counts.
+
+    :param host: A DOCKER_HOST style url or docker context name, defaults to the local engine.
+    :type host: str
+    :returns: The command and arguments to run.
+    :rtype: list
+    """
+    return _docker_cmd(host) + ["info", "--format", "{{.Containers}} {{.ContainersRunning}} {{.ContainersPaused}}"]
+
+
+def _run_docker(cmds, timeout=None, check=True):
+    """
+    Runs a docker cli command, returning it's output.
+
+    :param cmds: The command and arguments to run.
+    :type cmds: list
+    :param timeout: Seconds to wait for docker before giving up.
+    :type timeout: int
+    :param check: Raise BadResponseDockerEngine if docker exits non zero.
+    :type check: bool
+    :returns: The standard out of the command.
+    :rtype: str
+    """
+    import subprocess
+
+    with profiling.stage("docker"):
+        out = subprocess.Popen(
+            cmds,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            start_new_session=True)
+        try:
+            stdout, stderr = out.communicate(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            _kill_docker(out)
+            out.stdout.close()
+            out.wait()
+            raise errors.EngineTimeout
+    profiling.count("bytes_read", len(stdout))
+    stdout = stdout.decode("utf-8")
+    if check and out.returncode != 0:
+        raise errors.BadResponseDockerEngine
+
+    return stdout
+
+
+def _iter_docker(cmds, timeout=None):
+    """
+    Runs a docker cli command, yielding it's output a line at a time as it's written, rather than waiting for the
+    whole of it. Docker is killed if it runs past the timeout, or if the lines stop being read part way through.
+
+    :param cmds: The command and arguments to run.
+    :type cmds: list
+    :param timeout: Seconds to wait for docker before giving up.
+    :type timeout: int
+    :returns: Generator of the output's lines, each ending with it's newline.
+    :rtype: generator
+    """
+    import subprocess
+    import threading
+
     out = subprocess.Popen(
         cmds,
         stdout=subprocess.PIPE,
-        stderr=subprocess.STDOUT)
-    stdout, stderr = out.communicate()
-    stdout = stdout.decode("utf-8")
-    if "Error" in stdout or "Cannot connect" in stdout:
+        stderr=subprocess.STDOUT,
+        start_new_session=True)
+    timed_out = threading.Event()
+    timer = None
+    if timeout:
+        timer = threading.Timer(timeout, _kill_timed_out, (out, timed_out))
+        timer.daemon = True
+        timer.start()
+    # Only the reads are timed as the docker stage, not whatever the caller does with each line between them.
+    readline = profiling.timed("docker", out.stdout.readline)
+    try:
+        for line in iter(readline, b""):
+            profiling.count("bytes_read", len(line))
+            yield line.decode("utf-8")
+        out.wait()
+    finally:
+        if timer:
+            timer.cancel()
+        if out.poll() is None:
+            _kill_docker(out)
+            out.wait()
+        out.stdout.close()
+
+    if timed_out.is_set():
+        raise errors.EngineTimeout
+    if out.returncode != 0:
         raise errors.BadResponseDockerEngine
 
-    return stdout
+
+def _kill_timed_out(out, timed_out):
+    """
+    Kills a docker cli command which ran past it's timeout, along with anything it started which may still be holding
+    it's output open, even if docker itself has exited.
+
+    :param out: The running command.
+    :type out: <Popen obj>
+    :param timed_out: Set once the command has been killed.
+    :type timed_out: <Event obj>
+    """
+    timed_out.set()
+    _kill_docker(out)
+
+
+def _kill_docker(out):
+    """
+    Kills a docker cli command and anything it started. Commands are run in their own session, so their process group
+    is everything they started.
+
+    :param out: The running command, started with start_new_session.
+    :type out: <Popen obj>
+    """
+    import signal
+
+    try:
+        if hasattr(os, "killpg"):
+            os.killpg(out.pid, signal.SIGKILL)
+        else:  # Windows
+            out.kill()
+    except ProcessLookupError:
+        pass
 
 
 def clean_output(output):
     """
-    Cleans the output from the docker ps command, storing it into a list of dicts.
+    Cleans the output from the docker ps command, storing it into a list of Containers.
     Unit Test: test_clean_output
 
     :param output: The standard out from the docker ps command.
@@ -206,40 +1282,417 @@ def clean_output(output):
     :returns: Cleaned, usable output from docker-ps
     :rtype: list
     """
-    lines = output.split("\n")
-    containers = []
-    for line in lines[1:]:
-        line_split = line.split("  ")
-        revised_line_split = []
-        if len(line_split) == 1:
+    return list(iter_clean_output(output.split("\n")))
+
+
+def iter_clean_output(lines):
+    """
+    Cleans the docker ps command's output a line at a time, yielding each Container as soon as it's line is read.
+    Unit Test: test_iter_clean_output
+
+    :param lines: The lines of the docker ps command's standard out, header first.
+    :type lines: iterable
+    :returns: Generator of the cleaned containers.
+    :rtype: generator
+    """
+    lines = iter(lines)
+    # Skip the header.
+    next(lines, None)
+    count = 0
+    now = datetime.now()
+    parse_ps_date = profiling.timed("dates", _parse_ps_date)
+    clean_line = profiling.timed("parse", _clean_output_line)
+    for line in lines:
+        container = clean_line(line, count, now, parse_ps_date)
+        if container is None:
             continue
-        for piece in line_split:
-            if piece and piece.strip() != "":
-                revised_line_split.append(piece)
-        container = {
-            "container_id": revised_line_split[0].strip(),
-            "image": revised_line_split[1].strip(),
-            "command": revised_line_split[2].strip().replace('"', ""),
-            "created": revised_line_split[3].strip(),
-            "created_date": _parse_ps_date(revised_line_split[4].strip()),
-            "status": revised_line_split[4].strip(),
-            "status_date": _parse_ps_date(revised_line_split[4].strip()),
-            "running": _clean_status(revised_line_split[4])
-        }
+        yield container
+        count += 1
 
-        # Not all containers will have ports
-        if len(revised_line_split) == 6:
-            container["ports"] = []
-            container["name"] = revised_line_split[5].strip()
-        else:
-            container["ports"] = _parse_ports(revised_line_split[5])
-            container["name"] = revised_line_split[6].strip()
-        containers.append(container)
 
-    containers = get_container_colors(containers)
+def _clean_output_line(line, count, now, parse_ps_date):
+    """
+    Cleans a line of the docker ps command's output into a Container.
+
+    :param line: The line, ie "1a31fcaccf59  nginx  ...".
+    :type line: str
+    :param count: The container number, 0 indexed, picking it's color.
+    :type count: int
+    :param now: The time the relative dates are from.
+    :type now: <Datetime obj>
+    :param parse_ps_date: _parse_ps_date(), timed when profiling.
+    :type parse_ps_date: function
+    :returns: The cleaned container, or None for a line without one.
+    :rtype: <Container obj>
+    """
+    line_split = line.split("  ")
+    revised_line_split = []
+    if len(line_split) == 1:
+        return None
+    for piece in line_split:
+        if piece and piece.strip() != "":
+            revised_line_split.append(piece)
+
+    # Not all containers will have ports
+    if len(revised_line_split) == 6:
+        ports = []
+        name = revised_line_split[5].strip()
+    else:
+        ports = _parse_ports(revised_line_split[5])
+        name = revised_line_split[6].strip()
+
+    created = revised_line_split[3].strip()
+    status = revised_line_split[4].strip()
+    return Container(
+        container_id=revised_line_split[0].strip(),
+        image=revised_line_split[1].strip(),
+        command=revised_line_split[2].strip().replace('"', ""),
+        created=created,
+        created_date=parse_ps_date(created, now),
+        status=status,
+        status_date=parse_ps_date(status, now),
+        running=_clean_status(revised_line_split[4]),
+        ports=ports,
+        name=name,
+        color=get_color(count))
+
+
+def clean_json_output(output):
+    """
+    Cleans the output from `docker ps --format '{{json .}}'`, which is one JSON object per container per line, storing
+    it into the same list of Containers as clean_output().
+    Unit Test: test_clean_json_output
+
+    :param output: The standard out from the docker ps command.
+    :type output: str
+    :returns: Cleaned, usable output from docker-ps
+    :rtype: list
+    """
+    return list(iter_clean_json_output(output.splitlines()))
+
+
+def iter_clean_json_output(lines):
+    """
+    Cleans `docker ps --format '{{json .}}'` output a line at a time, yielding each Container as soon as it's line is
+    read.
+    Unit Test: test_iter_clean_json_output
+
+    :param lines: The lines of the docker ps command's standard out.
+    :type lines: iterable
+    :returns: Generator of the cleaned containers.
+    :rtype: generator
+    """
+    count = 0
+    now = datetime.now()
+    parse_ps_date = profiling.timed("dates", _parse_ps_date)
+    parse_docker_date = profiling.timed("dates", _parse_docker_date)
+    clean_line = profiling.timed("parse", _clean_json_line)
+    for line in lines:
+        if not line.strip():
+            continue
+        yield clean_line(line, count, now, parse_ps_date, parse_docker_date)
+        count += 1
+
+
+def _clean_json_line(line, count, now, parse_ps_date, parse_docker_date):
+    """
+    Cleans a line of `docker ps --format '{{json .}}'` output into a Container.
+
+    :param line: The line, a JSON object.
+    :type line: str
+    :param count: The container number, 0 indexed, picking it's color.
+    :type count: int
+    :param now: The time the relative dates are from.
+    :type now: <Datetime obj>
+    :param parse_ps_date: _parse_ps_date(), timed when profiling.
+    :type parse_ps_date: function
+    :param parse_docker_date: _parse_docker_date(), timed when profiling.
+    :type parse_docker_date: function
+    :returns: The cleaned container.
+    :rtype: <Container obj>
+    """
+    import json
+
+    try:
+        row = json.loads(line)
+    except ValueError:
+        raise errors.BadResponseDockerEngine
+
+    status = row.get("Status", "")
+    command = row.get("Command", "")
+    if len(command) > 1 and command[0] == '"' and command[-1] == '"':
+        command = command[1:-1]
+    return Container(
+        container_id=row["ID"][:12],
+        image=row.get("Image", ""),
+        command=command,
+        created=row.get("RunningFor", ""),
+        created_date=parse_docker_date(row.get("CreatedAt", "")),
+        status=status,
+        status_date=parse_ps_date(status, now),
+        running=_clean_status(status),
+        ports=_parse_ports(row.get("Ports", "")),
+        name=row.get("Names", ""),
+        color=get_color(count))
+
+
+def _parse_docker_date(val):
+    """
+    Parses the absolute timestamps the docker cli prints, ie "2019-01-15 03:06:40 -0700 MST" into a local datetime.
+    Unit tested: test__parse_docker_date
+
+    :param val: The docker cli timestamp.
+    :type val: str
+    :returns: The timestamp as a naive, local datetime, or now if the value can not be parsed.
+    :rtype: <Datetime obj>
+    """
+    # Docker's format is fixed width, so it's sliced apart rather than going through the much slower strptime().
+    if len(val) < 25 or val[4] != "-" or val[10] != " " or val[19] != " ":
+        return datetime.now()
+    try:
+        the_date = datetime(
+            int(val[0:4]),
+            int(val[5:7]),
+            int(val[8:10]),
+            int(val[11:13]),
+            int(val[14:16]),
+            int(val[17:19]),
+            tzinfo=_docker_timezone(val[20:25]))
+    except ValueError:
+        return datetime.now()
+
+    return the_date.astimezone().replace(tzinfo=None)
+
+
+@lru_cache(maxsize=64)
+def _docker_timezone(offset):
+    """
+    Gets the timezone for a docker timestamp's offset, memoized since a listing only has one or two of them.
+
+    :param offset: The UTC offset, ie "-0700".
+    :type offset: str
+    :returns: The timezone.
+    :rtype: <Timezone obj>
+    """
+    if len(offset) != 5 or offset[0] not in "+-" or not offset[1:].isdigit():
+        raise ValueError("Invalid UTC offset %s" % offset)
+    minutes = int(offset[1:3]) * 60 + int(offset[3:5])
+    return timezone(timedelta(minutes=-minutes if offset[0] == "-" else minutes))
+
+
+def _parse_rfc3339_date(val):
+    """
+    Parses the RFC 3339 timestamps from docker inspect, ie "2019-01-15T03:06:40.586865123Z" into a local datetime.
+    Unit tested: test__parse_rfc3339_date
+
+    :param val: The docker inspect timestamp.
+    :type val: str
+    :returns: The timestamp as a naive, local datetime, or None for Docker's zero time or a value we can't parse.
+    :rtype: <Datetime obj>
+    """
+    match = RFC3339_RE.match(val)
+    if not match or val.startswith("0001-01-01"):
+        return None
+
+    seconds, fraction, offset = match.groups()
+    if not offset or offset == "Z":
+        offset = "+00:00"
+    try:
+        the_date = datetime(
+            int(seconds[0:4]),
+            int(seconds[5:7]),
+            int(seconds[8:10]),
+            int(seconds[11:13]),
+            int(seconds[14:16]),
+            int(seconds[17:19]),
+            int(fraction[1:7].ljust(6, "0")) if fraction else 0,
+            tzinfo=_docker_timezone(offset.replace(":", "")))
+    except ValueError:
+        return None
+
+    return the_date.astimezone().replace(tzinfo=None)
+
+
+def clean_api_output(api_containers):
+    """
+    Cleans the containers returned from the Docker Engine API, storing them in the same format as clean_output().
+    Unit Test: test_clean_api_output
+
+    :param api_containers: The decoded JSON from the engine's /containers/json endpoint.
+    :type api_containers: list
+    :returns: Cleaned, usable container data.
+    :rtype: list
+    """
+    now = time.time()
+    now_date = datetime.fromtimestamp(now)
+    containers = []
+    parse_ps_date = profiling.timed("dates", _parse_ps_date)
+    for api_container in api_containers:
+        created_ts = api_container.get("Created", now)
+        status = api_container.get("Status", "")
+        names = api_container.get("Names") or [""]
+        containers.append(Container(
+            container_id=api_container["Id"][:12],
+            image=api_container.get("Image", ""),
+            command=api_container.get("Command", ""),
+            created="%s ago" % _humanize_duration(now - created_ts),
+            created_date=datetime.fromtimestamp(created_ts),
+            status=status,
+            status_date=parse_ps_date(status, now_date),
+            running=api_container.get("State") in RUNNING_STATES,
+            ports=_parse_api_ports(api_container.get("Ports") or []),
+            name=names[0].lstrip("/"),
+            color=get_color(len(containers))))
+
     return containers
 
 
+def clean_api_stats(api_stats):
+    """
+    Cleans a container's stats from the Docker Engine API into the same values `docker stats` prints.
+    Unit Test: test_clean_api_stats
+
+    :param api_stats: The decoded JSON from the engine's /containers/{id}/stats endpoint.
+    :type api_stats: dict
+    :returns: The container's stats, ie {"cpu": "0.15%", "memory": "10.5MiB / 1.944GiB", ...}.
+    :rtype: dict
+    """
+    cpu_stats = api_stats.get("cpu_stats") or {}
+    precpu_stats = api_stats.get("precpu_stats") or {}
+    cpu_usage = cpu_stats.get("cpu_usage") or {}
+    cpu_delta = cpu_usage.get("total_usage", 0) - (precpu_stats.get("cpu_usage") or {}).get("total_usage", 0)
+    system_delta = cpu_stats.get("system_cpu_usage", 0) - precpu_stats.get("system_cpu_usage", 0)
+    online_cpus = cpu_stats.get("online_cpus") or len(cpu_usage.get("percpu_usage") or []) or 1
+    cpu_percent = 0.0
+    if cpu_delta > 0 and system_delta > 0:
+        cpu_percent = cpu_delta / system_delta * online_cpus * 100
+
+    memory_stats = api_stats.get("memory_stats") or {}
+    memory_usage = memory_stats.get("usage", 0)
+    # Like the docker cli, don't count the page cache as used memory, cgroup v1 then v2.
+    for cache_field in ["total_inactive_file", "inactive_file"]:
+        cache_size = (memory_stats.get("stats") or {}).get(cache_field)
+        if cache_size is not None:
+            if cache_size < memory_usage:
+                memory_usage -= cache_size
+            break
+    memory_limit = memory_stats.get("limit", 0)
+    memory_percent = memory_usage / memory_limit * 100 if memory_limit else 0.0
+
+    net_rx = net_tx = 0
+    for network in (api_stats.get("networks") or {}).values():
+        net_rx += network.get("rx_bytes", 0)
+        net_tx += network.get("tx_bytes", 0)
+
+    block_read = block_write = 0
+    for entry in (api_stats.get("blkio_stats") or {}).get("io_service_bytes_recursive") or []:
+        op = entry.get("op", "").lower()
+        if op == "read":
+            block_read += entry.get("value", 0)
+        elif op == "write":
+            block_write += entry.get("value", 0)
+
+    return {
+        "cpu": "%.2f%%" % cpu_percent,
+        "memory": "%s / %s" % (
+            _human_size(memory_usage, 1024, BINARY_SIZE_UNITS, 4),
+            _human_size(memory_limit, 1024, BINARY_SIZE_UNITS, 4)),
+        "memory_percent": "%.2f%%" % memory_percent,
+        "net": "%s / %s" % (
+            _human_size(net_rx, 1000, DECIMAL_SIZE_UNITS, 3),
+            _human_size(net_tx, 1000, DECIMAL_SIZE_UNITS, 3)),
+        "block": "%s / %s" % (
+            _human_size(block_read, 1000, DECIMAL_SIZE_UNITS, 3),
+            _human_size(block_write, 1000, DECIMAL_SIZE_UNITS, 3)),
+    }
+
+
+def _human_size(size, base, units, precision):
+    """
+    Formats a number of bytes like Docker's go-units package, ie "10.5MiB" or "1.45kB".
+    Unit tested: test__human_size
+
+    :param size: The number of bytes.
+    :type size: int
+    :param base: 1024 for binary units, 1000 for decimal.
+    :type base: int
+    :param units: The unit names, from bytes up.
+    :type units: list
+    :param precision: Significant figures to show.
+    :type precision: int
+    :returns: The formatted size.
+    :rtype: str
+    """
+    size = float(size)
+    unit = 0
+    while size >= base and unit < len(units) - 1:
+        size /= base
+        unit += 1
+    return "%.*g%s" % (precision, size, units[unit])
+
+
+def _parse_api_ports(api_ports):
+    """
+    Formats the port data from the Docker Engine API the same way the docker cli does.
+    Unit tested: test__parse_api_ports
+
+    :param api_ports: The "Ports" list of a container from the engine API.
+    :type api_ports: list
+    :returns: The ports as a list of strings, ie "0.0.0.0:5000->5000/tcp".
+    :rtype: list
+    """
+    ports = []
+    for port in api_ports:
+        if port.get("PublicPort"):
+            ports.append("%s:%s->%s/%s" % (
+                port.get("IP", ""),
+                port["PublicPort"],
+                port.get("PrivatePort"),
+                port.get("Type", "tcp")))
+        else:
+            ports.append("%s/%s" % (port.get("PrivatePort"), port.get("Type", "tcp")))
+    return ports
+
+
+def _humanize_duration(seconds):
+    """
+    Creates the same human readable duration the docker cli displays, ie "About an hour" or "5 days".
+    Unit tested: test__humanize_duration
+
+    :param seconds: The duration in seconds.
+    :type seconds: int|float
+    :returns: The humanized duration.
+    :rtype: str
+    """
+    seconds = int(seconds)
+    if seconds < 1:
+        return "Less than a second"
+    elif seconds == 1:
+        return "1 second"
+    elif seconds < 60:
+        return "%d seconds" % seconds
+
+    minutes = seconds // 60
+    if minutes == 1:
+        return "About a minute"
+    elif minutes < 60:
+        return "%d minutes" % minutes
+
+    hours = int(round(seconds / 3600.0))
+    if hours == 1:
+        return "About an hour"
+    elif hours < 48:
+        return "%d hours" % hours
+    elif hours < 24 * 7 * 2:
+        return "%d days" % (hours // 24)
+    elif hours < 24 * 30 * 2:
+        return "%d weeks" % (hours // 24 // 7)
+    elif hours < 24 * 365 * 2:
+        return "%d months" % (hours // 24 // 30)
+
+    return "%d years" % (seconds // 3600 // 24 // 365)
+
+
 def _parse_ports(port_str):
     """
     Cleans port data from docker ps.
@@ -260,60 +1713,46 @@ def _parse_ports(port_str):
     return ports
 
 
-def _parse_ps_date(val):
+def _parse_ps_date(val, now=None):
     """
     Gets the relative time the container was created based on the string from the docker ps command.
     Unit test: test__parse_ps_date
 
-    :param val: The string representation of when the container was started.
+    :param val: The string representation of when the container was started, ie "Up 5 days" or "2 weeks ago".
     :type val: str
+    :param now: The time to count back from, pass the same one for every container in a run.
+    :type now: <Datetime obj>
     :returns: Rough datetime for when the container was started.
     :rtype: <Datetime obj>
     """
-    now = datetime.now()
-    cleaned = val.replace('Up ', '').lower()
-    # 'Restarting' containers will look like so "Restarting (1) 36 seconds ago"
-    if 'restarting' in cleaned:
-        cleaned = cleaned[cleaned.find(')') + 1:]
-
-    cleaned = cleaned.replace('ago', '').strip()
-
-    if '(healthy' in cleaned:
-        cleaned = cleaned[:cleaned.find('(healthy')].strip()
-
-    elif '(health' in cleaned:
-        cleaned = cleaned[:cleaned.find(')') + 1].strip()
-
-    elif '(unhealthy' in cleaned:
-        cleaned = cleaned[:cleaned.find('(')].strip()
-
-    elif 'exited (' in cleaned:
-        cleaned = cleaned[cleaned.find(')') + 1:].strip()
-
-    if 'seconds' in cleaned:
-        digit = cleaned.replace(' seconds', '')
-        digit = int(digit)
-        the_date = now - timedelta(seconds=digit)
-    elif 'minutes' in cleaned:
-        digit = cleaned.replace(' minutes', '')
-        digit = int(digit)
-        the_date = now - timedelta(minutes=digit)
-    elif 'about an hour' in cleaned:
-        digit = 1
-        the_date = now - timedelta(hours=digit)
-    elif 'hours' in cleaned:
-        digit = cleaned.replace(' hours', '')
-        digit = int(digit)
-        the_date = now - timedelta(hours=digit)
-    elif 'days' in cleaned:
-        digit = cleaned.replace(' days', '')
-        digit = int(digit)
-        the_date = now - timedelta(days=digit)
+    if not now:
+        now = datetime.now()
+    return now - _ps_date_offset(val)
 
-    else:
-        the_date = now
 
-    return the_date
+@lru_cache(maxsize=1024)
+def _ps_date_offset(val):
+    """
+    Gets how long ago a docker ps humanized duration was, memoized since the same few strings repeat in a listing.
+    Understands all of Docker's units, ie "Less than a second", "About a minute", "3 weeks", "Exited (0) 2 years ago".
+
+    :param val: The string representation of when the container was started.
+    :type val: str
+    :returns: How long ago the string describes, or no time if it doesn't describe one, ie "Created".
+    :rtype: <Timedelta obj>
+    """
+    match = PS_DATE_RE.search(val)
+    if not match:
+        return timedelta(0)
+
+    amount, unit = match.groups()
+    amount = amount.lower()
+    if amount == "less than a":
+        return timedelta(0)
+    elif amount in ["a", "an"]:
+        amount = 1
+
+    return timedelta(seconds=int(amount) * PS_DATE_UNITS[unit.lower()])
 
 
 def _clean_status(val):
@@ -340,14 +1779,13 @@ def get_container_colors(containers):
 
     :param containers: The containers found from docker ps.
     :type containers: list
-    :returns: Added color cmd to each container.
+    :returns: Copies of the containers with their color cmd set.
     :rtype: list
     """
-    count = 0
-    for c in containers:
-        c['color'] = get_color(count)
-        count += 1
-    return containers
+    colored_containers = []
+    for count, c in enumerate(containers):
+        colored_containers.append(c.replace(color=get_color(count)))
+    return colored_containers
 
 
 def get_color(count):
@@ -369,10 +1807,7 @@ def get_color(count):
         '\033[93m',  # yellow
         '\033[95m',  # magenta
     ]
-    while count > len(colors):
-        colors += colors
-
-    return colors[count - 1]
+    return colors[(count - 1) % len(colors)]
 
 
 def _get_num_running_containers(containers):
@@ -387,83 +1822,212 @@ def _get_num_running_containers(containers):
     """
     total_running = 0
     for container in containers:
-        if container['running']:
+        if container.running:
             total_running += 1
     return total_running
 
 
 def filter_containers(containers, args):
     """
-    Filters containers by the search phrase matching the container name in some way.
+    Filters containers by the search phrase matching the container name in some way, and by the --where expression.
     Unit tested: test_filter_containers
 
     :param containers: The containers found from docker ps.
     :type containers: list
     :param args: The CLI args
     :type args: <class 'argparse.Namespace'>
-    :returns: The filtered list of dicts of containers.
+    :returns: The filtered list of containers.
     :rtype: list
     """
-    if not args.search and args.all:
+    if not args.search and not args.where and args.all:
         return containers
 
-    # Filter containers by search criteria.
-    filtered_containers = []
+    return list(iter_filter_containers(containers, args))
+
+
+def iter_filter_containers(containers, args):
+    """
+    Yields each container as soon as it passes the running, search and --where filters, so output can be streamed.
+    Unit tested: test_iter_filter_containers
+
+    :param containers: The containers found from docker ps.
+    :type containers: iterable
+    :param args: The CLI args
+    :type args: <class 'argparse.Namespace'>
+    :returns: Generator of the containers which pass the filters.
+    :rtype: generator
+    """
+    search_index = None
     if args.search:
-        for container in containers:
-            for search in args.search:
-                if search in container['name']:
-                    filtered_containers.append(container)
-                    break
-    else:
-        filtered_containers = containers
+        search_index = search.search_index(tuple(args.search))
+    predicate = None
+    if args.where:
+        predicate = where.compile_where(args.where)
 
-    # Filter only running containers.
-    more_filtered_containers = []
-    if not args.all:
-        for container in filtered_containers:
-            if container['running']:
-                more_filtered_containers.append(container)
-    else:
-        more_filtered_containers = filtered_containers
+    for container in containers:
+        # Filter only running containers.
+        if not args.all and not container.running:
+            continue
+
+        # Filter containers by search criteria.
+        if search_index and not search_index.matches(container.name):
+            continue
 
-    return more_filtered_containers
+        # Filter containers by the --where expression.
+        if predicate and not predicate(container):
+            continue
+
+        yield container
 
 
 def order_containers(containers, args):
     """
-    Orders containers based on the field requested.
+    Orders containers based on the keys requested, ie "running,-created,name". Each container's sort key is worked
+    out once, as a tuple of every key, so there's just one sort however many keys there are. With a --limit only the
+    containers to be shown are picked out, using a heap rather than sorting every container.
     Unit tested: test_order_containers
 
     :param containers: The containers found from docker ps.
     :type containers: list
     :param args: The CLI args
     :type args: <class 'argparse.Namespace'>
-    :returns: The ordered list of dicts of containers.
+    :returns: The ordered list of containers.
     :rtype: list
     """
-    if not containers:
-        return containers
-
-    field = "status_date"
-    if args.order:
-        if args.order in ["name", "container"]:
-            field = "name"
-        if args.order in ["created", "create"]:
-            field = "created_date"
-
-    ordered_containers = sorted(containers, key=itemgetter(field))
+    if not containers:
+        return containers
+
+    key = order_key(parse_order(args.order))
+    if args.limit is not None and args.offset + args.limit < len(containers):
+        pick = heapq.nlargest if args.reverse else heapq.nsmallest
+        ordered_containers = pick(args.offset + args.limit, containers, key=key)
+    else:
+        ordered_containers = sorted(containers, key=key, reverse=args.reverse)
+
+    if args.offset:
+        ordered_containers = ordered_containers[args.offset:]
+
+    return ordered_containers
+
+
+@lru_cache(maxsize=32)
+def parse_order(order):
+    """
+    Parses an --order value into it's keys and their directions.
+    Unit tested: test_parse_order
+
+    :param order: The --order value, ie "running,created:desc,name" or "running,-created,name", empty for the
+        default order.
+    :type order: str
+    :returns: The (key, descending) tuples, ie (("running", False), ("created", True), ("name", False)).
+    :rtype: tuple
+    """
+    keys = []
+    for part in (order or "").split(","):
+        part = part.strip().lower()
+        if not part:
+            continue
+        # A - prefix reads as an option to argparse unless given with an =, so a :desc suffix says the same.
+        part, _, direction = part.partition(":")
+        if direction not in ["", "asc", "desc"]:
+            raise errors.InvalidOrder("unknown direction %s, expected asc or desc" % direction)
+        descending = part.startswith("-") or direction == "desc"
+        name = part.lstrip("+-")
+        name = ORDER_ALIASES.get(name, name)
+        if name not in ORDER_KEYS:
+            raise errors.InvalidOrder(
+                "unknown key %s, expected some of %s" % (name, ", ".join(sorted(ORDER_KEYS))))
+        keys.append((name, descending))
+
+    if not keys:
+        keys.append(("status", False))
+
+    return tuple(keys)
+
+
+def order_key(keys):
+    """
+    Creates the sort key function for parsed --order keys, returning a tuple of every key's value for a container.
+    Descending numbers are negated and anything else is wrapped to compare backwards.
+    Unit tested: test_order_key
+
+    :param keys: The (key, descending) tuples, from parse_order().
+    :type keys: tuple
+    :returns: The sort key function.
+    :rtype: function
+    """
+    getters = []
+    for name, descending in keys:
+        getter, numeric = ORDER_KEYS[name]
+        if descending and numeric:
+            getter = _negated(getter)
+        elif descending:
+            getter = _descending(getter)
+        getters.append(getter)
+
+    if len(getters) == 1:
+        return getters[0]
+
+    return lambda container: tuple([getter(container) for getter in getters])
+
+
+def _negated(getter):
+    return lambda container: -getter(container)
+
+
+def _descending(getter):
+    return lambda container: _Descending(getter(container))
+
+
+class _Descending(object):
+    """Wraps a sort key value so that it sorts in reverse."""
+
+    __slots__ = ["value"]
+
+    def __init__(self, value):
+        self.value = value
+
+    def __eq__(self, other):
+        return self.value == other.value
+
+    def __lt__(self, other):
+        return other.value < self.value
+
+    def __gt__(self, other):
+        return other.value > self.value
+
+
+def print_format(containers, total_containers, total_running_containers, args, unreachable_hosts=None,
+                 num_matched=None):
+    """
+    Actually prints the stuff to the console.
+    Unit tested: test_print_format
+
+    :param containers: The containers found from docker ps.
+    :type containers: list
+    :param total_containers: Number of containers.
+    :type total_containers: int
+    :param total_running_containers: Number of total running containers.
+    :type total_running_containers: int
+    :param args: Parsed arguments from cli.
+    :type args: <Namespace> obj
+    :param unreachable_hosts: The (host, reason) tuples for hosts which could not be reached.
+    :type unreachable_hosts: list
+    :param num_matched: Number of containers which passed the filters, before any --limit.
+    :type num_matched: int
+    """
+    sys.stdout.write(
+        format_output(containers, total_containers, total_running_containers, args, unreachable_hosts, num_matched))
+    sys.stdout.flush()
 
-    if args.reverse:
-        ordered_containers.reverse()
-
-    return ordered_containers
+    return True
 
 
-def print_format(containers, total_containers, total_running_containers, args):
+def format_output(containers, total_containers, total_running_containers, args, unreachable_hosts=None,
+                  num_matched=None):
     """
-    Actually prints the stuff to the console.
-    Unit tested: test_print_format
+    Creates the full pretty output, header, containers and footer, as one string so it can be written at once.
+    Unit tested: test_format_output
 
     :param containers: The containers found from docker ps.
     :type containers: list
@@ -473,26 +2037,79 @@ def print_format(containers, total_containers, total_running_containers, args):
     :type total_running_containers: int
     :param args: Parsed arguments from cli.
     :type args: <Namespace> obj
+    :param unreachable_hosts: The (host, reason) tuples for hosts which could not be reached.
+    :type unreachable_hosts: list
+    :param num_matched: Number of containers which passed the filters, before any --limit.
+    :type num_matched: int
+    :returns: The output to print.
+    :rtype: str
+    """
+    lines = header_lines(args)
+    lines += pretty_fmt_container_lines(containers, args)
+    lines += footer_lines(
+        len(containers), total_containers, total_running_containers, args, unreachable_hosts, num_matched)
+    return "\n".join(lines) + "\n"
+
+
+def header_lines(args):
+    """
+    Creates the lines describing what is being displayed, printed above the containers.
+    Unit tested: test_header_lines
+
+    :param args: Parsed arguments from cli.
+    :type args: <Namespace> obj
+    :returns: The header lines.
+    :rtype: list
     """
     if args.search:
         if not args.all:
-            print('Currently running containers with: "%s" \n' % '", "'.join(args.search))
+            return ['Currently running containers with: "%s" ' % '", "'.join(args.search), ""]
         else:
-            print('All cotnainers containers with: "%s" \n' % '", "'.join(args.search))
+            return ['All cotnainers containers with: "%s" ' % '", "'.join(args.search), ""]
     else:
         if not args.all:
-            print("All currently running docker containers\n")
+            return ["All currently running docker containers", ""]
         else:
-            print("All docker containers\n")
+            return ["All docker containers", ""]
 
-    pretty_print_fmt_containers(containers, args)
 
-    print("\nTotal containers:\t%s" % total_containers)
-    print("Total running:\t\t%s" % total_running_containers)
-    if args.search:
-        print("Containers in search:\t%s" % len(containers))
+def footer_lines(num_containers, total_containers, total_running_containers, args, unreachable_hosts=None,
+                 num_matched=None):
+    """
+    Creates the container totals lines, printed below the containers.
+    Unit tested: test_footer_lines
 
-    return True
+    :param num_containers: Number of containers being displayed.
+    :type num_containers: int
+    :param total_containers: Number of containers.
+    :type total_containers: int
+    :param total_running_containers: Number of total running containers.
+    :type total_running_containers: int
+    :param args: Parsed arguments from cli.
+    :type args: <Namespace> obj
+    :param unreachable_hosts: The (host, reason) tuples for hosts which could not be reached.
+    :type unreachable_hosts: list
+    :param num_matched: Number of containers which passed the filters, before any --limit.
+    :type num_matched: int
+    :returns: The footer lines.
+    :rtype: list
+    """
+    lines = [
+        "",
+        "Total containers:\t%s" % total_containers,
+        "Total running:\t\t%s" % total_running_containers]
+    if num_matched is None:
+        num_matched = num_containers
+    if args.search:
+        lines.append("Containers in search:\t%s" % num_matched)
+    if num_containers != num_matched:
+        lines.append("Showing:\t\t%s of %s" % (num_containers, num_matched))
+    if unreachable_hosts:
+        lines.append("%sUnreachable hosts:%s\t%s" % (
+            RED,
+            ENDC,
+            ", ".join(["%s (%s)" % (host, reason) for host, reason in unreachable_hosts])))
+    return lines
 
 
 def pretty_print_fmt_containers(containers, args):
@@ -504,6 +2121,46 @@ def pretty_print_fmt_containers(containers, args):
     :param args: Parsed arguments from cli.
     :type args: <Namespace> obj
     """
+    lines = pretty_fmt_container_lines(containers, args)
+    if lines:
+        sys.stdout.write("\n".join(lines) + "\n")
+
+    return True
+
+
+def pretty_fmt_container_lines(containers, args):
+    """
+    Creates the lines of the regular long form output for all containers, with the label column width worked out
+    once for all of them.
+    Unit tested: test_pretty_fmt_container_lines
+
+    :param containers: The containers found from docker ps.
+    :type containers: list
+    :param args: Parsed arguments from cli.
+    :type args: <Namespace> obj
+    :returns: The lines to print.
+    :rtype: list
+    """
+    selected_includes = get_selected_includes(args)
+    contents = [container_print_content(container, selected_includes, args) for container in containers]
+    col_width = get_col_width(contents)
+
+    lines = []
+    for container_content in contents:
+        lines += container_lines(container_content, col_width)
+    return lines
+
+
+def get_selected_includes(args):
+    """
+    Gets the include letters for the data points to display for each container.
+    Unit tested: test_get_selected_includes
+
+    :param args: Parsed arguments from cli.
+    :type args: <Namespace> obj
+    :returns: The include letters, ie ["c", "p"].
+    :rtype: list
+    """
     selected_includes = ["r", "s", "c", "p", "n", "i", "m"]
     if args.slim or args.include:
         selected_includes = []
@@ -512,64 +2169,87 @@ def pretty_print_fmt_containers(containers, args):
         for include in args.include:
             selected_includes.append(include)
 
-    print_content = {}
-    for container in containers:
-        container_content = {
-            "display_name": container_display_name(container, args),
-            "data": []
-        }
+    return selected_includes
 
-        # Prep the container Co(n)tainer ID
-        if "n" in selected_includes:
-            container_content["data"].append(
-                [
-                    BOLD + "\tContainer ID:" + ENDC,
-                    container["container_id"]])
 
-        # Prep the container (i)mage ID
-        if "i" in selected_includes:
-            container_content["data"].append(
-                [
-                    BOLD + "\tImage:" + ENDC,
-                    container["image"]])
+def container_print_content(container, selected_includes, args):
+    """
+    Gathers the display name and the selected data points for a single container.
 
-        # Prep the container co(m)mand
-        if "m" in selected_includes:
-            container_content["data"].append(
-                [
-                    BOLD + "\tCommand:" + ENDC,
-                    container["command"]])
+    :param container: The container to have information formatted for print.
+    :type container: dict
+    :param selected_includes: Includes to be selected for return.
+    :type selected_includes: list
+    :param args: Parsed arguments from cli.
+    :type args: <Namespace> obj
+    :returns: The container's display name and rows of data, ie {"display_name": "web", "data": [["Status:", "Up"]]}.
+    :rtype: dict
+    """
+    container_content = {
+        "display_name": container_display_name(container, args),
+        "data": []
+    }
+
+    # Prep the container's host, when querying many hosts
+    if container.host:
+        container_content["data"].append(
+            [
+                BOLD + "\tHost:" + ENDC,
+                container.host])
+
+    # Prep the container Co(n)tainer ID
+    if "n" in selected_includes:
+        container_content["data"].append(
+            [
+                BOLD + "\tContainer ID:" + ENDC,
+                container.container_id])
 
-        # Prep the container (c)reated
-        created_data = _handle_column_created(args, container, selected_includes)
-        if created_data:
-            container_content["data"] += created_data
+    # Prep the container (i)mage ID
+    if "i" in selected_includes:
+        container_content["data"].append(
+            [
+                BOLD + "\tImage:" + ENDC,
+                container.image])
 
-        # Prep the container (s)tatus
-        status_data = _handle_column_status(container, selected_includes, args)
-        if status_data:
-            container_content["data"] += status_data
+    # Prep the container co(m)mand
+    if "m" in selected_includes:
+        container_content["data"].append(
+            [
+                BOLD + "\tCommand:" + ENDC,
+                container.command])
 
-        # Prep the container state (r)
-        state_data = _handle_column_state(container, selected_includes, args)
-        if state_data:
-            container_content["data"] += state_data
+    # Prep the container (c)reated
+    created_data = _handle_column_created(args, container, selected_includes)
+    if created_data:
+        container_content["data"] += created_data
 
-        # Prep the container (p)orts
-        ports_data = _handle_column_ports(args, container, selected_includes)
-        if ports_data:
-            container_content["data"] += ports_data
+    # Prep the container (s)tatus
+    status_data = _handle_column_status(container, selected_includes, args)
+    if status_data:
+        container_content["data"] += status_data
 
-        print_content[container["name"]] = container_content
+    # Prep the container state (r)
+    state_data = _handle_column_state(container, selected_includes, args)
+    if state_data:
+        container_content["data"] += state_data
 
-    print_data(print_content)
+    # Prep the container (p)orts
+    ports_data = _handle_column_ports(args, container, selected_includes)
+    if ports_data:
+        container_content["data"] += ports_data
 
-    return True
+    # Prep the container resource usage, cp(u), m(e)mory, ne(t) I/O and (b)lock I/O
+    stats_data = _handle_column_stats(container, selected_includes)
+    if stats_data:
+        container_content["data"] += stats_data
+
+    return container_content
 
 
 def container_display_name(container, args):
     """
-    Creates the container display name with formatting and colors.
+    Creates the container display name with formatting and colors, bolding the parts matched by the search from the
+    spans found while filtering.
     Unit tested: test_container_display_name
 
     :param container: The container to have information formatted for print.
@@ -580,16 +2260,17 @@ def container_display_name(container, args):
     :rtype: str
     """
     if not args.search:
-        return container["color"] + container["name"] + ENDC
+        return container.color + container.name + ENDC
     else:
-        highlighted_name = container["color"] + container["name"]
+        name = container.name
+        highlighted_name = container.color
+        last_end = 0
 
-        for search in args.search:
-            highlighted_name = highlighted_name.replace(
-                search,
-                BOLD + container["color"] + search + ENDC + container["color"])
+        for start, end in search.search_index(tuple(args.search)).spans(name):
+            highlighted_name += name[last_end:start] + BOLD + container.color + name[start:end] + ENDC + container.color
+            last_end = end
 
-        return highlighted_name + ENDC
+        return highlighted_name + name[last_end:] + ENDC
 
 
 def _handle_column_state(container, selected_includes, args):
@@ -608,7 +2289,7 @@ def _handle_column_state(container, selected_includes, args):
     """
     print_d = []
     if args.all and "r" in selected_includes:
-        if container["running"]:
+        if container.running:
             print_d.append([
                 BOLD + "\tState:" + ENDC,
                 GREEN + "[ON]" + ENDC])
@@ -639,7 +2320,7 @@ def _handle_column_status(container, selected_includes, args):
         print_d.append(
             [
                 BOLD + "\tStatus:" + ENDC,
-                container["status"]])
+                container.status])
 
     return print_d
 
@@ -661,19 +2342,19 @@ def _handle_column_ports(args, container, selected_includes):
     print_d = []
     # Prep the (p)orts
     if "p" in selected_includes:
-        if len(container["ports"]) == 0:
+        if len(container.ports) == 0:
             print_d.append(
                 [
                     BOLD + "\tPorts:" + ENDC,
                     ''])
-        elif len(container["ports"]) == 1:
+        elif len(container.ports) == 1:
             print_d.append(
                 [
                     BOLD + "\tPorts:" + ENDC,
-                    container["ports"][0]])
+                    container.ports[0]])
         else:
             c = 0
-            for container_port in container["ports"]:
+            for container_port in container.ports:
                 container_port = container_port.strip()
                 if c == 0:
                     print_d.append(
@@ -687,6 +2368,47 @@ def _handle_column_ports(args, container, selected_includes):
     return print_d
 
 
+def _handle_column_stats(container, selected_includes):
+    """
+    Handles the selecting of the resource usage, cp(u), m(e)mory, ne(t) I/O and (b)lock I/O, data for a container.
+    Unit tested: test__handle_column_stats
+
+    :param container: The container to have information formatted for print.
+    :type container: dict
+    :param selected_includes: Includes to be selected for return.
+    :type selected_includes: list
+    :returns: The print values for the stats data.
+    :rtype: list
+    """
+    print_d = []
+    stats = container.stats or {}
+    if "u" in selected_includes:
+        print_d.append(
+            [
+                BOLD + "\tCPU:" + ENDC,
+                stats.get("cpu", "")])
+    if "e" in selected_includes:
+        memory = stats.get("memory", "")
+        if stats.get("memory_percent"):
+            memory += " (%s)" % stats["memory_percent"]
+        print_d.append(
+            [
+                BOLD + "\tMemory:" + ENDC,
+                memory])
+    if "t" in selected_includes:
+        print_d.append(
+            [
+                BOLD + "\tNet I/O:" + ENDC,
+                stats.get("net", "")])
+    if "b" in selected_includes:
+        print_d.append(
+            [
+                BOLD + "\tBlock I/O:" + ENDC,
+                stats.get("block", "")])
+
+    return print_d
+
+
 def _handle_column_created(args, container, selected_includes):
     """
     Handles the selecting of the created (c) data for a container.
@@ -706,7 +2428,7 @@ def _handle_column_created(args, container, selected_includes):
         print_d.append(
             [
                 BOLD + "\tCreated:" + ENDC,
-                container["created"]])
+                container.created])
     return print_d
 
 
@@ -717,18 +2439,333 @@ def print_data(container_info):
     :param container_info: A List of lists to be printed and spaces evenly.
     :type container_info: dict
     """
-    for container_name, container in container_info.items():
-        print(container["display_name"])
-        if not container["data"]:
+    contents = list(container_info.values())
+    col_width = get_col_width(contents)
+
+    lines = []
+    for container_content in contents:
+        lines += container_lines(container_content, col_width)
+    if lines:
+        sys.stdout.write("\n".join(lines) + "\n")
+
+
+def get_col_width(contents):
+    """
+    Gets the width of the label column, from the longest label actually being displayed.
+    Unit tested: test_get_col_width
+
+    :param contents: The containers' display names and data, from container_print_content().
+    :type contents: list
+    :returns: The label column width.
+    :rtype: int
+    """
+    col_width = 0
+    for container_content in contents:
+        for row in container_content["data"]:
+            if len(row[0]) > col_width:
+                col_width = len(row[0])
+    return col_width
+
+
+def container_lines(container_content, col_width=30):
+    """
+    Creates the lines for a single container's block of output, evenly spaced in a table like format.
+    Unit tested: test_container_lines
+
+    :param container_content: The container's display name and data, from container_print_content().
+    :type container_content: dict
+    :param col_width: The width of the label column, see get_col_width().
+    :type col_width: int
+    :returns: The lines to print for the container.
+    :rtype: list
+    """
+    lines = [container_content["display_name"]]
+    if not container_content["data"]:
+        return lines
+
+    # Labels start with a tab and carry invisible formatting, which pads them out to the same place as col_width
+    # plain spaces.
+    continued = " " * col_width
+    for row in container_content["data"]:
+        if len(row[0]) == 0:
+            lines.append(continued + row[1])
+        else:
+            lines.append("%s %s" % (row[0].ljust(col_width), row[1]))
+    lines.append("")
+    return lines
+
+
+def print_table(containers, total_containers, total_running_containers, args, unreachable_hosts=None,
+                num_matched=None):
+    """
+    Prints the compact table output to the console, fit to the terminal's width when writing to one.
+
+    :param containers: The containers found from docker ps.
+    :type containers: list
+    :param total_containers: Number of containers.
+    :type total_containers: int
+    :param total_running_containers: Number of total running containers.
+    :type total_running_containers: int
+    :param args: Parsed arguments from cli.
+    :type args: <Namespace> obj
+    :param unreachable_hosts: The (host, reason) tuples for hosts which could not be reached.
+    :type unreachable_hosts: list
+    :param num_matched: Number of containers which passed the filters, before any --limit.
+    :type num_matched: int
+    """
+    sys.stdout.write(format_table(
+        containers,
+        total_containers,
+        total_running_containers,
+        args,
+        unreachable_hosts,
+        num_matched,
+        _terminal_width()))
+    sys.stdout.flush()
+
+    return True
+
+
+def format_table(containers, total_containers, total_running_containers, args, unreachable_hosts=None,
+                 num_matched=None, max_width=None):
+    """
+    Creates the full compact table output, header, table and footer, as one string so it can be written at once.
+    Unit tested: test_format_table
+
+    :param containers: The containers found from docker ps.
+    :type containers: list
+    :param total_containers: Number of containers.
+    :type total_containers: int
+    :param total_running_containers: Number of total running containers.
+    :type total_running_containers: int
+    :param args: Parsed arguments from cli.
+    :type args: <Namespace> obj
+    :param unreachable_hosts: The (host, reason) tuples for hosts which could not be reached.
+    :type unreachable_hosts: list
+    :param num_matched: Number of containers which passed the filters, before any --limit.
+    :type num_matched: int
+    :param max_width: The most characters a line may take up, ie the terminal width, None for no limit.
+    :type max_width: int
+    :returns: The output to print.
+    :rtype: str
+    """
+    lines = header_lines(args)
+    lines += table_lines(containers, args, max_width)
+    lines += footer_lines(
+        len(containers), total_containers, total_running_containers, args, unreachable_hosts, num_matched)
+    return "\n".join(lines) + "\n"
+
+
+def _terminal_width():
+    """
+    Gets the width of the terminal being printed to.
+
+    :returns: The terminal's width in characters, or None when not printing to a terminal.
+    :rtype: int
+    """
+    import shutil
+
+    if sys.stdout.isatty():
+        return shutil.get_terminal_size().columns
+    return None
+
+
+def table_lines(containers, args, max_width=None):
+    """
+    Creates the lines of the compact table, one row per container. The cell values and column widths are worked out
+    in a single pass over the containers, then the rows are laid out once the widths are known.
+    Unit tested: test_table_lines
+
+    :param containers: The containers found from docker ps.
+    :type containers: list
+    :param args: Parsed arguments from cli.
+    :type args: <Namespace> obj
+    :param max_width: The most characters a line may take up, ie the terminal width, None for no limit.
+    :type max_width: int
+    :returns: The lines to print, the column titles first.
+    :rtype: list
+    """
+    columns = table_columns(containers, args)
+    widths = [len(title) for letter, title in columns]
+    rows = []
+    for container in containers:
+        row = [table_cell(container, letter) for letter, title in columns]
+        for index, value in enumerate(row):
+            if len(value) > widths[index]:
+                widths[index] = len(value)
+        rows.append(row)
+
+    widths = _fit_table_widths(widths, max_width)
+
+    lines = [BOLD + _table_row([title for letter, title in columns], widths).rstrip() + ENDC]
+    for container, row in zip(containers, rows):
+        cells = []
+        for index, value in enumerate(row):
+            if not widths[index]:
+                break
+            cells.append(_table_cell_display(container, columns[index][0], value, widths[index], args))
+        lines.append(TABLE_GAP.join(cells).rstrip())
+    return lines
+
+
+def table_columns(containers, args):
+    """
+    Gets the compact table's columns from the selected includes, as (include letter, title) tuples. The name column
+    is always first, and a host column follows it when the containers come from many hosts.
+    Unit tested: test_table_columns
+
+    :param containers: The containers found from docker ps.
+    :type containers: list
+    :param args: Parsed arguments from cli.
+    :type args: <Namespace> obj
+    :returns: The table's columns, ie [("name", "NAME"), ("s", "STATUS")].
+    :rtype: list
+    """
+    selected_includes = get_selected_includes(args)
+    columns = [("name", "NAME")]
+    if any(container.host for container in containers):
+        columns.append(("host", "HOST"))
+    for letter, title in TABLE_COLUMNS:
+        if letter not in selected_includes:
             continue
+        # The state column only says something when stopped containers are displayed too.
+        if letter == "r" and not args.all:
+            continue
+        columns.append((letter, title))
+    return columns
+
+
+def table_cell(container, letter):
+    """
+    Gets the plain text value of a container's table cell.
+    Unit tested: test_table_cell
+
+    :param container: The container data.
+    :type container: <Container obj>
+    :param letter: The column's include letter, or "name" or "host".
+    :type letter: str
+    :returns: The cell's value.
+    :rtype: str
+    """
+    if letter == "name":
+        return container.name
+    elif letter == "host":
+        return container.host or ""
+    elif letter == "n":
+        return container.container_id
+    elif letter == "i":
+        return container.image
+    elif letter == "m":
+        return container.command
+    elif letter == "c":
+        return container.created
+    elif letter == "s":
+        return container.status
+    elif letter == "r":
+        return "[ON]" if container.running else "[OFF]"
+    elif letter == "p":
+        return ", ".join([port.strip() for port in container.ports])
+    elif letter in STATS_INCLUDES:
+        return (container.stats or {}).get(STATS_INCLUDES[letter], "")
+
+    return ""
+
+
+def _table_cell_display(container, letter, value, width, args):
+    """
+    Pads or truncates a cell's value to it's column width and adds it's colors. Padding is worked out from the plain
+    value, as the colors take up no space on screen.
+
+    :param container: The container data.
+    :type container: <Container obj>
+    :param letter: The column's include letter, or "name" or "host".
+    :type letter: str
+    :param value: The cell's plain text value.
+    :type value: str
+    :param width: The column width.
+    :type width: int
+    :param args: Parsed arguments from cli.
+    :type args: <Namespace> obj
+    :returns: The cell ready for display.
+    :rtype: str
+    """
+    if len(value) > width:
+        value = _truncate(value, width)
+        if letter == "name":
+            return container.color + value + ENDC
+    padding = " " * (width - len(value))
+
+    if letter == "name":
+        return container_display_name(container, args) + padding
+    elif letter == "r":
+        return (GREEN if container.running else RED) + value + ENDC + padding
+
+    return value + padding
 
-        col_width = 30
-        for row in container["data"]:
-            if len(row[0]) == 0:
-                print("                              %s" % row[1])
-            else:
-                print("%s %s" % (row[0].ljust(col_width), row[1]))
-        print("")
+
+def _table_row(values, widths):
+    """
+    Lays out plain text values into the table's columns, leaving off columns with no room.
+
+    :param values: The plain text values.
+    :type values: list
+    :param widths: The column widths.
+    :type widths: list
+    :returns: The row.
+    :rtype: str
+    """
+    cells = []
+    for value, width in zip(values, widths):
+        if not width:
+            break
+        cells.append(_truncate(value, width).ljust(width))
+    return TABLE_GAP.join(cells)
+
+
+def _fit_table_widths(widths, max_width=None):
+    """
+    Shrinks the table's column widths to fit in a max width, giving the left most columns the room they need first.
+    Columns left with no room at all get a width of 0 and are left off.
+    Unit tested: test__fit_table_widths
+
+    :param widths: The widths each column needs.
+    :type widths: list
+    :param max_width: The most characters a line may take up, None for no limit.
+    :type max_width: int
+    :returns: The column widths to use.
+    :rtype: list
+    """
+    if not max_width or sum(widths) + len(TABLE_GAP) * (len(widths) - 1) <= max_width:
+        return widths
+
+    fitted = []
+    remaining = max_width
+    for width in widths:
+        width = min(width, remaining)
+        # Not worth showing a column cut down to a character or two.
+        if width < 3:
+            width = 0
+        fitted.append(width)
+        remaining = max(remaining - width - len(TABLE_GAP), 0)
+        if not width:
+            remaining = 0
+    return fitted
+
+
+def _truncate(value, width):
+    """
+    Cuts a value down to a width, marking that it was cut with a trailing "~".
+
+    :param value: The value to cut down.
+    :type value: str
+    :param width: The most characters the value may take up.
+    :type width: int
+    :returns: The value, cut down if it was too long.
+    :rtype: str
+    """
+    if len(value) <= width:
+        return value
+    return value[:width - 1] + "~"
 
 
 def give_json(containers, args):
@@ -742,35 +2779,192 @@ def give_json(containers, args):
     :param args: The CLI args
     :type args: <class 'argparse.Namespace'>
     """
-    clean_date_containers = _json_container_dates(containers)
-    more_cleaned = []
-    for container in clean_date_containers:
-        more_cleaned.append(container.pop('color'))
+    sys.stdout.write(format_json(containers))
+
+    return True
+
+
+def format_json(containers):
+    """
+    Creates the JSON output for containers.
+    Unit tested: test_format_json
+
+    :param containers: The containers found from docker ps.
+    :type containers: list
+    :returns: The JSON document to print.
+    :rtype: str
+    """
+    import json
+
+    clean_date_containers = [_json_container(container) for container in containers]
 
     ret_dict = {
         "total_containers": len(containers),
         "containers": clean_date_containers
     }
-    print(json.dumps(ret_dict, indent=4, sort_keys=True))
+    return json.dumps(ret_dict, indent=4, sort_keys=True) + "\n"
+
+
+def give_ndjson(containers, total_containers, total_running_containers, args):
+    """
+    Streams newline delimited JSON, one compact object per container written as soon as we have it, followed by a
+    summary line with the totals. This lets tools like jq start on the first container right away, without holding
+    the whole document in memory.
+    Unit tested: test_give_ndjson
+
+    :param containers: The containers found from docker ps.
+    :type containers: iterable
+    :param total_containers: Number of containers.
+    :type total_containers: int
+    :param total_running_containers: Number of total running containers.
+    :type total_running_containers: int
+    :param args: The CLI args
+    :type args: <class 'argparse.Namespace'>
+    """
+    count = _write_ndjson_containers(containers)
+    _write_ndjson_summary(count, total_containers, total_running_containers)
 
     return True
 
 
+def stream_ndjson(args):
+    """
+    Streams newline delimited JSON straight from docker, each container filtered and written as soon as docker lists
+    it, so only one container is held at a time and the first is written while docker is still listing the rest. Any
+    --limit stops docker once enough containers have been written.
+    Unit tested: test_stream_ndjson
+
+    :param args: The CLI args
+    :type args: <class 'argparse.Namespace'>
+    """
+    filters = _engine_filters(args)
+    listed = iter_containers(args, filters)
+    counted = _CountedContainers(listed)
+    containers = iter_filter_containers(counted, args)
+    if args.limit is not None or args.offset:
+        stop = None if args.limit is None else args.offset + args.limit
+        containers = islice(containers, args.offset, stop)
+
+    try:
+        count = _write_ndjson_containers(containers)
+    finally:
+        listed.close()
+    profiling.count("rows_parsed", counted.total)
+
+    # The listed containers are only every container when docker wasn't asked to filter and all of them were read.
+    if filters or not counted.finished:
+        total_containers, total_running_containers = fetch_totals(args)
+    else:
+        total_containers, total_running_containers = counted.total, counted.running
+    _write_ndjson_summary(count, total_containers, total_running_containers)
+
+
+class _CountedContainers(object):
+    """Counts the containers, and running containers, passing through to the rest of a stream."""
+
+    def __init__(self, containers):
+        self.containers = containers
+        self.total = 0
+        self.running = 0
+        self.finished = False
+
+    def __iter__(self):
+        for container in self.containers:
+            self.total += 1
+            if container.running:
+                self.running += 1
+            yield container
+        self.finished = True
+
+
+def _write_ndjson_containers(containers):
+    """
+    Writes a compact JSON line for each container, flushing each one out as soon as it's written.
+
+    :param containers: The containers to write.
+    :type containers: iterable
+    :returns: The number of containers written.
+    :rtype: int
+    """
+    import json
+
+    count = 0
+    written = 0
+    for container in containers:
+        line = json.dumps(_json_container(container), separators=(",", ":"), sort_keys=True) + "\n"
+        sys.stdout.write(line)
+        sys.stdout.flush()
+        count += 1
+        written += len(line)
+
+    profiling.count("rows_shown", count)
+    profiling.count("bytes_written", written)
+    return count
+
+
+def _write_ndjson_summary(count, total_containers, total_running_containers):
+    """
+    Writes the summary line which ends the newline delimited JSON.
+
+    :param count: The number of containers written.
+    :type count: int
+    :param total_containers: Number of containers.
+    :type total_containers: int
+    :param total_running_containers: Number of total running containers.
+    :type total_running_containers: int
+    """
+    import json
+
+    summary = {
+        "summary": {
+            "containers": count,
+            "total_containers": total_containers,
+            "total_running_containers": total_running_containers,
+        }
+    }
+    line = json.dumps(summary, separators=(",", ":"), sort_keys=True) + "\n"
+    sys.stdout.write(line)
+    sys.stdout.flush()
+    profiling.count("bytes_written", len(line))
+
+
+def _json_container(container):
+    """
+    Creates a JSON friendly dict of a container, with dates as strings and without the terminal color.
+    Unit tested: test__json_container
+
+    :param container: The container data.
+    :type container: <Container obj>
+    :returns: The JSON friendly container.
+    :rtype: dict
+    """
+    json_container = _json_container_dates([container])[0]
+    json_container.pop('color')
+    if not json_container['host']:
+        json_container.pop('host')
+    if json_container['stats'] is None:
+        json_container.pop('stats')
+    return json_container
+
+
 def _json_container_dates(containers):
     """
-    Moves container "status date" to a JSON friendly value.
+    Creates dicts of the containers with "status date" and "created date" moved to JSON friendly values.
     Unit tested: test__json_container_dates
 
     :param containers: The containers found from docker ps.
     :type containers: list
-    :returns: The containers found from docker ps, with JSON friendly dates.
+    :returns: The containers found from docker ps as dicts, with JSON friendly dates.
     :rtype: list
     """
     clean_containers = []
     for container in containers:
-        tmp_container = container
+        tmp_container = container.to_dict()
         tmp_container["status_date"] = str(tmp_container["status_date"])
         tmp_container["created_date"] = str(tmp_container["created_date"])
+        for field in ["started_date", "finished_date"]:
+            if tmp_container[field]:
+                tmp_container[field] = str(tmp_container[field])
         clean_containers.append(tmp_container)
 
     return clean_containers
@@ -0,0 +1,416 @@
+"""Aio
+Fetches from Docker on an asyncio event loop, so a run's requests, ie the containers and their totals, or every one of
+many --hosts, are all in flight at once. Every request is bounded by --timeout, cancelling it and killing any docker
+cli it started once the timeout passes, and requests that time out or get a bad response are retried --retries times,
+backing off --backoff seconds, then twice that, and so on between attempts.
+
+Importing asyncio takes longer than a plain single host query, so fetch_snapshot() only comes here when a run has more
+than one request to overlap or asks for retries.
+
+"""
+import asyncio
+import json
+
+import dockerprettyps
+from dockerprettyps import errors
+from dockerprettyps import profiling
+
+# Errors worth another attempt, a busy daemon may answer the next request. There's no point retrying a missing socket.
+RETRY_ERRORS = (errors.EngineTimeout, errors.BadResponseDockerEngine)
+
+
+class AsyncEngineClient(object):
+    """
+    Client for the Docker Engine API on an asyncio event loop, using an EngineClient's socket or address. Each request
+    is a single HTTP/1.1 request on it's own connection.
+    Unit tested: test_async_engine_client
+
+    """
+
+    def __init__(self, client):
+        self.client = client
+        self.timeout = client.timeout
+
+    @classmethod
+    def from_host(cls, host=None, timeout=10):
+        """
+        Creates a client for a DOCKER_HOST style url, see EngineClient.from_host().
+
+        :param host: The host url, defaults to the DOCKER_HOST environment variable.
+        :type host: str
+        :param timeout: Seconds to wait for each request.
+        :type timeout: int
+        :returns: The engine client.
+        :rtype: <AsyncEngineClient obj>
+        """
+        return cls(dockerprettyps.engine.EngineClient.from_host(host, timeout=timeout))
+
+    async def get(self, path, params=None):
+        """
+        Runs a GET request against the engine and decodes the JSON response, cancelling the request if it takes longer
+        than the timeout.
+
+        :param path: The API path to request, without the version prefix.
+        :type path: str
+        :param params: Query string parameters for the request.
+        :type params: dict
+        :returns: The decoded JSON response.
+        :rtype: list|dict
+        """
+        try:
+            status, body = await asyncio.wait_for(self._request(self.client._url(path, params)), self.timeout)
+        except asyncio.TimeoutError:
+            raise errors.EngineTimeout
+        except OSError:
+            raise errors.EngineUnavailable
+        profiling.count("bytes_read", len(body))
+
+        if status != 200:
+            raise errors.BadResponseDockerEngine
+
+        try:
+            return json.loads(body.decode("utf-8"))
+        except ValueError:
+            raise errors.BadResponseDockerEngine
+
+    async def containers(self, filters=None):
+        """
+        Gets the containers list from the engine, the API equivalent of `docker ps -a`.
+
+        :param filters: Filters for the daemon to apply, ie {"status": ["running"], "name": ["web"]}.
+        :type filters: dict
+        :returns: The containers as returned by the Docker Engine API.
+        :rtype: list
+        """
+        params = {"all": 1}
+        if filters:
+            params["filters"] = json.dumps(filters, sort_keys=True)
+        return await self.get("/containers/json", params)
+
+    async def info(self):
+        """
+        Gets the system wide information from the engine, which includes the container counts.
+
+        :returns: The engine's /info response.
+        :rtype: dict
+        """
+        return await self.get("/info")
+
+    async def _request(self, url):
+        """
+        Sends a GET request, reading the response until the engine closes the connection.
+
+        :param url: The versioned API url, ie "/v1.25/info".
+        :type url: str
+        :returns: The response's status code and body.
+        :rtype: tuple
+        """
+        reader, writer = await self._connect()
+        try:
+            writer.write((
+                "GET %s HTTP/1.1\r\n"
+                "Host: docker\r\n"
+                "Accept: application/json\r\n"
+                "Connection: close\r\n\r\n" % url).encode("utf-8"))
+            await writer.drain()
+            response = await reader.read()
+        finally:
+            writer.close()
+
+        return _parse_response(response)
+
+    async def _connect(self):
+        """
+        Opens a connection to the engine, raising EngineUnavailable if there is no socket to connect to.
+
+        :returns: The connection's stream reader and writer.
+        :rtype: tuple
+        """
+        if self.client.address:
+            host, _, port = self.client.address.rpartition(":")
+            if not port.isdigit():
+                host, port = self.client.address, 80
+            return await asyncio.open_connection(host, int(port))
+
+        if not self.client.socket_path:
+            raise errors.EngineUnavailable
+
+        return await asyncio.open_unix_connection(self.client.socket_path)
+
+
+def _parse_response(response):
+    """
+    Splits a raw HTTP response into it's status code and body, joining the body back together if it was chunked.
+    Unit tested: test__parse_response
+
+    :param response: The whole response, as read from the connection.
+    :type response: bytes
+    :returns: The status code and body.
+    :rtype: tuple
+    """
+    head, _, body = response.partition(b"\r\n\r\n")
+    lines = head.decode("latin-1").split("\r\n")
+    try:
+        status = int(lines[0].split()[1])
+    except (IndexError, ValueError):
+        raise errors.BadResponseDockerEngine
+
+    headers = {}
+    for line in lines[1:]:
+        name, _, value = line.partition(":")
+        headers[name.strip().lower()] = value.strip()
+
+    if headers.get("transfer-encoding", "").lower() == "chunked":
+        return status, _dechunk(body)
+    if headers.get("content-length", "").isdigit():
+        return status, body[:int(headers["content-length"])]
+    return status, body
+
+
+def _dechunk(body):
+    """
+    Joins a chunked HTTP body back together.
+
+    :param body: The chunked body.
+    :type body: bytes
+    :returns: The body.
+    :rtype: bytes
+    """
+    chunks = []
+    position = 0
+    try:
+        while True:
+            line_end = body.index(b"\r\n", position)
+            size = int(body[position:line_end].split(b";")[0], 16)
+            if not size:
+                break
+            start = line_end + 2
+            chunks.append(body[start:start + size])
+            position = start + size + 2
+    except ValueError:
+        raise errors.BadResponseDockerEngine
+
+    return b"".join(chunks)
+
+
+async def run_docker(cmds, timeout=None, check=True):
+    """
+    Runs a docker cli command, returning it's output. Docker is killed if it runs past the timeout, or if the
+    command is cancelled.
+    Unit tested: test_run_docker
+
+    :param cmds: The command and arguments to run.
+    :type cmds: list
+    :param timeout: Seconds to wait for docker before giving up.
+    :type timeout: int
+    :param check: Raise BadResponseDockerEngine if docker exits non zero.
+    :type check: bool
+    :returns: The standard out of the command.
+    :rtype: str
+    """
+    with profiling.stage("docker"):
+        # In it's own process group, so anything docker started is killed along with it.
+        out = await asyncio.create_subprocess_exec(
+            *cmds,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.STDOUT,
+            start_new_session=True)
+        try:
+            stdout, stderr = await asyncio.wait_for(out.communicate(), timeout)
+        except asyncio.TimeoutError:
+            raise errors.EngineTimeout
+        finally:
+            if out.returncode is None:
+                dockerprettyps._kill_docker(out)
+                await out.wait()
+    profiling.count("bytes_read", len(stdout))
+    stdout = stdout.decode("utf-8")
+    if check and out.returncode != 0:
+        raise errors.BadResponseDockerEngine
+
+    return stdout
+
+
+async def with_retries(call, retries=0, backoff=0.5):
+    """
+    Awaits a call, calling it again when it times out or gets a bad response, up to a number of retries. The wait
+    between attempts doubles each time.
+    Unit tested: test_with_retries
+
+    :param call: Function returning the awaitable to retry, called once per attempt.
+    :type call: function
+    :param retries: The most times to try again after the first attempt.
+    :type retries: int
+    :param backoff: Seconds to wait before the first retry.
+    :type backoff: float
+    :returns: The result of the first attempt which succeeds.
+    """
+    attempt = 0
+    while True:
+        try:
+            return await call()
+        except RETRY_ERRORS:
+            if attempt >= retries:
+                raise
+        profiling.count("retries")
+        await asyncio.sleep(backoff * 2 ** attempt)
+        attempt += 1
+
+
+def fetch_snapshot(args):
+    """
+    Fetches containers from the hosts in the CLI args, or the local engine if there aren't any, on an event loop.
+
+    :param args: The CLI args
+    :type args: <class 'argparse.Namespace'>
+    :returns: The containers, total containers, total running containers and the (host, reason) tuples for hosts which
+        could not be reached.
+    :rtype: tuple
+    """
+    return asyncio.run(fetch_snapshot_async(args))
+
+
+async def fetch_snapshot_async(args):
+    """
+    Fetches containers from the hosts in the CLI args, or the local engine if there aren't any, see fetch_snapshot().
+
+    :param args: The CLI args
+    :type args: <class 'argparse.Namespace'>
+    :returns: The containers, total containers, total running containers and the unreachable hosts.
+    :rtype: tuple
+    """
+    if args.hosts:
+        return await dockerprettyps.hosts.gather_hosts(args)
+
+    containers, total_containers, total_running_containers = await with_retries(
+        lambda: get_containers(args), args.retries, args.backoff)
+    return containers, total_containers, total_running_containers, []
+
+
+async def get_containers(args, host=None):
+    """
+    Gets the cleaned container data from the engine backend selected by the CLI args, like
+    dockerprettyps.get_containers() but with the containers, the totals for the footer and any stats all fetched at
+    once. Stats and inspect, which make many requests of their own, run on a worker thread. If the containers can't be
+    fetched, the totals still in flight are cancelled.
+    Unit tested: test_get_containers
+
+    :param args: The CLI args
+    :type args: <class 'argparse.Namespace'>
+    :param host: A DOCKER_HOST style url or docker context name, defaults to the local engine.
+    :type host: str
+    :returns: Cleaned container data, the total number of containers and the total number of running containers.
+    :rtype: tuple
+    """
+    loop = asyncio.get_running_loop()
+    filters = dockerprettyps._engine_filters(args)
+    pool = None
+    stats = None
+    totals = None
+    if dockerprettyps._wants_stats(args) or args.inspect:
+        from concurrent.futures import ThreadPoolExecutor
+
+        pool = ThreadPoolExecutor(max_workers=2)
+    try:
+        if dockerprettyps._wants_stats(args):
+            stats = loop.run_in_executor(pool, dockerprettyps.fetch_stats, args, host)
+        if filters:
+            totals = asyncio.ensure_future(fetch_totals(args, host))
+
+        containers = await fetch_containers(args, filters, host)
+        if args.inspect:
+            with profiling.stage("inspect"):
+                containers = await loop.run_in_executor(
+                    pool, dockerprettyps.inspect_containers, args, containers, host)
+        if stats:
+            with profiling.stage("stats"):
+                containers = dockerprettyps.add_stats(containers, await stats)
+        if not totals:
+            return containers, len(containers), dockerprettyps._get_num_running_containers(containers)
+
+        with profiling.stage("totals"):
+            total_containers, total_running_containers = await totals
+    finally:
+        if totals and not totals.done():
+            totals.cancel()
+        if pool:
+            # Worker threads have their own timeouts, the run doesn't wait on them after a failure.
+            pool.shutdown(wait=False)
+    return containers, total_containers, total_running_containers
+
+
+async def fetch_containers(args, filters=None, host=None):
+    """
+    Fetches cleaned container data matching the daemon filters from the engine backend selected by the CLI args. In
+    "auto" mode the Docker Engine API socket is tried first, falling back to the docker cli's JSON output if the
+    socket can not be reached.
+
+    :param args: The CLI args
+    :type args: <class 'argparse.Namespace'>
+    :param filters: Filters for the daemon to apply, ie {"status": ["running"], "name": ["web"]}.
+    :type filters: dict
+    :param host: A DOCKER_HOST style url or docker context name, defaults to the local engine.
+    :type host: str
+    :returns: Cleaned, usable container data.
+    :rtype: list
+    """
+    with profiling.stage("containers"):
+        containers = await _fetch_containers(args, filters, host)
+    profiling.count("rows_parsed", len(containers))
+    return containers
+
+
+async def _fetch_containers(args, filters=None, host=None):
+    """
+    Fetches cleaned container data, see fetch_containers().
+
+    :param args: The CLI args
+    :type args: <class 'argparse.Namespace'>
+    :param filters: Filters for the daemon to apply.
+    :type filters: dict
+    :param host: A DOCKER_HOST style url or docker context name, defaults to the local engine.
+    :type host: str
+    :returns: Cleaned, usable container data.
+    :rtype: list
+    """
+    if args.engine in ["auto", "api"]:
+        try:
+            client = AsyncEngineClient.from_host(host, timeout=args.timeout)
+            with profiling.stage("engine"):
+                api_containers = await client.containers(filters=filters)
+        except errors.EngineUnavailable:
+            if args.engine == "api":
+                raise
+        else:
+            with profiling.stage("parse"):
+                return dockerprettyps.clean_api_output(api_containers)
+
+    json_lines = args.engine != "text"
+    output = await run_docker(dockerprettyps._docker_ps_cmd(json_lines, filters, host), args.timeout)
+    if json_lines:
+        return dockerprettyps.clean_json_output(output)
+    if "Error" in output or "Cannot connect" in output:
+        raise errors.BadResponseDockerEngine
+    return dockerprettyps.clean_output(output)
+
+
+async def fetch_totals(args, host=None):
+    """
+    Fetches the total number of containers and running containers from the engine backend selected by the CLI args.
+
+    :param args: The CLI args
+    :type args: <class 'argparse.Namespace'>
+    :param host: A DOCKER_HOST style url or docker context name, defaults to the local engine.
+    :type host: str
+    :returns: The total number of containers and the total number of running containers.
+    :rtype: tuple
+    """
+    if args.engine in ["auto", "api"]:
+        try:
+            info = await AsyncEngineClient.from_host(host, timeout=args.timeout).info()
+            return info["Containers"], info["ContainersRunning"] + info.get("ContainersPaused", 0)
+        except errors.EngineUnavailable:
+            if args.engine == "api":
+                raise
+
+    return dockerprettyps._parse_raw_totals(await run_docker(dockerprettyps._docker_info_cmd(host), args.timeout))
@@ -0,0 +1,223 @@
+"""Cache
+An opt-in, on disk snapshot of the fetched containers. Repeated invocations within the TTL, such as shell prompts or
+tmux status bars, read the snapshot instead of asking Docker again. Refreshes are guarded by a file lock so a crowd of
+concurrent invocations only triggers a single refresh. If Docker can't be reached for a refresh, the last snapshot is
+served however old it is, marked as stale.
+
+"""
+from datetime import datetime
+import hashlib
+import json
+import os
+import time
+
+import dockerprettyps
+from dockerprettyps.container import Container
+from dockerprettyps import errors
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+DATE_FIELDS = ["created_date", "status_date", "started_date", "finished_date"]
+
+
+class SnapshotCache(object):
+    """
+    Stores fetched container data in a JSON file per cache key, served until it's older than the TTL.
+    Unit tested: tests/test_cache.py
+
+    """
+
+    def __init__(self, ttl, cache_dir=None):
+        self.ttl = ttl
+        self.cache_dir = cache_dir or default_cache_dir()
+        self.hit = False
+        self.stale = False
+        self.age = 0
+        self.fetch_time = 0
+        self.path = None
+
+    def fetch(self, key, fetcher, refresh=False):
+        """
+        Gets the snapshot for a key from the cache, or from the fetcher when the snapshot is missing or older than the
+        TTL. When the fetcher can't reach Docker, the expired snapshot is served instead, setting stale.
+
+        :param key: The cache key, see cache_key().
+        :type key: str
+        :param fetcher: Function returning the containers, total containers, total running containers and the
+            unreachable hosts.
+        :type fetcher: function
+        :param refresh: Skip reading the cache, always fetch and store a new snapshot.
+        :type refresh: bool
+        :returns: The containers, total containers, total running containers and the unreachable hosts.
+        :rtype: tuple
+        """
+        self.path = os.path.join(self.cache_dir, "snapshot-%s.json" % key)
+        if not refresh:
+            snapshot = self._read_fresh()
+            if snapshot:
+                return snapshot
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        with open(self.path + ".lock", "w") as lock_file:
+            if fcntl:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+
+            # Someone else may have refreshed the snapshot while we waited on the lock.
+            if not refresh:
+                snapshot = self._read_fresh()
+                if snapshot:
+                    return snapshot
+
+            start = time.monotonic()
+            try:
+                snapshot = fetcher()
+            except errors.Error:
+                snapshot = self._read()
+                if not snapshot:
+                    raise
+                self.stale = True
+                return snapshot
+            self.fetch_time = time.monotonic() - start
+            self._write(snapshot)
+
+        self.hit = False
+        self.age = 0
+        return snapshot
+
+    def _read_fresh(self):
+        """
+        Reads the snapshot from disk if it exists and is younger than the TTL.
+
+        :returns: The snapshot, or None if there isn't a fresh one.
+        :rtype: tuple
+        """
+        return self._read(self.ttl)
+
+    def _read(self, max_age=None):
+        """
+        Reads the snapshot from disk if it exists and is young enough.
+
+        :param max_age: The oldest snapshot to read in seconds, None for any age.
+        :type max_age: float
+        :returns: The snapshot, or None if there isn't one young enough.
+        :rtype: tuple
+        """
+        try:
+            with open(self.path, "r") as cache_file:
+                stored = json.load(cache_file)
+        except (OSError, ValueError):
+            return None
+
+        age = time.time() - stored.get("created", 0)
+        if max_age is not None and (age < 0 or age > max_age):
+            return None
+
+        self.hit = True
+        self.age = age
+        return (
+            [_load_container(c) for c in stored["containers"]],
+            stored["total_containers"],
+            stored["total_running_containers"],
+            [tuple(host) for host in stored["unreachable_hosts"]])
+
+    def _write(self, snapshot):
+        """
+        Writes a snapshot to disk, through a temp file and a rename so readers never see a partial file.
+
+        :param snapshot: The containers, total containers, total running containers and the unreachable hosts.
+        :type snapshot: tuple
+        """
+        containers, total_containers, total_running_containers, unreachable_hosts = snapshot
+        stored = {
+            "created": time.time(),
+            "containers": [_dump_container(c) for c in containers],
+            "total_containers": total_containers,
+            "total_running_containers": total_running_containers,
+            "unreachable_hosts": unreachable_hosts,
+        }
+        tmp_path = "%s.%s.tmp" % (self.path, os.getpid())
+        with open(tmp_path, "w") as cache_file:
+            json.dump(stored, cache_file)
+        os.replace(tmp_path, self.path)
+
+    def stats(self):
+        """
+        Describes how the last fetch was served, for verbose output.
+
+        :returns: The cache stats, ie "Cache hit: 0.42s old, ~/.cache/docker-pretty-ps/snapshot-0a1b.json"
+        :rtype: str
+        """
+        if self.stale:
+            return "Cache stale: Docker unavailable, served %.2fs old, %s" % (self.age, self.path)
+        if self.hit:
+            return "Cache hit: %.2fs old, %s" % (self.age, self.path)
+
+        return "Cache miss: refreshed in %.2fs, %s" % (self.fetch_time, self.path)
+
+
+def default_cache_dir():
+    """
+    Gets the cache directory, under $XDG_CACHE_HOME or ~/.cache.
+
+    :returns: The cache directory path.
+    :rtype: str
+    """
+    cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(cache_home, "docker-pretty-ps")
+
+
+def cache_key(args):
+    """
+    Creates a cache key from everything in the CLI args and environment which changes what gets fetched.
+    Unit tested: test_cache_key
+
+    :param args: The CLI args
+    :type args: <class 'argparse.Namespace'>
+    :returns: The cache key.
+    :rtype: str
+    """
+    key_data = {
+        "engine": args.engine,
+        "all": args.all,
+        "inspect": args.inspect,
+        "stats": sorted([letter for letter in args.include or [] if letter in dockerprettyps.STATS_INCLUDES]),
+        "search": sorted(args.search),
+        "hosts": args.hosts,
+        "docker_host": os.environ.get("DOCKER_HOST", ""),
+        "docker_context": os.environ.get("DOCKER_CONTEXT", ""),
+    }
+    return hashlib.sha1(json.dumps(key_data, sort_keys=True).encode("utf-8")).hexdigest()[:16]
+
+
+def _dump_container(container):
+    """
+    Creates a dict of a container with it's dates as JSON friendly ISO strings.
+
+    :param container: The container data.
+    :type container: <Container obj>
+    :returns: The JSON friendly container data.
+    :rtype: dict
+    """
+    dumped = container.to_dict()
+    for field in DATE_FIELDS:
+        if dumped.get(field):
+            dumped[field] = dumped[field].isoformat()
+    return dumped
+
+
+def _load_container(dumped):
+    """
+    Restores a container stored by _dump_container().
+
+    :param dumped: The JSON friendly container data.
+    :type dumped: dict
+    :returns: The container data.
+    :rtype: <Container obj>
+    """
+    for field in DATE_FIELDS:
+        if dumped.get(field):
+            dumped[field] = datetime.fromisoformat(dumped[field])
+    return Container.from_dict(dumped)
@@ -0,0 +1,118 @@
+"""Client
+The CLI's side of the --serve daemon, forwarding a query to the daemon's unix socket. Kept apart from the daemon, and
+only importing what it needs once there's a socket to connect to, so runs without a daemon don't pay for it.
+
+"""
+import os
+import sys
+
+# Environment which changes what Docker we talk to. A client with different values than the daemon is answered
+# directly instead.
+FORWARDED_ENV = ["DOCKER_HOST", "DOCKER_CONTEXT", "DOCKER_TLS_VERIFY", "DOCKER_CERT_PATH"]
+
+# Seconds on top of --timeout a client waits on the daemon, which may have to ask Docker first.
+CLIENT_TIMEOUT_MARGIN = 5
+
+
+def run_client(argv, args):
+    """
+    Sends a query to the --serve daemon and prints it's answer.
+
+    :param argv: The CLI args, unparsed, ie ["-a", "postgres"].
+    :type argv: list
+    :param args: The CLI args
+    :type args: <class 'argparse.Namespace'>
+    :returns: The exit status, or None if there's no daemon to answer, so the query should be run directly.
+    :rtype: int
+    """
+    socket_path = args.socket or default_socket_path()
+    if not socket_path or not _trusted_socket(socket_path):
+        return None
+
+    import json
+    import shutil
+    import socket
+
+    if not hasattr(socket, "AF_UNIX"):
+        return None
+
+    tty = sys.stdout.isatty()
+    terminal_size = shutil.get_terminal_size()
+    request = {
+        "argv": list(argv),
+        "env": {name: os.environ.get(name, "") for name in FORWARDED_ENV},
+        "tty": tty,
+        "columns": terminal_size.columns if tty else None,
+        "lines": terminal_size.lines if tty else None,
+    }
+
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(args.timeout + CLIENT_TIMEOUT_MARGIN)
+    try:
+        sock.connect(socket_path)
+        sock.sendall(json.dumps(request).encode("utf-8") + b"\n")
+        chunks = []
+        while True:
+            chunk = sock.recv(65536)
+            if not chunk:
+                break
+            chunks.append(chunk)
+    except OSError:
+        return None
+    finally:
+        sock.close()
+
+    try:
+        response = json.loads(b"".join(chunks).decode("utf-8"))
+    except ValueError:
+        return None
+    if response.get("status") is None:
+        return None
+
+    sys.stdout.write(response.get("stdout", ""))
+    sys.stdout.flush()
+    sys.stderr.write(response.get("stderr", ""))
+    return response["status"]
+
+
+def _trusted_socket(socket_path):
+    """
+    Checks there's a socket to connect to which only we could have made. The default socket can be in the shared temp
+    directory, where another user could put one first and be sent our queries, so sockets owned by anyone else, or
+    which others can write to, are ignored. The daemon makes it's socket 0600.
+    Unit tested: test__trusted_socket
+
+    :param socket_path: The socket path.
+    :type socket_path: str
+    :rtype: bool
+    """
+    try:
+        info = os.stat(socket_path)
+    except OSError:
+        return False
+
+    if hasattr(os, "getuid") and info.st_uid != os.getuid():
+        return False
+    return not info.st_mode & 0o022
+
+
+def default_socket_path():
+    """
+    Gets the daemon's socket path, from $DOCKER_PRETTY_PS_SOCKET, under $XDG_RUNTIME_DIR or in the temp directory.
+    Unit tested: test_default_socket_path
+
+    :returns: The socket path, or None where there's no user ID to name it by or no unix sockets, ie on Windows.
+    :rtype: str
+    """
+    if os.environ.get("DOCKER_PRETTY_PS_SOCKET"):
+        return os.environ["DOCKER_PRETTY_PS_SOCKET"]
+    if os.environ.get("XDG_RUNTIME_DIR"):
+        return os.path.join(os.environ["XDG_RUNTIME_DIR"], "docker-pretty-ps.sock")
+
+    if not hasattr(os, "getuid"):
+        return None
+    import socket
+    if not hasattr(socket, "AF_UNIX"):
+        return None
+    import tempfile
+    return os.path.join(tempfile.gettempdir(), "docker-pretty-ps-%s.sock" % os.getuid())
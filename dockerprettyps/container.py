@@ -0,0 +1,155 @@
+"""Container
+The record type for a single Docker container's data.
+
+"""
+
+
+class Container(object):
+    """
+    A single Docker container's data. Slotted to keep large inventories light in memory and quick to read from, and
+    treated as read only once created, use replace() to get a changed copy. Fields can also be read like a dict, ie
+    container["name"], for code written against the older dict records.
+    Unit tested: tests/test_container.py
+
+    """
+
+    __slots__ = [
+        "container_id",
+        "image",
+        "command",
+        "created",
+        "created_date",
+        "status",
+        "status_date",
+        "running",
+        "ports",
+        "name",
+        "color",
+        "host",
+        "started_date",
+        "finished_date",
+        "stats",
+    ]
+
+    def __init__(
+        self,
+        container_id,
+        image,
+        command,
+        created,
+        created_date,
+        status,
+        status_date,
+        running,
+        ports,
+        name,
+        color="",
+        host=None,
+        started_date=None,
+        finished_date=None,
+        stats=None
+    ):
+        self.container_id = container_id
+        self.image = image
+        self.command = command
+        self.created = created
+        self.created_date = created_date
+        self.status = status
+        self.status_date = status_date
+        self.running = running
+        self.ports = ports
+        self.name = name
+        self.color = color
+        self.host = host
+        self.started_date = started_date
+        self.finished_date = finished_date
+        self.stats = stats
+
+    def __getitem__(self, key):
+        if key not in self.__slots__:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __eq__(self, other):
+        if not isinstance(other, Container):
+            return NotImplemented
+        return self.to_dict() == other.to_dict()
+
+    def __repr__(self):
+        return "<Container %s %s>" % (self.container_id, self.name)
+
+    @property
+    def health(self):
+        """
+        The container's health check state, read from it's status, ie "Up 4 days (healthy)".
+
+        :returns: The health, "healthy", "unhealthy" or "starting", or "" for containers without a health check.
+        :rtype: str
+        """
+        return status_health(self.status)
+
+    def get(self, key, default=None):
+        """
+        Gets a field by name, dict style.
+
+        :param key: The field name.
+        :type key: str
+        :param default: The value to return for unknown fields.
+        :returns: The field's value.
+        """
+        if key not in self.__slots__:
+            return default
+        return getattr(self, key)
+
+    def replace(self, **changes):
+        """
+        Creates a copy of the container with some fields changed, leaving this one untouched.
+
+        :returns: The changed copy.
+        :rtype: <Container obj>
+        """
+        fields = self.to_dict()
+        fields.update(changes)
+        return Container(**fields)
+
+    def to_dict(self):
+        """
+        Creates a plain dict of the container's fields, ie for JSON output.
+
+        :returns: The container's fields.
+        :rtype: dict
+        """
+        return {field: getattr(self, field) for field in self.__slots__}
+
+    @classmethod
+    def from_dict(cls, fields):
+        """
+        Creates a container from a dict of it's fields, the reverse of to_dict().
+
+        :param fields: The container's fields.
+        :type fields: dict
+        :returns: The container.
+        :rtype: <Container obj>
+        """
+        return cls(**fields)
+
+
+def status_health(status):
+    """
+    Reads the health check state from a container's status, ie "Up 4 days (healthy)".
+    Unit tested: test_health
+
+    :param status: The container's status.
+    :type status: str
+    :returns: The health, "healthy", "unhealthy" or "starting", or "" for containers without a health check.
+    :rtype: str
+    """
+    status = status or ""
+    if "(healthy)" in status:
+        return "healthy"
+    elif "(unhealthy)" in status:
+        return "unhealthy"
+    elif "(health: starting)" in status:
+        return "starting"
+
+    return ""
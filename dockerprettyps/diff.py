@@ -0,0 +1,331 @@
+"""Diff
+Compares the containers against a compact snapshot saved by the last --diff run, showing only the containers which
+appeared, disappeared, restarted, stopped or changed health since then, ie across a deploy. Snapshots are keyed by
+container ID, so comparing them is a dict lookup per container. Each query, by it's hosts, filters and engine, gets
+it's own snapshot under the cache directory. Start times worked out from docker ps' "Up 2 hours" are only as exact as
+their unit, so a container has only restarted when it started more than that unit later than before.
+
+"""
+from datetime import datetime
+import hashlib
+import json
+import os
+
+import dockerprettyps
+from dockerprettyps.container import status_health
+
+# Change kinds, in the order a container is checked for them, and their markers.
+CHANGE_MARKERS = {
+    "appeared": "+",
+    "disappeared": "-",
+    "stopped": "x",
+    "restarted": "^",
+    "health": "~",
+}
+CHANGE_COLORS = {
+    "appeared": dockerprettyps.GREEN,
+    "disappeared": dockerprettyps.RED,
+    "stopped": dockerprettyps.RED,
+}
+
+
+def run_diff(containers, args):
+    """
+    Diffs containers against the last --diff run of the same query, saving them for the next run.
+    Unit tested: test_run_diff
+
+    :param containers: The containers, already filtered.
+    :type containers: list
+    :param args: The CLI args
+    :type args: <class 'argparse.Namespace'>
+    :returns: The diff output to print, as JSON with --json.
+    :rtype: str
+    """
+    path = snapshot_path(args)
+    previous = load_snapshot(path)
+    current = compact_snapshot(containers)
+    save_snapshot(path, current)
+
+    if previous is None:
+        since, changes = None, []
+    else:
+        since = previous["taken"]
+        changes = diff_snapshots(previous["containers"], current)
+
+    if args.json:
+        return format_json_diff(changes, since)
+    return format_diff(changes, since, len(current))
+
+
+def compact_snapshot(containers):
+    """
+    Creates the compact snapshot of containers saved between --diff runs, just what a diff needs of each one.
+    Unit tested: test_compact_snapshot
+
+    :param containers: The containers to snapshot.
+    :type containers: list
+    :returns: The name, image, status, ports, start time, how many seconds the start time may be off by, running
+        state and host of each container, keyed by ID, or host and ID with --hosts.
+    :rtype: dict
+    """
+    snapshot = {}
+    for container in containers:
+        started = ""
+        started_within = 0
+        if container.running:
+            started_date = container.started_date
+            if not started_date:
+                started_date = container.status_date
+                started_within = _status_precision(container.status)
+            started = started_date.isoformat() if started_date else ""
+        key = container.container_id
+        if container.host:
+            key = "%s/%s" % (container.host, key)
+        snapshot[key] = {
+            "id": container.container_id,
+            "name": container.name,
+            "image": container.image,
+            "status": container.status,
+            "ports": list(container.ports),
+            "started": started,
+            "started_within": started_within,
+            "running": container.running,
+            "host": container.host,
+        }
+    return snapshot
+
+
+def diff_snapshots(previous, current):
+    """
+    Finds the containers which changed between two compact snapshots. Containers are matched up by key, so this is a
+    single pass over each snapshot. A container gets at most one change, stopping or restarting are reported over a
+    health change.
+    Unit tested: test_diff_snapshots
+
+    :param previous: The earlier snapshot, from compact_snapshot().
+    :type previous: dict
+    :param current: The later snapshot.
+    :type current: dict
+    :returns: A dict per changed container, with it's "change", current fields and it's "previous" fields.
+    :rtype: list
+    """
+    changes = []
+    for key, record in current.items():
+        before = previous.get(key)
+        if before is None:
+            change = "appeared"
+        elif before["running"] and not record["running"]:
+            change = "stopped"
+        elif record["running"] and (not before["running"] or _restarted(before, record)):
+            change = "restarted"
+        elif status_health(before["status"]) != status_health(record["status"]):
+            change = "health"
+        else:
+            continue
+        changes.append(_change(change, record, before))
+
+    for key, before in previous.items():
+        if key not in current:
+            changes.append(_change("disappeared", before))
+    return changes
+
+
+def _restarted(before, record):
+    """
+    Checks if a container which was running in both snapshots started again in between. A start time worked out from
+    "Up 2 hours" can move by up to an hour between runs without the container restarting, so it has to have moved by
+    more than either snapshot's start time may be off by. With --inspect the start times are exact.
+    Unit tested: test_diff_snapshots
+
+    :param before: The container's fields from the earlier snapshot.
+    :type before: dict
+    :param record: The container's fields from the later snapshot.
+    :type record: dict
+    :rtype: bool
+    """
+    if not before["started"] or not record["started"]:
+        return False
+    moved = datetime.fromisoformat(record["started"]) - datetime.fromisoformat(before["started"])
+    within = max(before.get("started_within", 0), record.get("started_within", 0))
+    return moved.total_seconds() > within
+
+
+def _status_precision(status):
+    """
+    Gets how many seconds a start time worked out from a docker ps status may be off by, one of it's unit, as Docker
+    rounds "Up 2 hours" down to the hour.
+
+    :param status: The container's status, ie "Up 2 hours".
+    :type status: str
+    :returns: The seconds in the status' unit, ie 3600 for hours.
+    :rtype: int
+    """
+    match = dockerprettyps.PS_DATE_RE.search(status)
+    if not match:
+        return 0
+    return dockerprettyps.PS_DATE_UNITS[match.group(2).lower()]
+
+
+def _change(change, record, before=None):
+    """
+    Creates a change for a container.
+
+    :param change: The kind of change, ie "restarted".
+    :type change: str
+    :param record: The container's fields, from the snapshot it's in now, or was last in if it disappeared.
+    :type record: dict
+    :param before: The container's fields from the earlier snapshot.
+    :type before: dict
+    :returns: The change.
+    :rtype: dict
+    """
+    change = dict(record, change=change)
+    change["health"] = status_health(record["status"])
+    if before is not None and change["change"] != "disappeared":
+        change["previous"] = dict(before, health=status_health(before["status"]))
+    return change
+
+
+def format_diff(changes, since, num_containers):
+    """
+    Creates the pretty diff output, a line per changed container marked with how it changed.
+    Unit tested: test_format_diff
+
+    :param changes: The changes, from diff_snapshots().
+    :type changes: list
+    :param since: When the earlier snapshot was taken, or None if there wasn't one.
+    :type since: str
+    :param num_containers: The number of containers in the new snapshot.
+    :type num_containers: int
+    :returns: The diff output.
+    :rtype: str
+    """
+    if since is None:
+        return "No earlier --diff snapshot, saved %s containers to compare the next run with.\n" % num_containers
+
+    rows = [(
+        change["change"],
+        _display_name(change),
+        change["image"],
+        _display_status(change)) for change in changes]
+    lines = []
+    if rows:
+        name_width = max(len(row[1]) for row in rows)
+        image_width = max(len(row[2]) for row in rows)
+        for change, name, image, status in rows:
+            lines.append("%s%s %-11s%s  %-*s  %-*s  %s" % (
+                CHANGE_COLORS.get(change, dockerprettyps.BOLD),
+                CHANGE_MARKERS[change],
+                change,
+                dockerprettyps.ENDC,
+                name_width,
+                name,
+                image_width,
+                image,
+                status))
+        lines.append("")
+
+    seconds = (datetime.now() - datetime.fromisoformat(since)).total_seconds()
+    ago = dockerprettyps._humanize_duration(seconds).lower()
+    lines.append("%s change%s since %s ago" % (len(changes) or "No", "" if len(changes) == 1 else "s", ago))
+    return "\n".join(lines) + "\n"
+
+
+def _display_name(change):
+    """
+    Gets the name a change is shown with, with it's host when there's one.
+
+    :param change: The change.
+    :type change: dict
+    :rtype: str
+    """
+    if change["host"]:
+        return "%s (%s)" % (change["name"], change["host"])
+    return change["name"]
+
+
+def _display_status(change):
+    """
+    Gets the status a change is shown with, from the earlier status for containers which were there before.
+
+    :param change: The change.
+    :type change: dict
+    :rtype: str
+    """
+    if "previous" in change:
+        return "%s -> %s" % (change["previous"]["status"], change["status"])
+    return change["status"]
+
+
+def format_json_diff(changes, since):
+    """
+    Creates the JSON diff output.
+    Unit tested: test_format_json_diff
+
+    :param changes: The changes, from diff_snapshots().
+    :type changes: list
+    :param since: When the earlier snapshot was taken, or None if there wasn't one.
+    :type since: str
+    :returns: The JSON document to print.
+    :rtype: str
+    """
+    diff = {
+        "since": since,
+        "total_changes": len(changes),
+        "changes": changes,
+    }
+    return json.dumps(diff, indent=4, sort_keys=True) + "\n"
+
+
+def snapshot_path(args):
+    """
+    Gets the path of the --diff snapshot for a query, under the cache directory.
+
+    :param args: The CLI args
+    :type args: <class 'argparse.Namespace'>
+    :returns: The snapshot path.
+    :rtype: str
+    """
+    key = dockerprettyps.cache.cache_key(args) + (args.where or "")
+    key = hashlib.sha1(key.encode("utf-8")).hexdigest()[:16]
+    return os.path.join(dockerprettyps.cache.default_cache_dir(), "diff-%s.json" % key)
+
+
+def load_snapshot(path):
+    """
+    Reads a --diff snapshot from disk.
+
+    :param path: The snapshot path.
+    :type path: str
+    :returns: When the snapshot was "taken" and it's "containers", or None if there isn't a readable one.
+    :rtype: dict
+    """
+    try:
+        with open(path, "r") as snapshot_file:
+            stored = json.load(snapshot_file)
+    except (OSError, ValueError):
+        return None
+
+    if not isinstance(stored, dict) or "taken" not in stored or "containers" not in stored:
+        return None
+    return stored
+
+
+def save_snapshot(path, snapshot):
+    """
+    Writes a --diff snapshot to disk, through a temp file and a rename so readers never see a partial file.
+
+    :param path: The snapshot path.
+    :type path: str
+    :param snapshot: The compact snapshot, from compact_snapshot().
+    :type snapshot: dict
+    """
+    stored = {
+        "taken": datetime.now().isoformat(),
+        "containers": snapshot,
+    }
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = "%s.%s.tmp" % (path, os.getpid())
+    with open(tmp_path, "w") as snapshot_file:
+        json.dump(stored, snapshot_file)
+    os.replace(tmp_path, path)
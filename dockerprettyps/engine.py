@@ -0,0 +1,267 @@
+"""Engine
+A tiny Docker Engine API client, speaking HTTP/1.1 straight to the Docker unix socket (or a plain tcp:// host) with
+nothing but the standard library. This saves forking the docker binary and lets us read structured JSON instead of
+fixed width text.
+
+"""
+import http.client
+import json
+import os
+import socket
+from urllib.parse import urlencode
+
+from dockerprettyps import errors
+from dockerprettyps import profiling
+
+DEFAULT_SOCKET = "/var/run/docker.sock"
+API_VERSION = "v1.25"
+
+
+class UnixHTTPConnection(http.client.HTTPConnection):
+    """An HTTPConnection which connects over a unix socket rather than TCP."""
+
+    def __init__(self, socket_path, timeout=10):
+        super(UnixHTTPConnection, self).__init__("localhost", timeout=timeout)
+        self.socket_path = socket_path
+
+    def connect(self):
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        sock.connect(self.socket_path)
+        self.sock = sock
+
+
+class EngineClient(object):
+    """
+    Client for the Docker Engine API over the unix socket, or a "host:port" address for plain tcp:// hosts.
+    Unit tested: tests/test_engine.py
+
+    """
+
+    def __init__(self, socket_path=None, timeout=10, address=None):
+        self.socket_path = socket_path
+        self.address = address
+        if not socket_path and not address:
+            self.socket_path = socket_path_from_env()
+        self.timeout = timeout
+
+    @classmethod
+    def from_host(cls, host=None, timeout=10):
+        """
+        Creates a client for a DOCKER_HOST style url, ie "unix:///var/run/docker.sock" or "tcp://10.0.0.1:2375".
+        Hosts we can't speak to directly, such as ssh://, TLS or docker context names, raise EngineUnavailable so
+        callers can fall back to the docker cli.
+
+        :param host: The host url, defaults to the DOCKER_HOST environment variable.
+        :type host: str
+        :param timeout: Socket timeout in seconds.
+        :type timeout: int
+        :returns: The engine client.
+        :rtype: <EngineClient obj>
+        """
+        host = host or os.environ.get("DOCKER_HOST", "")
+        if not host:
+            return cls(DEFAULT_SOCKET, timeout=timeout)
+        if host.startswith("unix://"):
+            return cls(host[len("unix://"):], timeout=timeout)
+        if host.startswith("tcp://") and not os.environ.get("DOCKER_TLS_VERIFY"):
+            return cls(timeout=timeout, address=host[len("tcp://"):].rstrip("/"))
+
+        raise errors.EngineUnavailable
+
+    def containers(self, all_containers=True, filters=None):
+        """
+        Gets the containers list from the engine, the API equivalent of `docker ps -a`.
+
+        :param all_containers: Whether to include stopped containers.
+        :type all_containers: bool
+        :param filters: Filters for the daemon to apply, ie {"status": ["running"], "name": ["web"]}.
+        :type filters: dict
+        :returns: The containers as returned by the Docker Engine API.
+        :rtype: list
+        """
+        params = {}
+        if all_containers:
+            params["all"] = 1
+        if filters:
+            params["filters"] = json.dumps(filters, sort_keys=True)
+        return self.get("/containers/json", params)
+
+    def inspect(self, container_ids):
+        """
+        Inspects many containers, the API equivalent of `docker inspect`. The engine has no batch endpoint so this
+        makes one request per container, but all of them over a single kept alive connection.
+
+        :param container_ids: The IDs of the containers to inspect.
+        :type container_ids: list
+        :returns: The inspect data for each container which still exists.
+        :rtype: list
+        """
+        inspected = []
+        conn = self._connection(timeout=self.timeout)
+        try:
+            for container_id in container_ids:
+                conn.request(
+                    "GET",
+                    self._url("/containers/%s/json" % container_id),
+                    headers={"Accept": "application/json"})
+                response = conn.getresponse()
+                body = response.read()
+                # Containers removed since they were listed are skipped.
+                if response.status == 404:
+                    continue
+                if response.status != 200:
+                    raise errors.BadResponseDockerEngine
+                try:
+                    inspected.append(json.loads(body.decode("utf-8")))
+                except ValueError:
+                    raise errors.BadResponseDockerEngine
+        except socket.timeout:
+            raise errors.EngineTimeout
+        except OSError:
+            raise errors.EngineUnavailable
+        finally:
+            conn.close()
+
+        return inspected
+
+    def stats(self, container_id):
+        """
+        Gets a single resource usage sample for a container, the API equivalent of `docker stats --no-stream`.
+
+        :param container_id: The ID of the container.
+        :type container_id: str
+        :returns: The engine's stats for the container.
+        :rtype: dict
+        """
+        return self.get("/containers/%s/stats" % container_id, {"stream": 0})
+
+    def info(self):
+        """
+        Gets the system wide information from the engine, which includes the container counts.
+
+        :returns: The engine's /info response.
+        :rtype: dict
+        """
+        return self.get("/info")
+
+    def events(self, filters=None, since=None):
+        """
+        Streams events from the engine as they happen, the API equivalent of `docker events`.
+
+        :param filters: Filters for the daemon to apply, ie {"type": ["container"]}.
+        :type filters: dict
+        :param since: Unix timestamp to replay events from.
+        :type since: int
+        :returns: Generator of the decoded events.
+        :rtype: generator
+        """
+        params = {}
+        if filters:
+            params["filters"] = json.dumps(filters, sort_keys=True)
+        if since:
+            params["since"] = int(since)
+
+        conn = self._connection(timeout=None)
+        try:
+            conn.request("GET", self._url("/events", params), headers={"Accept": "application/json"})
+            response = conn.getresponse()
+            if response.status != 200:
+                raise errors.BadResponseDockerEngine
+
+            while True:
+                line = response.readline()
+                if not line:
+                    break
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    yield json.loads(line.decode("utf-8"))
+                except ValueError:
+                    raise errors.BadResponseDockerEngine
+        except OSError:
+            raise errors.EngineUnavailable
+        finally:
+            conn.close()
+
+    def get(self, path, params=None):
+        """
+        Runs a GET request against the engine and decodes the JSON response.
+
+        :param path: The API path to request, without the version prefix.
+        :type path: str
+        :param params: Query string parameters for the request.
+        :type params: dict
+        :returns: The decoded JSON response.
+        :rtype: list|dict
+        """
+        conn = self._connection(timeout=self.timeout)
+        try:
+            conn.request("GET", self._url(path, params), headers={"Accept": "application/json"})
+            response = conn.getresponse()
+            body = response.read()
+            profiling.count("bytes_read", len(body))
+        except socket.timeout:
+            raise errors.EngineTimeout
+        except OSError:
+            raise errors.EngineUnavailable
+        finally:
+            conn.close()
+
+        if response.status != 200:
+            raise errors.BadResponseDockerEngine
+
+        try:
+            return json.loads(body.decode("utf-8"))
+        except ValueError:
+            raise errors.BadResponseDockerEngine
+
+    def _connection(self, timeout):
+        """
+        Creates a connection to the engine, raising EngineUnavailable if there is no socket to connect to.
+
+        :param timeout: Socket timeout in seconds, None to block forever.
+        :type timeout: int
+        :returns: The connection, not yet connected.
+        :rtype: <HTTPConnection obj>
+        """
+        if self.address:
+            return http.client.HTTPConnection(self.address, timeout=timeout)
+
+        if not self.socket_path or not os.path.exists(self.socket_path):
+            raise errors.EngineUnavailable
+
+        return UnixHTTPConnection(self.socket_path, timeout=timeout)
+
+    def _url(self, path, params=None):
+        """
+        Creates the versioned API url for a path.
+
+        :param path: The API path to request, without the version prefix.
+        :type path: str
+        :param params: Query string parameters for the request.
+        :type params: dict
+        :returns: The url, ie "/v1.25/containers/json?all=1"
+        :rtype: str
+        """
+        url = "/%s%s" % (API_VERSION, path)
+        if params:
+            url += "?" + urlencode(params)
+        return url
+
+
+def socket_path_from_env():
+    """
+    Gets the Docker socket path to use, respecting a unix:// DOCKER_HOST if one is set.
+
+    :returns: The socket path, or None if DOCKER_HOST points at something other than a unix socket.
+    :rtype: str
+    """
+    docker_host = os.environ.get("DOCKER_HOST", "")
+    if not docker_host:
+        return DEFAULT_SOCKET
+    if docker_host.startswith("unix://"):
+        return docker_host[len("unix://"):]
+
+    return None
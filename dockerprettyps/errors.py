@@ -12,3 +12,23 @@ class Error(Exception):
 class BadResponseDockerEngine(Error):
     """Raised when the Docker Engine does not supply a proper response"""
     pass
+
+
+class EngineUnavailable(Error):
+    """Raised when the Docker Engine socket can not be reached"""
+    pass
+
+
+class EngineTimeout(Error):
+    """Raised when the Docker Engine does not respond in time"""
+    pass
+
+
+class InvalidWhere(Error):
+    """Raised when a --where expression can not be parsed"""
+    pass
+
+
+class InvalidOrder(Error):
+    """Raised when an --order value names a key we can't order by"""
+    pass
@@ -0,0 +1,85 @@
+"""Hosts
+Fans out to many Docker hosts or contexts at once, merging their containers into one list. Every host is fetched on
+the same asyncio event loop, up to --concurrency at a time, each request with it's own timeout, so a slow or dead host
+only shows up in the footer rather than holding up the rest.
+
+"""
+import asyncio
+
+import dockerprettyps
+from dockerprettyps import aio
+from dockerprettyps import errors
+
+
+def fetch_hosts(args):
+    """
+    Fetches containers from all of the hosts in the CLI args concurrently, tagging each container with it's host.
+    Unit tested: tests/test_hosts.py
+
+    :param args: The CLI args
+    :type args: <class 'argparse.Namespace'>
+    :returns: The merged containers, total containers, total running containers and a list of (host, reason) tuples
+        for the hosts which could not be reached.
+    :rtype: tuple
+    """
+    return asyncio.run(gather_hosts(args))
+
+
+async def gather_hosts(args):
+    """
+    Fetches containers from all of the hosts in the CLI args concurrently, see fetch_hosts(). Each host is retried on
+    it's own, so one flaky host doesn't retry the others.
+
+    :param args: The CLI args
+    :type args: <class 'argparse.Namespace'>
+    :returns: The merged containers, total containers, total running containers and the unreachable hosts.
+    :rtype: tuple
+    """
+    limit = asyncio.Semaphore(max(args.concurrency, 1))
+
+    async def fetch_host(host):
+        async with limit:
+            return await aio.with_retries(lambda: aio.get_containers(args, host), args.retries, args.backoff)
+
+    results = await asyncio.gather(*[fetch_host(host) for host in args.hosts], return_exceptions=True)
+
+    containers = []
+    total_containers = 0
+    total_running_containers = 0
+    unreachable_hosts = []
+    for host, result in zip(args.hosts, results):
+        if isinstance(result, BaseException):
+            unreachable_hosts.append((host, _unreachable_reason(result)))
+            continue
+
+        host_containers, host_total, host_running = result
+        containers += [container.replace(host=host) for container in host_containers]
+        total_containers += host_total
+        total_running_containers += host_running
+
+    containers = dockerprettyps.get_container_colors(containers)
+    return containers, total_containers, total_running_containers, unreachable_hosts
+
+
+def _unreachable_reason(error):
+    """
+    Gets a short reason a host could not be reached, for the footer.
+    Unit tested: test__unreachable_reason
+
+    :param error: The exception raised while fetching the host.
+    :type error: BaseException
+    :returns: The reason, ie "timed out".
+    :rtype: str
+    """
+    if isinstance(error, errors.EngineTimeout):
+        return "timed out"
+    elif isinstance(error, errors.EngineUnavailable):
+        return "unavailable"
+    elif isinstance(error, errors.BadResponseDockerEngine):
+        return "bad response"
+    elif isinstance(error, FileNotFoundError):
+        return "docker cli not found"
+    elif isinstance(error, asyncio.CancelledError):
+        return "cancelled"
+
+    return str(error) or error.__class__.__name__
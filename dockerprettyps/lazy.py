@@ -0,0 +1,28 @@
+"""Lazy
+Stand ins for submodules which are only imported once they're first used, so a run only pays for importing the parts
+of docker-pretty-ps, and the standard library, it actually needs. Status bars run docker-pretty-ps several times a
+second, where interpreter start up is most of the run.
+
+"""
+import importlib
+
+
+class LazyModule(object):
+    """
+    Stands in for a module until one of it's attributes is used, then imports it. Importing a submodule also sets it
+    on it's package, replacing the stand in there.
+    Unit tested: test_lazy_module
+
+    """
+
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+
+    def __getattr__(self, attr):
+        if self._module is None:
+            self._module = importlib.import_module(self._name)
+        return getattr(self._module, attr)
+
+    def __repr__(self):
+        return "<LazyModule %s>" % self._name
@@ -0,0 +1,248 @@
+"""Profiling
+Per stage timings and counters for a run, behind --profile, to tell whether a slow run is waiting on Docker, parsing,
+filtering, ordering or writing output. Stages and counters are recorded through the module level functions, which do
+nothing but check for an active profiler when --profile isn't given, and cProfile and json are only imported when
+they're asked for.
+
+    with profiling.stage("parse"):
+        containers = clean_output(output)
+    profiling.count("rows_parsed", len(containers))
+
+Stage times are totals over every time a stage ran, so stages run many at once, on threads or asyncio tasks, ie
+fetching from many --hosts, can add up to more than the run took.
+
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+import sys
+import threading
+import time
+
+_active = None
+# How deeply nested the running stage is, kept apart for each thread and asyncio task.
+_depth = ContextVar("depth", default=0)
+
+
+class _NullStage(object):
+    """A stage which records nothing, used when profiling is off."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+NULL_STAGE = _NullStage()
+
+
+class Profiler(object):
+    """
+    Collects the timings and counters for a run.
+    Unit tested: tests/test_profiling.py
+
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.finished = None
+        # Stage name to [seconds, calls, depth], in the order stages first ran.
+        self.stages = {}
+        self.counters = {}
+        self.cprofile = None
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def stage(self, name):
+        """
+        Times a stage, adding to the stage's total if it has run before.
+
+        :param name: The stage name, ie "parse".
+        :type name: str
+        """
+        depth = _depth.get()
+        with self._lock:
+            # Added on the way in, so stages are listed in the order they started.
+            stage = self.stages.setdefault(name, [0, 0, depth])
+        token = _depth.set(depth + 1)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - start
+            _depth.reset(token)
+            with self._lock:
+                stage[0] += seconds
+                stage[1] += 1
+
+    def count(self, name, amount=1):
+        """
+        Adds to a counter, ie the number of rows parsed.
+
+        :param name: The counter name, ie "rows_parsed".
+        :type name: str
+        :param amount: The amount to add.
+        :type amount: int
+        """
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def timed(self, name, function):
+        """
+        Wraps a function so every call is timed as a stage, for stages run once per row where a with block would
+        get in the way.
+
+        :param name: The stage name, ie "dates".
+        :type name: str
+        :param function: The function to time.
+        :type function: function
+        :returns: The timed function.
+        :rtype: function
+        """
+        def timed_function(*args, **kwargs):
+            with self.stage(name):
+                return function(*args, **kwargs)
+        return timed_function
+
+    def finish(self):
+        """Marks the end of the run."""
+        self.finished = time.perf_counter()
+
+    def as_dict(self):
+        """
+        Gets the timings and counters, as written by --profile-json.
+        Unit tested: test_as_dict
+
+        :returns: The total seconds, each stage's seconds and calls and the counters.
+        :rtype: dict
+        """
+        finished = self.finished or time.perf_counter()
+        return {
+            "total_seconds": round(finished - self.started, 6),
+            "stages": [
+                {"name": name, "seconds": round(seconds, 6), "calls": calls, "depth": depth}
+                for name, (seconds, calls, depth) in self.stages.items()],
+            "counters": dict(sorted(self.counters.items())),
+        }
+
+    def report(self):
+        """
+        Creates the breakdown printed by --profile, nested stages indented under the stages they ran in.
+        Unit tested: test_report
+
+        :returns: The breakdown.
+        :rtype: str
+        """
+        profile = self.as_dict()
+        lines = ["Profile:"]
+        for stage in profile["stages"]:
+            name = "    " * (stage["depth"] + 1) + stage["name"]
+            calls = "%s call%s" % (stage["calls"], "" if stage["calls"] == 1 else "s")
+            lines.append("%-28s%10.2fms  %s" % (name, stage["seconds"] * 1000, calls))
+        lines.append("%-28s%10.2fms" % ("    total", profile["total_seconds"] * 1000))
+        for name, value in profile["counters"].items():
+            lines.append("    %-24s%12s" % (name, value))
+        return "\n".join(lines) + "\n"
+
+
+def wanted(args):
+    """
+    Checks if the CLI args ask for any profiling.
+
+    :param args: The CLI args
+    :type args: <class 'argparse.Namespace'>
+    :rtype: bool
+    """
+    return bool(args.profile or args.profile_json or args.profile_dump)
+
+
+def start(args):
+    """
+    Starts profiling a run if the CLI args ask for it, making it the active profiler.
+
+    :param args: The CLI args
+    :type args: <class 'argparse.Namespace'>
+    :returns: The profiler, or None when not profiling.
+    :rtype: <Profiler obj>
+    """
+    global _active
+    if not wanted(args):
+        return None
+
+    _active = Profiler()
+    if args.profile_dump:
+        import cProfile
+
+        _active.cprofile = cProfile.Profile()
+        _active.cprofile.enable()
+    return _active
+
+
+def stop(profiler, args):
+    """
+    Stops profiling a run, writing the breakdown to stderr and any cProfile dump.
+
+    :param profiler: The profiler from start(), or None when not profiling.
+    :type profiler: <Profiler obj>
+    :param args: The CLI args
+    :type args: <class 'argparse.Namespace'>
+    """
+    global _active
+    if not profiler:
+        return
+    _active = None
+    profiler.finish()
+
+    if args.profile_dump:
+        profiler.cprofile.disable()
+        profiler.cprofile.dump_stats(args.profile_dump)
+    if args.profile_json:
+        import json
+
+        sys.stderr.write(json.dumps(profiler.as_dict(), sort_keys=True) + "\n")
+    elif args.profile:
+        sys.stderr.write(profiler.report())
+    sys.stderr.flush()
+
+
+def stage(name):
+    """
+    Times a stage of the run, when profiling.
+
+    :param name: The stage name, ie "parse".
+    :type name: str
+    :returns: A context manager timing the stage.
+    """
+    if _active is None:
+        return NULL_STAGE
+    return _active.stage(name)
+
+
+def count(name, amount=1):
+    """
+    Adds to a counter, when profiling.
+
+    :param name: The counter name, ie "rows_parsed".
+    :type name: str
+    :param amount: The amount to add.
+    :type amount: int
+    """
+    if _active is not None:
+        _active.count(name, amount)
+
+
+def timed(name, function):
+    """
+    Wraps a function so every call is timed as a stage, when profiling. Returns the function itself otherwise, so
+    there's no cost per call.
+
+    :param name: The stage name, ie "dates".
+    :type name: str
+    :param function: The function to time.
+    :type function: function
+    :returns: The function, timed when profiling.
+    :rtype: function
+    """
+    if _active is None:
+        return function
+    return _active.timed(name, function)
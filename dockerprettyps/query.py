@@ -0,0 +1,197 @@
+"""Query
+A library API over the docker-pretty-ps pipeline, for using it from Python without faking CLI args or capturing
+stdout. A ContainerQuery is built once from keyword options, checked up front, then fetched, filtered, ordered and
+rendered to strings as many times as needed, ie from a long running health check service.
+
+    query = ContainerQuery(search="postgres", where="health=unhealthy", order="-created", limit=10)
+    result = query.run()
+    for container in result.containers:
+        ...
+    print(query.render(result, "table"))
+
+"""
+from types import SimpleNamespace
+
+import dockerprettyps
+from dockerprettyps import profiling
+
+# The query options and their defaults, named like the CLI args they match.
+QUERY_DEFAULTS = {
+    "search": [],
+    "all": False,
+    "where": "",
+    "order": "",
+    "reverse": False,
+    "limit": None,
+    "offset": 0,
+    "slim": False,
+    "include": [],
+    "engine": "auto",
+    "hosts": [],
+    "concurrency": 8,
+    "timeout": 10,
+    "retries": 0,
+    "backoff": 0.5,
+    "inspect": False,
+    "refresh": False,
+}
+
+RENDER_OUTPUTS = ["pretty", "table", "json"]
+
+
+class ContainerQuery(object):
+    """
+    A reusable container query, each stage usable on it's own or all at once with run().
+    Unit tested: tests/test_query.py
+
+    """
+
+    def __init__(self, **options):
+        unknown = sorted(set(options) - set(QUERY_DEFAULTS))
+        if unknown:
+            raise TypeError("Unknown query options: %s" % ", ".join(unknown))
+
+        fields = dict(QUERY_DEFAULTS)
+        fields.update(options)
+        if isinstance(fields["search"], str):
+            fields["search"] = fields["search"].split(",") if fields["search"] else []
+        if isinstance(fields["hosts"], str):
+            fields["hosts"] = [host.strip() for host in fields["hosts"].split(",") if host.strip()]
+        fields["include"] = list(fields["include"] or [])
+        self.options = SimpleNamespace(**fields)
+
+        # Bad expressions and orders fail here, rather than part way through a run.
+        if self.options.where:
+            dockerprettyps.where.compile_where(self.options.where)
+        dockerprettyps.parse_order(self.options.order)
+
+    @classmethod
+    def from_args(cls, args):
+        """
+        Creates a query from parsed CLI args.
+
+        :param args: The CLI args
+        :type args: <class 'argparse.Namespace'>
+        :returns: The query.
+        :rtype: <ContainerQuery obj>
+        """
+        return cls(**{name: getattr(args, name) for name in QUERY_DEFAULTS})
+
+    def fetch(self):
+        """
+        Fetches a snapshot of the containers from Docker.
+
+        :returns: The containers, total containers, total running containers and the (host, reason) tuples for hosts
+            which could not be reached.
+        :rtype: tuple
+        """
+        return dockerprettyps.fetch_snapshot(self.options)
+
+    def filter(self, containers):
+        """
+        Filters containers by running state, search phrases and the where expression.
+
+        :param containers: The containers to filter.
+        :type containers: list
+        :returns: The containers which pass the filters.
+        :rtype: list
+        """
+        return dockerprettyps.filter_containers(containers, self.options)
+
+    def order(self, containers):
+        """
+        Orders containers, keeping only the limit and offset's page of them.
+
+        :param containers: The containers to order.
+        :type containers: list
+        :returns: The ordered containers.
+        :rtype: list
+        """
+        return dockerprettyps.order_containers(containers, self.options)
+
+    def run(self, snapshot=None):
+        """
+        Runs the whole query, fetching, filtering and ordering.
+
+        :param snapshot: A snapshot to query instead of fetching a new one, as returned by fetch().
+        :type snapshot: tuple
+        :returns: The query's result.
+        :rtype: <QueryResult obj>
+        """
+        if snapshot is None:
+            snapshot = self.fetch()
+        containers, total_containers, total_running_containers, unreachable_hosts = snapshot
+
+        with profiling.stage("filter"):
+            containers = self.filter(containers)
+        num_matched = len(containers)
+        with profiling.stage("order"):
+            containers = self.order(containers)
+        profiling.count("rows_matched", num_matched)
+        profiling.count("rows_shown", len(containers))
+        return QueryResult(
+            containers,
+            total_containers,
+            total_running_containers,
+            num_matched,
+            unreachable_hosts)
+
+    def render(self, result, output="pretty", max_width=None):
+        """
+        Renders a result as the CLI would print it.
+
+        :param result: The query's result, from run().
+        :type result: <QueryResult obj>
+        :param output: One of "pretty", "table" or "json".
+        :type output: str
+        :param max_width: The most characters a table line may take up, None for no limit.
+        :type max_width: int
+        :returns: The rendered output.
+        :rtype: str
+        """
+        if output == "json":
+            return dockerprettyps.format_json(result.containers)
+        elif output == "table":
+            return dockerprettyps.format_table(
+                result.containers,
+                result.total_containers,
+                result.total_running_containers,
+                self.options,
+                result.unreachable_hosts,
+                result.num_matched,
+                max_width)
+        elif output == "pretty":
+            return dockerprettyps.format_output(
+                result.containers,
+                result.total_containers,
+                result.total_running_containers,
+                self.options,
+                result.unreachable_hosts,
+                result.num_matched)
+
+        raise ValueError("Unknown output %s, expected one of %s" % (output, ", ".join(RENDER_OUTPUTS)))
+
+
+class QueryResult(object):
+    """
+    The containers a query found, along with the totals for all of Docker's containers.
+
+    """
+
+    __slots__ = [
+        "containers",
+        "total_containers",
+        "total_running_containers",
+        "num_matched",
+        "unreachable_hosts",
+    ]
+
+    def __init__(self, containers, total_containers, total_running_containers, num_matched, unreachable_hosts=None):
+        self.containers = containers
+        self.total_containers = total_containers
+        self.total_running_containers = total_running_containers
+        self.num_matched = num_matched
+        self.unreachable_hosts = unreachable_hosts or []
+
+    def __repr__(self):
+        return "<QueryResult %s of %s containers>" % (len(self.containers), self.total_containers)
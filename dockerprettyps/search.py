@@ -0,0 +1,85 @@
+"""Search
+Matches the search phrases against container names. All of the phrases are compiled into one regex, so each name is
+scanned once however many phrases there are, and the spans of the matches are kept for highlighting the names later.
+
+"""
+from functools import lru_cache
+import re
+
+# The most names a search keeps the spans of. A search is reused across --watch refreshes and --serve requests, so
+# it's spans are capped, the oldest names are forgotten first.
+MAX_CACHED_SPANS = 10000
+
+
+class SearchIndex(object):
+    """
+    The compiled search phrases, along with the match spans of the names searched most recently.
+    Unit tested: tests/test_search.py
+
+    """
+
+    def __init__(self, phrases):
+        self.phrases = list(phrases)
+        # An empty phrase, ie from a trailing comma, is in every name.
+        self.match_all = "" in self.phrases
+        self.pattern = None
+        self._spans = {}
+
+        # Longest first, so where phrases start at the same place the longest one wins.
+        alternatives = sorted(set([phrase for phrase in self.phrases if phrase]), key=len, reverse=True)
+        if alternatives:
+            # Matching inside a lookahead finds a phrase at every position, so overlapping phrases are all found.
+            self.pattern = re.compile("(?=(%s))" % "|".join([re.escape(phrase) for phrase in alternatives]))
+
+    def matches(self, name):
+        """
+        Checks if any of the phrases are in a name.
+
+        :param name: The container name.
+        :type name: str
+        :returns: Whether or not the name matches the search.
+        :rtype: bool
+        """
+        return self.match_all or bool(self.spans(name))
+
+    def spans(self, name):
+        """
+        Gets where the phrases are in a name, as sorted, non overlapping (start, end) spans. Spans are remembered per
+        name, up to MAX_CACHED_SPANS names, so highlighting a name which was just filtered doesn't scan it again.
+
+        :param name: The container name.
+        :type name: str
+        :returns: The match spans, ie [(5, 9)] for "post" in "some-postgres".
+        :rtype: list
+        """
+        if name in self._spans:
+            return self._spans[name]
+
+        spans = []
+        if self.pattern:
+            for match in self.pattern.finditer(name):
+                start, end = match.span(1)
+                if spans and start <= spans[-1][1]:
+                    if end > spans[-1][1]:
+                        spans[-1] = (spans[-1][0], end)
+                else:
+                    spans.append((start, end))
+
+        if len(self._spans) >= MAX_CACHED_SPANS:
+            del self._spans[next(iter(self._spans))]
+        self._spans[name] = spans
+        return spans
+
+
+@lru_cache(maxsize=32)
+def search_index(phrases):
+    """
+    Gets the compiled search for a set of phrases, compiling it only the first time it's asked for.
+    Unit tested: test_search_index
+
+    :param phrases: The search phrases.
+    :type phrases: tuple
+    :returns: The compiled search.
+    :rtype: <SearchIndex obj>
+    """
+    return SearchIndex(phrases)
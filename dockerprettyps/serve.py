@@ -0,0 +1,232 @@
+"""Serve
+A resident daemon which keeps the fetched containers warm and answers queries over a local unix socket, so scripts
+running docker-pretty-ps many times a minute don't each pay for asking Docker. Snapshots are reused until a Docker
+event says a container changed, or for --serve-interval seconds at most. The CLI forwards its args to the daemon when
+one is running, see dockerprettyps.client, printing whatever the daemon would have printed, and runs the query itself
+otherwise.
+
+"""
+from contextlib import contextmanager, redirect_stderr, redirect_stdout
+import io
+import json
+import os
+import signal
+import socket
+import socketserver
+import sys
+import threading
+import time
+
+import dockerprettyps
+from dockerprettyps import cache
+from dockerprettyps.client import FORWARDED_ENV, default_socket_path
+from dockerprettyps import errors
+from dockerprettyps import watch
+
+MAX_REQUEST_SIZE = 1024 * 1024
+
+
+class QueryServer(socketserver.UnixStreamServer):
+    """
+    Answers queries one at a time, from snapshots of the containers kept per cache key.
+    Unit tested: tests/test_serve.py
+
+    """
+
+    def __init__(self, socket_path, args):
+        self.args = args
+        self.interval = args.serve_interval
+        self.snapshots = {}
+        self.generation = 0
+        socketserver.UnixStreamServer.__init__(self, socket_path, QueryHandler)
+        # Anyone who can query the daemon can read what's running in Docker.
+        os.chmod(socket_path, 0o600)
+
+    def answer(self, request):
+        """
+        Runs a query for a client, capturing what it prints.
+
+        :param request: The client's request, with it's args, environment and terminal.
+        :type request: dict
+        :returns: The response, with the exit status and output, or a None status if the client should run the query
+            itself.
+        :rtype: dict
+        """
+        env = request.get("env") or {}
+        for name in FORWARDED_ENV:
+            if env.get(name, "") != os.environ.get(name, ""):
+                return {"status": None}
+
+        stdout = ClientOutput(request.get("tty", False))
+        stderr = io.StringIO()
+        status = 0
+        try:
+            with client_terminal(request), redirect_stdout(stdout), redirect_stderr(stderr):
+                args = dockerprettyps._parsed_args(request.get("argv") or [])
+                if args.watch or args.serve:
+                    return {"status": None}
+                dockerprettyps.run(args, self.snapshot)
+        except SystemExit as e:
+            if isinstance(e.code, int) or e.code is None:
+                status = e.code or 0
+            else:
+                stderr.write("%s\n" % e.code)
+                status = 1
+        except Exception:
+            # Leave anything unexpected to the client, which reports it the same way it would without a daemon.
+            return {"status": None}
+
+        return {"status": status, "stdout": stdout.getvalue(), "stderr": stderr.getvalue()}
+
+    def snapshot(self, args):
+        """
+        Gets the snapshot for a query's args, fetching a new one if there isn't one since the last Docker event and
+        within the interval.
+
+        :param args: The CLI args
+        :type args: <class 'argparse.Namespace'>
+        :returns: The containers, total containers, total running containers and the unreachable hosts.
+        :rtype: tuple
+        """
+        now = time.monotonic()
+        key = cache.cache_key(args)
+        stored = self.snapshots.get(key)
+        if stored and not args.refresh:
+            fetched_at, generation, snapshot = stored
+            if generation == self.generation and now - fetched_at < self.interval:
+                return snapshot
+
+        # Taken before fetching, so an event during the fetch still marks the new snapshot as stale.
+        generation = self.generation
+        snapshot = dockerprettyps.fetch_snapshot(args)
+        for stale_key in [k for k, v in self.snapshots.items() if now - v[0] >= self.interval]:
+            del self.snapshots[stale_key]
+        self.snapshots[key] = (time.monotonic(), generation, snapshot)
+        return snapshot
+
+    def follow_events(self):
+        """
+        Marks every snapshot as stale whenever Docker sends a container event. Without events, snapshots are only
+        refreshed on the interval.
+
+        """
+        try:
+            for event in watch.watch_events(self.args, int(time.time())):
+                self.generation += 1
+        except (errors.Error, OSError):
+            pass
+
+
+class QueryHandler(socketserver.StreamRequestHandler):
+    """Reads a single JSON request line from a client and writes back the JSON response."""
+
+    def handle(self):
+        try:
+            request = json.loads(self.rfile.readline(MAX_REQUEST_SIZE).decode("utf-8"))
+        except ValueError:
+            return
+        response = self.server.answer(request)
+        self.wfile.write(json.dumps(response).encode("utf-8") + b"\n")
+
+
+class ClientOutput(io.StringIO):
+    """Captures output for a client, answering isatty() for the client's terminal rather than the daemon's."""
+
+    def __init__(self, tty=False):
+        super(ClientOutput, self).__init__()
+        self.tty = tty
+
+    def isatty(self):
+        return self.tty
+
+
+@contextmanager
+def client_terminal(request):
+    """
+    Sizes the terminal, as shutil.get_terminal_size() sees it, like the client's while answering it's request.
+
+    :param request: The client's request.
+    :type request: dict
+    """
+    saved = {name: os.environ.get(name) for name in ["COLUMNS", "LINES"]}
+    if request.get("columns"):
+        os.environ["COLUMNS"] = str(request["columns"])
+    if request.get("lines"):
+        os.environ["LINES"] = str(request["lines"])
+    try:
+        yield
+    finally:
+        for name, value in saved.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+
+
+def run_server(args):
+    """
+    Runs the --serve daemon until interrupted or terminated, removing it's socket either way.
+    Unit tested: test_run_server_terminated
+
+    :param args: The CLI args
+    :type args: <class 'argparse.Namespace'>
+    """
+    socket_path = args.socket or default_socket_path()
+    if not socket_path:
+        print("%sError:%s --serve needs unix sockets, or a --socket path" % (dockerprettyps.RED, dockerprettyps.ENDC))
+        exit(1)
+    if os.path.exists(socket_path):
+        if _daemon_listening(socket_path):
+            print("%sError:%s A daemon is already serving on %s" % (
+                dockerprettyps.RED, dockerprettyps.ENDC, socket_path))
+            exit(1)
+        # Left behind by a daemon which didn't shut down cleanly.
+        os.unlink(socket_path)
+
+    server = QueryServer(socket_path, args)
+    try:
+        # Stopped by a service manager or kill, unwinding through the finally like a KeyboardInterrupt does.
+        signal.signal(signal.SIGTERM, _exit_on_sigterm)
+        events = threading.Thread(target=server.follow_events)
+        events.daemon = True
+        events.start()
+        print("Serving on %s" % socket_path)
+        sys.stdout.flush()
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+
+
+def _exit_on_sigterm(signum, frame):
+    """
+    Exits the daemon on a SIGTERM.
+
+    :param signum: The signal number.
+    :type signum: int
+    :param frame: The frame the signal interrupted.
+    :type frame: <frame obj>
+    """
+    raise SystemExit(0)
+
+
+def _daemon_listening(socket_path):
+    """
+    Checks if a daemon is accepting connections on a socket.
+
+    :param socket_path: The socket path.
+    :type socket_path: str
+    :rtype: bool
+    """
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(1)
+    try:
+        sock.connect(socket_path)
+        return True
+    except OSError:
+        return False
+    finally:
+        sock.close()
@@ -0,0 +1,251 @@
+"""Watch
+Keeps the pretty output on screen and up to date. After one initial listing, Docker engine events are used to patch
+only the containers they mention, and only the lines of the screen which changed are redrawn.
+
+"""
+import json
+import shutil
+import subprocess
+import sys
+import time
+
+import dockerprettyps
+from dockerprettyps import engine
+from dockerprettyps import errors
+
+WATCH_EVENTS = ["create", "start", "die", "destroy", "health_status"]
+
+CLEAR_SCREEN = '\033[2J'
+CLEAR_LINE = '\033[K'
+CLEAR_BELOW = '\033[J'
+
+
+class Watcher(object):
+    """
+    Holds the displayed containers, keyed by container ID, along with each container's rendered block of lines and
+    the lines currently on screen.
+    Unit tested: tests/test_watch.py
+
+    """
+
+    def __init__(self, args, out=None):
+        self.args = args
+        self.out = out or sys.stdout
+        self.selected_includes = dockerprettyps.get_selected_includes(args)
+        self.containers = {}
+        self.colors = {}
+        self.blocks = {}
+        self.col_width = None
+        self.screen = []
+        self.total_containers = 0
+        self.total_running_containers = 0
+        self.loaded_at = 0
+
+    def load(self):
+        """
+        Does the initial listing of containers.
+
+        """
+        self.loaded_at = time.time()
+        containers, self.total_containers, self.total_running_containers = dockerprettyps.get_containers(self.args)
+        for container in dockerprettyps.filter_containers(containers, self.args):
+            self.containers[container.container_id] = container
+            self.colors[container.container_id] = container.color
+
+    def handle_event(self, event):
+        """
+        Patches the container an engine event is about, re-fetching just that container from the engine.
+
+        :param event: The decoded Docker engine event.
+        :type event: dict
+        :returns: Whether or not the event changed anything to display.
+        :rtype: bool
+        """
+        action = (event.get("Action") or event.get("status") or "").split(":")[0]
+        full_id = (event.get("Actor") or {}).get("ID") or event.get("id")
+        if not full_id or action not in WATCH_EVENTS:
+            return False
+        container_id = full_id[:12]
+
+        # Replayed events from before the initial listing are already counted in the totals.
+        if event.get("timeNano", 0) / 1e9 >= self.loaded_at:
+            self._count_event(action)
+
+        if action == "destroy":
+            self._remove(container_id)
+            return True
+
+        fetched = dockerprettyps.fetch_containers(self.args, {"id": [full_id]})
+        fetched = [c for c in fetched if full_id.startswith(c.container_id)]
+        fetched = dockerprettyps.filter_containers(fetched, self.args)
+        if not fetched:
+            self._remove(container_id)
+            return True
+
+        if container_id not in self.colors:
+            self.colors[container_id] = dockerprettyps.get_color(len(self.colors))
+        self.containers[container_id] = fetched[0].replace(color=self.colors[container_id])
+        self.blocks.pop(container_id, None)
+        return True
+
+    def render(self):
+        """
+        Draws the containers, only rendering blocks for containers which changed since the last render and only
+        writing the lines of the screen which are different.
+
+        """
+        ordered = dockerprettyps.order_containers(list(self.containers.values()), self.args)
+        lines = dockerprettyps.header_lines(self.args)
+        for container in ordered:
+            container_id = container.container_id
+            if container_id not in self.blocks:
+                content = dockerprettyps.container_print_content(container, self.selected_includes, self.args)
+                # Every container has the same labels, so the first one tells us the column width.
+                if self.col_width is None:
+                    self.col_width = dockerprettyps.get_col_width([content])
+                self.blocks[container_id] = dockerprettyps.container_lines(content, self.col_width)
+            lines += self.blocks[container_id]
+
+        footer = dockerprettyps.footer_lines(
+            len(ordered),
+            self.total_containers,
+            self.total_running_containers,
+            self.args)
+        rows = shutil.get_terminal_size().lines
+        if len(lines) + len(footer) > rows:
+            lines = lines[:max(rows - len(footer), 0)]
+        lines += footer
+
+        if not self.screen:
+            self.out.write(CLEAR_SCREEN)
+        self.out.write(screen_diff(self.screen, lines))
+        self.out.flush()
+        self.screen = lines
+
+    def _count_event(self, action):
+        """
+        Keeps the footer totals up to date from an event, without asking the engine to count again.
+
+        :param action: The event action, ie "start".
+        :type action: str
+        """
+        if action == "create":
+            self.total_containers += 1
+        elif action == "destroy":
+            self.total_containers = max(self.total_containers - 1, 0)
+        elif action == "start":
+            self.total_running_containers += 1
+        elif action == "die":
+            self.total_running_containers = max(self.total_running_containers - 1, 0)
+
+    def _remove(self, container_id):
+        """
+        Removes a container from the display.
+
+        :param container_id: The short container ID.
+        :type container_id: str
+        """
+        self.containers.pop(container_id, None)
+        self.blocks.pop(container_id, None)
+
+
+def run_watch(args):
+    """
+    Runs the watch mode until interrupted.
+
+    :param args: The CLI args
+    :type args: <class 'argparse.Namespace'>
+    """
+    watcher = Watcher(args)
+    watcher.load()
+    watcher.render()
+    try:
+        for event in watch_events(args, int(watcher.loaded_at)):
+            if watcher.handle_event(event):
+                watcher.render()
+    except KeyboardInterrupt:
+        watcher.out.write("\n")
+
+
+def watch_events(args, since):
+    """
+    Streams container events from the engine backend selected by the CLI args.
+
+    :param args: The CLI args
+    :type args: <class 'argparse.Namespace'>
+    :param since: Unix timestamp to replay events from, so nothing is missed after the initial listing.
+    :type since: int
+    :returns: Generator of the decoded events.
+    :rtype: generator
+    """
+    filters = {"type": ["container"], "event": list(WATCH_EVENTS)}
+    if args.engine in ["auto", "api"]:
+        try:
+            for event in engine.EngineClient.from_host().events(filters, since):
+                yield event
+            return
+        except errors.EngineUnavailable:
+            if args.engine == "api":
+                raise
+
+    for event in _cli_events(filters, since):
+        yield event
+
+
+def _cli_events(filters, since):
+    """
+    Streams events from `docker events`, one JSON object per line.
+
+    :param filters: Filters for the daemon to apply, ie {"type": ["container"]}.
+    :type filters: dict
+    :param since: Unix timestamp to replay events from.
+    :type since: int
+    :returns: Generator of the decoded events.
+    :rtype: generator
+    """
+    cmds = ["docker", "events", "--format", "{{json .}}", "--since", str(since)]
+    for key in sorted(filters):
+        for value in filters[key]:
+            cmds += ["--filter", "%s=%s" % (key, value)]
+
+    proc = subprocess.Popen(cmds, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+    try:
+        for line in proc.stdout:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line.decode("utf-8"))
+            except ValueError:
+                raise errors.BadResponseDockerEngine
+    finally:
+        proc.terminate()
+        proc.wait()
+
+    if proc.returncode not in [0, -15]:
+        raise errors.BadResponseDockerEngine
+
+
+def screen_diff(old_lines, new_lines):
+    """
+    Creates the terminal escape sequences to turn the lines on screen into the new lines, rewriting only the lines
+    which changed.
+    Unit tested: test_screen_diff
+
+    :param old_lines: The lines currently on screen.
+    :type old_lines: list
+    :param new_lines: The lines to display.
+    :type new_lines: list
+    :returns: The output to write to the terminal.
+    :rtype: str
+    """
+    out = []
+    for row, line in enumerate(new_lines):
+        if row < len(old_lines) and old_lines[row] == line:
+            continue
+        out.append("\033[%d;1H%s%s" % (row + 1, line, CLEAR_LINE))
+
+    if len(new_lines) < len(old_lines):
+        out.append("\033[%d;1H%s" % (len(new_lines) + 1, CLEAR_BELOW))
+
+    return "".join(out)
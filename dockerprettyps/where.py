@@ -0,0 +1,340 @@
+"""Where
+A small expression language for filtering containers on their fields, ie
+`image~postgres and health=unhealthy and age>2d and port=5432`. An expression is parsed once into a predicate, which is
+then just called once per container.
+
+Comparisons are joined with "and", "or", "not" and parentheses. Text fields (name, image, command, status, id, host,
+health) support =, !=, ~ (contains) and !~. The port field matches when any of the container's ports compare true with
+=, >, <, >= or <=, and != when none of them equal the value. The running field takes = or != with true or false. The
+age field compares how long ago the container was created with >, <, >= or <=, ie 30s, 15m, 6h, 2d or 1w. Health is
+one of healthy, unhealthy, starting or none.
+
+"""
+from datetime import datetime, timedelta
+from functools import lru_cache
+import operator
+import re
+
+from dockerprettyps import errors
+
+TOKEN_RE = re.compile(r"""\s*(?:(\()|(\))|(!=|!~|>=|<=|=|~|>|<)|"([^"]*)"|'([^']*)'|([^\s()!=~<>"']+))""")
+AGE_RE = re.compile(r"^(\d+(?:\.\d+)?)([smhdw]?)$")
+# A port number or range in a Docker port, ie the 5432s in "10.138.44.203:5432->5432/tcp".
+PORT_NUMBER_RE = re.compile(r"(?:^|:|->)(\d+)(?:-(\d+))?(?=/|->|$)")
+
+AGE_UNITS = {
+    "": 1,
+    "s": 1,
+    "m": 60,
+    "h": 60 * 60,
+    "d": 60 * 60 * 24,
+    "w": 60 * 60 * 24 * 7,
+}
+
+OPERATORS = {
+    "=": operator.eq,
+    "!=": operator.ne,
+    ">": operator.gt,
+    "<": operator.lt,
+    ">=": operator.ge,
+    "<=": operator.le,
+}
+
+TEXT_FIELDS = {
+    "name": lambda container: container.name,
+    "image": lambda container: container.image,
+    "command": lambda container: container.command,
+    "status": lambda container: container.status,
+    "id": lambda container: container.container_id,
+    "host": lambda container: container.host or "",
+    "health": lambda container: container.health or "none",
+}
+FIELDS = sorted(list(TEXT_FIELDS) + ["port", "running", "age"])
+
+
+def compile_where(expression, now=None):
+    """
+    Parses a --where expression into a predicate for filtering containers.
+    Unit tested: test_compile_where
+
+    :param expression: The expression, ie "image~postgres and age>2d".
+    :type expression: str
+    :param now: The time ages are worked out from, defaults to now.
+    :type now: <Datetime obj>
+    :returns: Function taking a container, returning whether or not it matches the expression.
+    :rtype: function
+    """
+    return _Parser(tokenize(expression), now or datetime.now()).parse()
+
+
+def tokenize(expression):
+    """
+    Splits a --where expression into it's tokens.
+    Unit tested: test_tokenize
+
+    :param expression: The expression, ie "image~postgres and age>2d".
+    :type expression: str
+    :returns: The (kind, value) tokens, where kind is one of "(", ")", "op", "text" or "word".
+    :rtype: list
+    """
+    tokens = []
+    position = 0
+    expression = expression.rstrip()
+    while position < len(expression):
+        match = TOKEN_RE.match(expression, position)
+        if not match:
+            raise errors.InvalidWhere("can't read %s" % expression[position:].strip())
+        position = match.end()
+
+        open_paren, close_paren, op, double_quoted, single_quoted, word = match.groups()
+        if open_paren:
+            tokens.append(("(", open_paren))
+        elif close_paren:
+            tokens.append((")", close_paren))
+        elif op:
+            tokens.append(("op", op))
+        elif double_quoted is not None:
+            tokens.append(("text", double_quoted))
+        elif single_quoted is not None:
+            tokens.append(("text", single_quoted))
+        else:
+            tokens.append(("word", word))
+    return tokens
+
+
+class _Parser(object):
+    """
+    Recursive descent parser for --where expressions, building the predicate as it goes. "not" binds tightest, then
+    "and", then "or".
+
+    """
+
+    def __init__(self, tokens, now):
+        self.tokens = tokens
+        self.position = 0
+        self.now = now
+
+    def parse(self):
+        if not self.tokens:
+            raise errors.InvalidWhere("the expression is empty")
+        predicate = self._or()
+        if self.position < len(self.tokens):
+            raise errors.InvalidWhere("unexpected %s" % self.tokens[self.position][1])
+        return predicate
+
+    def _or(self):
+        left = self._and()
+        while self._keyword("or"):
+            right = self._and()
+            left = _any_of(left, right)
+        return left
+
+    def _and(self):
+        left = self._not()
+        while self._keyword("and"):
+            right = self._not()
+            left = _all_of(left, right)
+        return left
+
+    def _not(self):
+        if self._keyword("not"):
+            negated = self._not()
+            return lambda container: not negated(container)
+
+        if self._peek()[0] == "(":
+            self.position += 1
+            predicate = self._or()
+            if self._next()[0] != ")":
+                raise errors.InvalidWhere("missing )")
+            return predicate
+
+        return self._comparison()
+
+    def _comparison(self):
+        kind, field = self._next()
+        if kind != "word":
+            raise errors.InvalidWhere("expected a field, one of %s" % ", ".join(FIELDS))
+        field = field.lower()
+        if field not in FIELDS:
+            raise errors.InvalidWhere("unknown field %s, expected one of %s" % (field, ", ".join(FIELDS)))
+
+        kind, op = self._next()
+        if kind != "op":
+            raise errors.InvalidWhere("expected an operator after %s" % field)
+
+        kind, value = self._next()
+        if kind not in ["word", "text"]:
+            raise errors.InvalidWhere("expected a value after %s%s" % (field, op))
+
+        if field == "port":
+            return _port_predicate(op, value)
+        elif field == "running":
+            return _running_predicate(op, value)
+        elif field == "age":
+            return _age_predicate(op, value, self.now)
+
+        return _text_predicate(field, op, value)
+
+    def _keyword(self, keyword):
+        kind, value = self._peek()
+        if kind == "word" and value.lower() == keyword:
+            self.position += 1
+            return True
+        return False
+
+    def _peek(self):
+        if self.position < len(self.tokens):
+            return self.tokens[self.position]
+        return ("end", "end of expression")
+
+    def _next(self):
+        token = self._peek()
+        self.position += 1
+        return token
+
+
+def _all_of(left, right):
+    return lambda container: left(container) and right(container)
+
+
+def _any_of(left, right):
+    return lambda container: left(container) or right(container)
+
+
+def _text_predicate(field, op, value):
+    """
+    Creates the predicate for a text field comparison, ie name~web.
+
+    :param field: The field name.
+    :type field: str
+    :param op: The operator.
+    :type op: str
+    :param value: The value to compare to.
+    :type value: str
+    :returns: The predicate.
+    :rtype: function
+    """
+    get_field = TEXT_FIELDS[field]
+    if op == "~":
+        return lambda container: value in get_field(container)
+    elif op == "!~":
+        return lambda container: value not in get_field(container)
+    elif op in ["=", "!="]:
+        compare = OPERATORS[op]
+        return lambda container: compare(get_field(container), value)
+
+    raise errors.InvalidWhere("%s can't be compared with %s" % (field, op))
+
+
+def _port_predicate(op, value):
+    """
+    Creates the predicate for a port comparison, ie port=5432, matching against the public and private ports.
+
+    :param op: The operator.
+    :type op: str
+    :param value: The port number to compare to.
+    :type value: str
+    :returns: The predicate.
+    :rtype: function
+    """
+    if not value.isdigit():
+        raise errors.InvalidWhere("port needs a number, not %s" % value)
+    number = int(value)
+
+    if op == "=":
+        return lambda container: _has_port(container.ports, number)
+    elif op == "!=":
+        return lambda container: not _has_port(container.ports, number)
+    elif op in OPERATORS:
+        compare = OPERATORS[op]
+        # A range is above a number when it's top port is, and below it when it's bottom port is.
+        side = 1 if op.startswith(">") else 0
+        return lambda container: any(
+            compare(port_range[side], number)
+            for port in container.ports
+            for port_range in port_ranges(port))
+
+    raise errors.InvalidWhere("port can't be compared with %s" % op)
+
+
+def _running_predicate(op, value):
+    """
+    Creates the predicate for a running state comparison, ie running=false.
+
+    :param op: The operator.
+    :type op: str
+    :param value: true or false.
+    :type value: str
+    :returns: The predicate.
+    :rtype: function
+    """
+    value = value.lower()
+    if value not in ["true", "false", "yes", "no"]:
+        raise errors.InvalidWhere("running needs true or false, not %s" % value)
+    if op not in ["=", "!="]:
+        raise errors.InvalidWhere("running can't be compared with %s" % op)
+
+    running = value in ["true", "yes"]
+    if op == "!=":
+        running = not running
+    return lambda container: container.running == running
+
+
+def _age_predicate(op, value, now):
+    """
+    Creates the predicate for a container age comparison, ie age>2d for containers created over 2 days ago.
+
+    :param op: The operator.
+    :type op: str
+    :param value: The age, ie 30s, 15m, 6h, 2d or 1w, plain numbers are seconds.
+    :type value: str
+    :param now: The time ages are worked out from.
+    :type now: <Datetime obj>
+    :returns: The predicate.
+    :rtype: function
+    """
+    match = AGE_RE.match(value.lower())
+    if not match:
+        raise errors.InvalidWhere("age needs a duration like 30s, 15m, 6h, 2d or 1w, not %s" % value)
+    if op not in OPERATORS or op in ["=", "!="]:
+        raise errors.InvalidWhere("age can't be compared with %s" % op)
+
+    amount, unit = match.groups()
+    # Comparing created dates saves working out each container's age.
+    created_before = now - timedelta(seconds=float(amount) * AGE_UNITS[unit])
+    compare = OPERATORS[{">": "<", "<": ">", ">=": "<=", "<=": ">="}[op]]
+    return lambda container: container.created_date is not None and compare(container.created_date, created_before)
+
+
+def _has_port(ports, number):
+    """
+    Checks if a port number is one of, or in a range of, a container's public or private ports.
+
+    :param ports: The container's ports, ie ["0.0.0.0:80->80/tcp"].
+    :type ports: list
+    :param number: The port number.
+    :type number: int
+    :rtype: bool
+    """
+    for port in ports:
+        for low, high in port_ranges(port):
+            if low <= number <= high:
+                return True
+    return False
+
+
+@lru_cache(maxsize=1024)
+def port_ranges(port):
+    """
+    Gets the port numbers in a Docker port, as (low, high) ranges, single ports having the same low and high.
+    Unit tested: test_port_ranges
+
+    :param port: The Docker port, ie "0.0.0.0:8000-8001->8000-8001/tcp".
+    :type port: str
+    :returns: The port ranges, ie ((8000, 8001), (8000, 8001)).
+    :rtype: tuple
+    """
+    ranges = []
+    for low, high in PORT_NUMBER_RE.findall(port.strip()):
+        ranges.append((int(low), int(high or low)))
+    return tuple(ranges)
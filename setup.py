@@ -13,7 +13,7 @@ setuptools.setup(
     author_email="fullteronalix0@gmail.com",
     url="https://github.com/politeauthority/docker-pretty-ps",
     download_url="https://github.com/politeauthority/docker-pretty-ps/archive/v0.0.1-alpha.zip",
-    packages=setuptools.find_packages(),
+    packages=setuptools.find_packages(exclude=["benchmarks", "benchmarks.*"]),
     scripts=['dockerprettyps/bin/docker-pretty-ps'],
     classifiers=[
         "Programming Language :: Python :: 3",
@@ -11,3 +11,28 @@ class CliArgs(object):
         self.reverse = False
         self.json = False
         self.version = False
+        self.engine = "auto"
+        self.watch = False
+        self.hosts = []
+        self.concurrency = 8
+        self.timeout = 10
+        self.retries = 0
+        self.backoff = 0.5
+        self.cache_ttl = 0
+        self.no_cache = False
+        self.refresh = False
+        self.verbose = False
+        self.inspect = False
+        self.ndjson = False
+        self.diff = False
+        self.table = False
+        self.where = ""
+        self.limit = None
+        self.offset = 0
+        self.serve = False
+        self.socket = ""
+        self.serve_interval = 5
+        self.no_daemon = False
+        self.profile = False
+        self.profile_json = False
+        self.profile_dump = ""
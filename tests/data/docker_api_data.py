@@ -0,0 +1,124 @@
+api_containers = [
+    {
+        "Id": "42df45bdc8b3d1e1b3a6f1c7e4b2a8d0c6e9f5a1b7c3d9e2f4a6b8c0d2e4f6a8",
+        "Names": ["/some-postgres"],
+        "Image": "postgres:alpine",
+        "ImageID": "sha256:1d5ef7e8a4c0b3f2e1d9c8b7a6f5e4d3c2b1a0f9e8d7c6b5a4f3e2d1c0b9a8f7",
+        "Command": "docker-entrypoint.sh postgres",
+        "Created": 1547521600,
+        "Ports": [
+            {"IP": "10.138.44.203", "PrivatePort": 5432, "PublicPort": 5432, "Type": "tcp"}
+        ],
+        "Labels": {},
+        "State": "running",
+        "Status": "Up 3 weeks",
+    },
+    {
+        "Id": "1a31fcaccf59a1c2d3e4f5a6b7c8d9e0f1a2b3c4d5e6f7a8b9c0d1e2f3a4b5c6",
+        "Names": ["/badactorservices_bad-actor-services_1"],
+        "Image": "badactorservices_bad-actor-services",
+        "ImageID": "sha256:9a8b7c6d5e4f3a2b1c0d9e8f7a6b5c4d3e2f1a0b9c8d7e6f5a4b3c2d1e0f9a8b",
+        "Command": "/bin/sh -c 'gunicorn -b 0.0.0.0:80 app:app'",
+        "Created": 1547521600,
+        "Ports": [
+            {"PrivatePort": 80, "Type": "tcp"},
+            {"IP": "0.0.0.0", "PrivatePort": 443, "PublicPort": 8443, "Type": "tcp"}
+        ],
+        "Labels": {},
+        "State": "running",
+        "Status": "Up 4 days (healthy)",
+    },
+    {
+        "Id": "25a8d92781a1b2c3d4e5f6a7b8c9d0e1f2a3b4c5d6e7f8a9b0c1d2e3f4a5b6c7",
+        "Names": ["/alpine-sshd2"],
+        "Image": "danielguerra/alpine-sshd",
+        "ImageID": "sha256:0f1e2d3c4b5a69788796a5b4c3d2e1f00f1e2d3c4b5a69788796a5b4c3d2e1f0",
+        "Command": "docker-entrypoint.sh /usr/sbin/sshd -D",
+        "Created": 1547521600,
+        "Ports": [],
+        "Labels": {},
+        "State": "exited",
+        "Status": "Exited (0) 5 days ago",
+    },
+]
+
+api_info = {
+    "Containers": 5012,
+    "ContainersRunning": 6,
+    "ContainersPaused": 1,
+    "ContainersStopped": 5005,
+}
+
+api_events = [
+    {
+        "Type": "container",
+        "Action": "die",
+        "Actor": {
+            "ID": "25a8d92781a1b2c3d4e5f6a7b8c9d0e1f2a3b4c5d6e7f8a9b0c1d2e3f4a5b6c7",
+            "Attributes": {"name": "alpine-sshd2"}
+        },
+        "time": 1547521600,
+        "timeNano": 1547521600000000000,
+    },
+    {
+        "Type": "container",
+        "Action": "health_status: healthy",
+        "Actor": {
+            "ID": "1a31fcaccf59a1c2d3e4f5a6b7c8d9e0f1a2b3c4d5e6f7a8b9c0d1e2f3a4b5c6",
+            "Attributes": {"name": "badactorservices_bad-actor-services_1"}
+        },
+        "time": 1547521600,
+        "timeNano": 1547521600000000000,
+    },
+]
+
+api_inspect = {
+    "/containers/42df45bdc8b3/json": {
+        "Id": "42df45bdc8b3d1e1b3a6f1c7e4b2a8d0c6e9f5a1b7c3d9e2f4a6b8c0d2e4f6a8",
+        "Created": "2018-08-20T10:00:00.123456789Z",
+        "State": {
+            "Status": "running",
+            "StartedAt": "2018-12-29T10:00:00.5Z",
+            "FinishedAt": "0001-01-01T00:00:00Z",
+        },
+    },
+    "/containers/25a8d92781a1/json": {
+        "Id": "25a8d92781a1b2c3d4e5f6a7b8c9d0e1f2a3b4c5d6e7f8a9b0c1d2e3f4a5b6c7",
+        "Created": "2018-12-19T03:06:40Z",
+        "State": {
+            "Status": "exited",
+            "StartedAt": "2018-12-19T03:06:41Z",
+            "FinishedAt": "2019-01-14T03:06:40Z",
+        },
+    },
+}
+
+api_stats = {
+    "/containers/42df45bdc8b3d1e1b3a6f1c7e4b2a8d0c6e9f5a1b7c3d9e2f4a6b8c0d2e4f6a8/stats": {
+        "read": "2019-01-19T03:06:40.586865123Z",
+        "cpu_stats": {
+            "cpu_usage": {"total_usage": 2000000000},
+            "system_cpu_usage": 100000000000,
+            "online_cpus": 2,
+        },
+        "precpu_stats": {
+            "cpu_usage": {"total_usage": 1000000000},
+            "system_cpu_usage": 90000000000,
+        },
+        "memory_stats": {
+            "usage": 12582912,
+            "limit": 2147483648,
+            "stats": {"inactive_file": 2097152},
+        },
+        "networks": {
+            "eth0": {"rx_bytes": 1450, "tx_bytes": 0},
+            "eth1": {"rx_bytes": 50, "tx_bytes": 0},
+        },
+        "blkio_stats": {
+            "io_service_bytes_recursive": [
+                {"major": 8, "minor": 0, "op": "read", "value": 4096000},
+                {"major": 8, "minor": 0, "op": "write", "value": 0},
+            ],
+        },
+    },
+}
@@ -1,5 +1,7 @@
 from datetime import datetime
 
+from dockerprettyps.container import Container
+
 ps_containers = [
     {
         'container_id': '1a31fcaccf59',
@@ -80,3 +82,5 @@ ps_containers = [
         'color': '\x1b[96m'
     }
 ]
+
+ps_containers = [Container.from_dict(c) for c in ps_containers]
@@ -0,0 +1,35 @@
+"""Fake Docker CLI
+Writes a stand in `docker` script for tests, printing fixed output for `docker ps` and `docker info`.
+
+"""
+import os
+
+FAKE_DOCKER = """#!/bin/sh
+if [ "$1" = "ps" ]; then
+    cat "%(ps_path)s"
+    %(ps_hang)s
+    exit %(ps_status)s
+fi
+echo "%(info)s"
+"""
+
+
+def install_fake_docker(monkeypatch, bin_dir, ps_output, info="0 0 0", ps_status=0, ps_hang=0):
+    """
+    Puts a fake docker cli first on the PATH. With ps_hang, `docker ps` then hangs for that many seconds in a child
+    process holding it's output open, like a docker cli plugin.
+
+    """
+    ps_path = os.path.join(str(bin_dir), "ps.txt")
+    with open(ps_path, "w") as ps_file:
+        ps_file.write(ps_output)
+    docker_path = os.path.join(str(bin_dir), "docker")
+    with open(docker_path, "w") as docker_file:
+        docker_file.write(FAKE_DOCKER % {
+            "ps_path": ps_path,
+            "ps_status": ps_status,
+            "ps_hang": "sleep %s" % ps_hang if ps_hang else "",
+            "info": info,
+        })
+    os.chmod(docker_path, 0o755)
+    monkeypatch.setenv("PATH", str(bin_dir) + os.pathsep + os.environ.get("PATH", ""))
@@ -0,0 +1,71 @@
+"""Fake Docker Engine
+A minimal HTTP server listening on a unix socket, standing in for the Docker Engine API in tests.
+
+"""
+from http.server import BaseHTTPRequestHandler
+import json
+import socketserver
+import threading
+
+
+class FakeEngineHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        self.server.requests.append(self.path)
+        path = self.path.split("?")[0]
+        path = path[path.find("/", 1):]
+        if path in self.server.streams:
+            self.stream(self.server.streams[path])
+            return
+
+        if path not in self.server.routes:
+            self.send_response(404)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        body = json.dumps(self.server.routes[path]).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def stream(self, items):
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        for item in items:
+            chunk = (json.dumps(item) + "\n").encode("utf-8")
+            self.wfile.write(b"%x\r\n%s\r\n" % (len(chunk), chunk))
+        self.wfile.write(b"0\r\n\r\n")
+
+    def log_message(self, format, *args):
+        pass
+
+
+class FakeEngine(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """
+    Serves canned JSON responses keyed by API path, ie {"/containers/json": [...]}, recording each request path.
+    Streams are sent as chunked, newline delimited JSON, like the engine's /events endpoint.
+
+    """
+    daemon_threads = True
+
+    def __init__(self, socket_path, routes, streams=None):
+        socketserver.UnixStreamServer.__init__(self, socket_path, FakeEngineHandler)
+        self.routes = routes
+        self.streams = streams or {}
+        self.requests = []
+
+    def __enter__(self):
+        self.thread = threading.Thread(target=self.serve_forever, kwargs={"poll_interval": 0.05})
+        self.thread.daemon = True
+        self.thread.start()
+        return self
+
+    def __exit__(self, *args):
+        self.shutdown()
+        self.server_close()
@@ -0,0 +1,191 @@
+"""Unit Tests for docker-pretty-ps asyncio fetch layer
+
+"""
+import asyncio
+import os
+import socket
+import time
+
+import pytest
+
+from dockerprettyps import aio
+from dockerprettyps import engine
+from dockerprettyps import errors
+
+from .data import docker_api_data
+from .data.cli_args import CliArgs
+from .data.fake_docker import install_fake_docker
+from .data.fake_engine import FakeEngine
+
+
+class TestAio(object):
+
+    def test_async_engine_client(self, tmp_path):
+        """
+        Tests dockerprettyps.aio.AsyncEngineClient gets and decodes the engine's JSON responses, timing out on an
+        engine which never answers and reporting a missing socket as unavailable.
+
+        """
+        docker_socket = str(tmp_path / "docker.sock")
+        routes = {
+            "/containers/json": docker_api_data.api_containers,
+            "/info": {"Containers": 3, "ContainersRunning": 2},
+        }
+        client = aio.AsyncEngineClient(engine.EngineClient(docker_socket, timeout=1))
+        with FakeEngine(docker_socket, routes) as fake_engine:
+            containers = asyncio.run(client.containers(filters={"status": ["running"]}))
+            info = asyncio.run(client.info())
+        assert containers == docker_api_data.api_containers
+        assert info["Containers"] == 3
+        assert fake_engine.requests[0].startswith("/v1.25/containers/json?all=1&filters=")
+
+        slow_socket = str(tmp_path / "slow.sock")
+        slow = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        slow.bind(slow_socket)
+        slow.listen(5)
+        try:
+            client = aio.AsyncEngineClient(engine.EngineClient(slow_socket, timeout=0.2))
+            with pytest.raises(errors.EngineTimeout):
+                asyncio.run(client.info())
+        finally:
+            slow.close()
+
+        client = aio.AsyncEngineClient(engine.EngineClient(str(tmp_path / "dead.sock")))
+        with pytest.raises(errors.EngineUnavailable):
+            asyncio.run(client.info())
+
+    def test__parse_response(self):
+        """
+        Tests dockerprettyps.aio._parse_response() reads the status and body of plain and chunked responses.
+
+        """
+        response = b"HTTP/1.1 200 OK\r\nContent-Length: 2\r\n\r\n[]"
+        assert aio._parse_response(response) == (200, b"[]")
+
+        response = b"HTTP/1.1 200 OK\r\nTransfer-Encoding: chunked\r\n\r\n3\r\n[1,\r\n2\r\n2]\r\n0\r\n\r\n"
+        assert aio._parse_response(response) == (200, b"[1,2]")
+
+        assert aio._parse_response(b"HTTP/1.1 404 Not Found\r\n\r\n") == (404, b"")
+
+        with pytest.raises(errors.BadResponseDockerEngine):
+            aio._parse_response(b"")
+        with pytest.raises(errors.BadResponseDockerEngine):
+            aio._parse_response(b"HTTP/1.1 200 OK\r\nTransfer-Encoding: chunked\r\n\r\nzz\r\n")
+
+    def test_run_docker(self, tmp_path):
+        """
+        Tests dockerprettyps.aio.run_docker() returns a command's output, and kills it once it runs past the timeout.
+
+        """
+        assert asyncio.run(aio.run_docker(["echo", "1 2 3"])) == "1 2 3\n"
+        with pytest.raises(errors.BadResponseDockerEngine):
+            asyncio.run(aio.run_docker(["false"]))
+
+        pid_path = str(tmp_path / "pid")
+        start = time.monotonic()
+        with pytest.raises(errors.EngineTimeout):
+            asyncio.run(aio.run_docker(["sh", "-c", "echo $$ > %s; exec sleep 5" % pid_path], timeout=0.2))
+        assert time.monotonic() - start < 2
+        with pytest.raises(ProcessLookupError):
+            os.kill(int(open(pid_path).read()), 0)
+
+    def test_with_retries(self, monkeypatch):
+        """
+        Tests dockerprettyps.aio.with_retries() retries timeouts and bad responses with a doubling backoff, giving up
+        after the retries, but doesn't retry an unavailable engine.
+
+        """
+        sleeps = []
+
+        async def sleep(seconds):
+            sleeps.append(seconds)
+
+        monkeypatch.setattr("asyncio.sleep", sleep)
+        attempts = []
+
+        async def flaky():
+            attempts.append(1)
+            if len(attempts) < 3:
+                raise errors.EngineTimeout
+            return "containers"
+
+        assert asyncio.run(aio.with_retries(flaky, retries=3, backoff=0.5)) == "containers"
+        assert sleeps == [0.5, 1.0]
+
+        attempts.clear()
+        with pytest.raises(errors.EngineTimeout):
+            asyncio.run(aio.with_retries(flaky, retries=1, backoff=0.5))
+        assert len(attempts) == 2
+
+        async def unavailable():
+            attempts.append(1)
+            raise errors.EngineUnavailable
+
+        attempts.clear()
+        with pytest.raises(errors.EngineUnavailable):
+            asyncio.run(aio.with_retries(unavailable, retries=3))
+        assert len(attempts) == 1
+
+    def test_get_containers(self, tmp_path, monkeypatch):
+        """
+        Tests dockerprettyps.aio.get_containers() fetches the containers along with the totals, from the engine and
+        from the docker cli.
+
+        """
+        docker_socket = str(tmp_path / "docker.sock")
+        monkeypatch.setenv("DOCKER_HOST", "unix://%s" % docker_socket)
+        routes = {
+            "/containers/json": docker_api_data.api_containers,
+            "/info": {"Containers": 7, "ContainersRunning": 2, "ContainersPaused": 1},
+        }
+        args = CliArgs()
+        args.engine = "api"
+        with FakeEngine(docker_socket, routes):
+            containers, total, running = asyncio.run(aio.get_containers(args))
+        assert [c["name"] for c in containers] == [c["Names"][0][1:] for c in docker_api_data.api_containers]
+        assert (total, running) == (7, 3)
+
+        bin_dir = tmp_path / "bin"
+        bin_dir.mkdir()
+        ps_output = "".join(
+            '{"ID":"%s","Names":"%s","Image":"nginx","Command":"nginx","CreatedAt":"2024-01-02 03:04:05 +0000 UTC",'
+            '"Status":"Up 2 hours","Ports":"","State":"running"}\n' % (i, "web-%s" % i) for i in range(3))
+        install_fake_docker(monkeypatch, bin_dir, ps_output, info="5 3 0")
+        args.engine = "cli"
+        containers, total, running = asyncio.run(aio.get_containers(args))
+        assert [c["name"] for c in containers] == ["web-0", "web-1", "web-2"]
+        assert (total, running) == (5, 3)
+
+    def test_get_containers_cancels(self, monkeypatch):
+        """
+        Tests dockerprettyps.aio.get_containers() cancels the totals still in flight when the containers can't be
+        fetched.
+
+        """
+        cancelled = []
+
+        async def fetch_totals(args, host=None):
+            try:
+                await asyncio.sleep(5)
+            except asyncio.CancelledError:
+                cancelled.append(host)
+                raise
+
+        async def fetch_containers(args, filters=None, host=None):
+            await asyncio.sleep(0)
+            raise errors.EngineTimeout
+
+        monkeypatch.setattr("dockerprettyps.aio.fetch_totals", fetch_totals)
+        monkeypatch.setattr("dockerprettyps.aio.fetch_containers", fetch_containers)
+
+        async def get_containers():
+            with pytest.raises(errors.EngineTimeout):
+                await aio.get_containers(CliArgs())
+            await asyncio.sleep(0)
+
+        start = time.monotonic()
+        asyncio.run(get_containers())
+        assert cancelled == [None]
+        assert time.monotonic() - start < 2
+
+# End File docker-pretty-ps/tests/test_aio.py
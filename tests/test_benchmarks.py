@@ -0,0 +1,88 @@
+"""Unit Tests for the docker-pretty-ps benchmarks
+
+"""
+import dockerprettyps
+
+from benchmarks import fixtures
+from benchmarks import run
+
+
+class TestBenchmarks(object):
+
+    def test_generate_containers(self):
+        """
+        Tests benchmarks.fixtures.generate_containers() gives the same mix of containers for the same seed.
+
+        """
+        containers = fixtures.generate_containers(200, seed=3)
+        assert containers == fixtures.generate_containers(200, seed=3)
+        assert containers != fixtures.generate_containers(200, seed=4)
+        assert len(set(c["Names"] for c in containers)) == 200
+
+        statuses = " ".join(c["Status"] for c in containers)
+        for state in ["(healthy)", "(unhealthy)", "Restarting", "Exited", "Created"]:
+            assert state in statuses
+
+    def test_generate_ps_output(self):
+        """
+        Tests benchmarks.fixtures.generate_ps_output() creates a text table clean_output() reads back.
+
+        """
+        generated = fixtures.generate_containers(200)
+        containers = dockerprettyps.clean_output(fixtures.generate_ps_output(200))
+        assert len(containers) == 200
+        for container, expected in zip(containers, generated):
+            assert container.container_id == expected["ID"][:12]
+            assert container.name == expected["Names"]
+            assert container.status == expected["Status"]
+            assert container.ports == dockerprettyps._parse_ports(expected["Ports"])
+
+        assert any(not c.running for c in containers)
+        assert any(len(c.ports) > 1 for c in containers)
+
+    def test_generate_json_output(self):
+        """
+        Tests benchmarks.fixtures.generate_json_output() creates JSON lines clean_json_output() reads back.
+
+        """
+        containers = dockerprettyps.clean_json_output(fixtures.generate_json_output(50))
+        text_containers = dockerprettyps.clean_output(fixtures.generate_ps_output(50))
+        assert [c.name for c in containers] == [c.name for c in text_containers]
+        assert [c.running for c in containers] == [c.running for c in text_containers]
+
+    def test_time_stages(self):
+        """
+        Tests benchmarks.run.time_stages() times every stage of the pipeline.
+
+        """
+        timings = run.time_stages(20, repeat=1)
+        for stage in ["clean_output", "parse_ps_date", "filter_where", "order", "format_output", "format_table"]:
+            assert timings[stage] >= 0
+
+    def test_format_ingest_comparison(self):
+        """
+        Tests benchmarks.run.format_ingest_comparison() gives how much slower the JSON ingest is than the text one,
+        skipping sizes without both timings.
+
+        """
+        results = {"sizes": {
+            "1000": {"clean_output": 0.020, "clean_json_output": 0.030},
+            "10000": {"clean_output": 0.2}}}
+        lines = run.format_ingest_comparison(results).splitlines()
+        assert lines[1] == "clean_json_output vs clean_output"
+        assert lines[2].split() == ["1000", "containers", "30.00ms", "vs", "20.00ms", "(1.50x)"]
+        assert len(lines) == 3
+
+    def test_compare_results(self):
+        """
+        Tests benchmarks.run.compare_results() only flags stages slower than the threshold, ignoring tiny timings.
+
+        """
+        baseline = {"sizes": {"1000": {"clean_output": 0.020, "order": 0.004, "filter_running": 0.0001}}}
+        results = {"sizes": {
+            "1000": {"clean_output": 0.030, "order": 0.0045, "filter_running": 0.0005, "cli": 0.5},
+            "10000": {"clean_output": 0.2}}}
+        assert run.compare_results(baseline, results, 0.25) == [("1000", "clean_output", 0.020, 0.030)]
+        assert run.compare_results(baseline, results, 0.6) == []
+
+# End File docker-pretty-ps/tests/test_benchmarks.py
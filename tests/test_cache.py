@@ -0,0 +1,122 @@
+"""Unit Tests for docker-pretty-ps snapshot cache
+
+"""
+from datetime import datetime
+import json
+import threading
+import time
+
+import pytest
+
+from dockerprettyps import cache
+from dockerprettyps import errors
+
+from .data import docker_ps_data as test_ps_data
+from .data.cli_args import CliArgs
+
+
+class TestCache(object):
+
+    def snapshot(self):
+        return list(test_ps_data.ps_containers), 6, 5, [("build-01", "timed out")]
+
+    def test_fetch(self, tmp_path):
+        """
+        Tests dockerprettyps.cache.SnapshotCache.fetch() serves snapshots within the TTL, and refreshes them when
+        they're stale or a refresh is asked for.
+
+        """
+        fetches = []
+
+        def fetcher():
+            fetches.append(1)
+            return self.snapshot()
+
+        snapshot_cache = cache.SnapshotCache(60, str(tmp_path))
+        containers, total, running, unreachable = snapshot_cache.fetch("key", fetcher)
+        assert not snapshot_cache.hit
+        assert snapshot_cache.stats().startswith("Cache miss")
+
+        containers, total, running, unreachable = snapshot_cache.fetch("key", fetcher)
+        assert snapshot_cache.hit
+        assert snapshot_cache.stats().startswith("Cache hit")
+        assert len(fetches) == 1
+        assert (total, running) == (6, 5)
+        assert unreachable == [("build-01", "timed out")]
+        assert isinstance(containers[0]["status_date"], datetime)
+        assert containers[0]["status_date"] == self.snapshot()[0][0]["status_date"]
+
+        snapshot_cache.fetch("key", fetcher, refresh=True)
+        assert len(fetches) == 2
+
+        # Age the snapshot past the TTL.
+        stored = json.load(open(snapshot_cache.path))
+        stored["created"] -= 120
+        json.dump(stored, open(snapshot_cache.path, "w"))
+        snapshot_cache.fetch("key", fetcher)
+        assert len(fetches) == 3
+        assert not snapshot_cache.hit
+
+    def test_fetch_concurrent(self, tmp_path):
+        """
+        Tests that concurrent fetches of a missing snapshot only refresh it once.
+
+        """
+        fetches = []
+
+        def fetcher():
+            fetches.append(1)
+            time.sleep(0.2)
+            return self.snapshot()
+
+        def run():
+            cache.SnapshotCache(60, str(tmp_path)).fetch("key", fetcher)
+
+        threads = [threading.Thread(target=run) for i in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert len(fetches) == 1
+
+    def test_fetch_stale(self, tmp_path):
+        """
+        Tests dockerprettyps.cache.SnapshotCache.fetch() serves an expired snapshot, marked stale, when Docker can't
+        be reached for a refresh, and raises when there's no snapshot to serve.
+
+        """
+        def unavailable():
+            raise errors.EngineTimeout
+
+        snapshot_cache = cache.SnapshotCache(60, str(tmp_path))
+        with pytest.raises(errors.EngineTimeout):
+            snapshot_cache.fetch("key", unavailable)
+
+        snapshot_cache.fetch("key", self.snapshot)
+        stored = json.load(open(snapshot_cache.path))
+        stored["created"] -= 120
+        json.dump(stored, open(snapshot_cache.path, "w"))
+
+        snapshot_cache = cache.SnapshotCache(60, str(tmp_path))
+        containers, total, running, unreachable = snapshot_cache.fetch("key", unavailable)
+        assert snapshot_cache.stale
+        assert snapshot_cache.age >= 120
+        assert (total, running) == (6, 5)
+        assert snapshot_cache.stats().startswith("Cache stale: Docker unavailable, served 120.")
+
+    def test_cache_key(self):
+        """
+        Tests the dockerprettyps.cache.cache_key() method changes with what's being fetched, but not search order.
+
+        """
+        args = CliArgs()
+        args.search = ["web", "db"]
+        key = cache.cache_key(args)
+
+        args.search = ["db", "web"]
+        assert cache.cache_key(args) == key
+
+        args.all = True
+        assert cache.cache_key(args) != key
+
+# End File docker-pretty-ps/tests/test_cache.py
@@ -0,0 +1,64 @@
+"""Unit Tests for docker-pretty-ps container records
+
+"""
+from datetime import datetime
+
+import pytest
+
+from dockerprettyps.container import Container
+
+from .data import docker_ps_data as test_ps_data
+
+
+class TestContainer(object):
+
+    def test_fields(self):
+        """
+        Tests dockerprettyps.container.Container fields read as attributes and, for older code, dict style.
+
+        """
+        container = test_ps_data.ps_containers[3]
+        assert container.name == "some-postgres"
+        assert container["name"] == "some-postgres"
+        assert container.get("host") is None
+        assert container.get("nope", "default") == "default"
+        with pytest.raises(KeyError):
+            container["replace"]
+        with pytest.raises(AttributeError):
+            container.nope = True
+
+    def test_health(self):
+        """
+        Tests dockerprettyps.container.Container.health reads the health check state from the status.
+
+        """
+        container = test_ps_data.ps_containers[3]
+        assert container.health == ""
+        assert container.replace(status="Up 4 days (healthy)").health == "healthy"
+        assert container.replace(status="Up 4 days (unhealthy)").health == "unhealthy"
+        assert container.replace(status="Up 2 seconds (health: starting)").health == "starting"
+
+    def test_replace(self):
+        """
+        Tests dockerprettyps.container.Container.replace() creates a changed copy, leaving the original untouched.
+
+        """
+        container = test_ps_data.ps_containers[3]
+        replaced = container.replace(host="build-01")
+        assert replaced.host == "build-01"
+        assert replaced.name == container.name
+        assert container.host is None
+        assert replaced != container
+
+    def test_to_dict(self):
+        """
+        Tests dockerprettyps.container.Container.to_dict() and from_dict() round trip a container.
+
+        """
+        container = test_ps_data.ps_containers[3]
+        fields = container.to_dict()
+        assert isinstance(fields, dict)
+        assert fields["status_date"] == datetime(2019, 1, 19, 3, 6, 40, 586918)
+        assert Container.from_dict(fields) == container
+
+# End File docker-pretty-ps/tests/test_container.py
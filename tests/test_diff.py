@@ -0,0 +1,175 @@
+"""Unit Tests for docker-pretty-ps --diff
+
+"""
+from datetime import datetime, timedelta
+import json
+
+import dockerprettyps
+from dockerprettyps import diff
+
+from .data import docker_ps_data as test_ps_data
+from .data.cli_args import CliArgs
+
+
+class TestDiff(object):
+
+    def test_compact_snapshot(self):
+        """
+        Tests dockerprettyps.diff.compact_snapshot() keeps just what a diff needs of each container, keyed by ID, or
+        host and ID for containers from --hosts.
+
+        """
+        containers = test_ps_data.ps_containers[:2]
+        containers[1] = containers[1].replace(host="build-01")
+        snapshot = diff.compact_snapshot(containers)
+
+        assert list(snapshot) == ["1a31fcaccf59", "build-01/d55ab151ce26"]
+        assert snapshot["1a31fcaccf59"] == {
+            "id": "1a31fcaccf59",
+            "name": "badactorservices_bad-actor-services_1",
+            "image": "badactorservices_bad-actor-services",
+            "status": "Up 4 days",
+            "ports": ["80/tcp"],
+            "started": "2019-01-15T03:06:40.586865",
+            "started_within": 60 * 60 * 24,
+            "running": True,
+            "host": None,
+        }
+        json.dumps(snapshot)
+
+    def test_diff_snapshots(self):
+        """
+        Tests dockerprettyps.diff.diff_snapshots() finds the containers which appeared, disappeared, stopped,
+        restarted or changed health, and nothing for the containers which didn't change, even when the start times
+        worked out from their status moved by up to a unit between runs.
+
+        """
+        taken = datetime(2024, 1, 2, 12, 0, 0)
+        two_hours_ago = (taken - timedelta(hours=2)).isoformat()
+        just_now = (taken + timedelta(seconds=30)).isoformat()
+
+        def record(name, status, started=two_hours_ago, running=True, started_within=60 * 60):
+            return {
+                "id": name, "name": name, "image": "app", "status": status, "ports": [], "started": started,
+                "started_within": started_within, "running": running, "host": None}
+
+        previous = {
+            "same": record("same", "Up 2 hours"),
+            "rounded": record("rounded", "Up 2 hours"),
+            "gone": record("gone", "Up 2 hours"),
+            "stopping": record("stopping", "Up 2 hours"),
+            "restarting": record("restarting", "Up 2 hours"),
+            "starting": record("starting", "Exited (0) 2 hours ago", "", False, 0),
+            "sick": record("sick", "Up 2 hours (healthy)"),
+            "inspected": record("inspected", "Up 2 hours", started_within=0),
+        }
+        current = {
+            "same": record("same", "Up 2 hours"),
+            # Run 59 minutes later, still "Up 2 hours", so it's start time looks 59 minutes later.
+            "rounded": record("rounded", "Up 2 hours", (taken - timedelta(minutes=61)).isoformat()),
+            "stopping": record("stopping", "Exited (137) 10 seconds ago", "", False, 0),
+            "restarting": record("restarting", "Up 30 seconds", just_now, started_within=1),
+            "starting": record("starting", "Up 30 seconds", just_now, started_within=1),
+            "sick": record("sick", "Up 2 hours (unhealthy)"),
+            "inspected": record("inspected", "Up 2 hours", (taken - timedelta(minutes=119)).isoformat(), True, 0),
+            "new": record("new", "Up 30 seconds", just_now, started_within=1),
+        }
+        changes = diff.diff_snapshots(previous, current)
+
+        assert [(c["name"], c["change"]) for c in changes] == [
+            ("stopping", "stopped"),
+            ("restarting", "restarted"),
+            ("starting", "restarted"),
+            ("sick", "health"),
+            ("inspected", "restarted"),
+            ("new", "appeared"),
+            ("gone", "disappeared"),
+        ]
+        assert changes[3]["health"] == "unhealthy"
+        assert changes[3]["previous"]["health"] == "healthy"
+        assert "previous" not in changes[5]
+        assert "previous" not in changes[6]
+
+        # Snapshots saved before start times had a precision are compared as exact.
+        del previous["same"]["started_within"]
+        del current["same"]["started_within"]
+        assert diff.diff_snapshots({"same": previous["same"]}, {"same": current["same"]}) == []
+
+    def test_format_diff(self):
+        """
+        Tests dockerprettyps.diff.format_diff() marks each changed container with how it changed.
+
+        """
+        since = (datetime.now() - timedelta(minutes=5)).isoformat()
+        changes = [
+            diff._change("appeared", {
+                "id": "a", "name": "web", "image": "nginx", "status": "Up 5 seconds", "ports": [], "started": "",
+                "running": True, "host": None}),
+            diff._change(
+                "health",
+                {"id": "b", "name": "api-server", "image": "app:2", "status": "Up 2 hours (unhealthy)", "ports": [],
+                 "started": "", "running": True, "host": "build-01"},
+                {"id": "b", "name": "api-server", "image": "app:2", "status": "Up 2 hours (healthy)", "ports": [],
+                 "started": "", "running": True, "host": "build-01"}),
+        ]
+        lines = diff.format_diff(changes, since, 10).splitlines()
+
+        assert lines[0] == "%s+ appeared   %s  web                    nginx  Up 5 seconds" % (
+            dockerprettyps.GREEN, dockerprettyps.ENDC)
+        assert lines[1] == (
+            "%s~ health     %s  api-server (build-01)  app:2  Up 2 hours (healthy) -> Up 2 hours (unhealthy)" % (
+                dockerprettyps.BOLD, dockerprettyps.ENDC))
+        assert lines[3] == "2 changes since 5 minutes ago"
+
+        assert diff.format_diff([], since, 10) == "No changes since 5 minutes ago\n"
+        assert diff.format_diff([], None, 10).startswith("No earlier --diff snapshot, saved 10 containers")
+
+    def test_format_json_diff(self):
+        """
+        Tests dockerprettyps.diff.format_json_diff() gives the changes and when they're since as JSON.
+
+        """
+        change = diff._change("disappeared", {
+            "id": "a", "name": "web", "image": "nginx", "status": "Up 5 seconds", "ports": [], "started": "",
+            "running": True, "host": None})
+        output = json.loads(diff.format_json_diff([change], "2024-01-02T12:00:00"))
+
+        assert output["since"] == "2024-01-02T12:00:00"
+        assert output["total_changes"] == 1
+        assert output["changes"][0]["change"] == "disappeared"
+        assert output["changes"][0]["name"] == "web"
+
+    def test_run_diff(self, tmp_path, monkeypatch, capsys):
+        """
+        Tests dockerprettyps.run() with --diff saves a snapshot on the first run, then shows only what changed since
+        it on the next, as text or JSON.
+
+        """
+        monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+        containers = list(test_ps_data.ps_containers)
+        args = CliArgs()
+        args.all = True
+        args.diff = True
+
+        def fetcher(args):
+            return containers, len(containers), len(containers), []
+
+        dockerprettyps.run(args, fetcher)
+        assert capsys.readouterr().out.startswith("No earlier --diff snapshot, saved %s containers" % len(containers))
+
+        removed = containers.pop(0)
+        dockerprettyps.run(args, fetcher)
+        lines = capsys.readouterr().out.splitlines()
+        assert lines[0].startswith("%s- disappeared%s  %s" % (dockerprettyps.RED, dockerprettyps.ENDC, removed.name))
+        assert lines[-1].startswith("1 change since ")
+
+        args.json = True
+        dockerprettyps.run(args, fetcher)
+        assert json.loads(capsys.readouterr().out)["changes"] == []
+
+        # Each query keeps it's own snapshot.
+        args.search = ["nginx"]
+        dockerprettyps.run(args, fetcher)
+        assert json.loads(capsys.readouterr().out)["since"] is None
+
+# End File docker-pretty-ps/tests/test_diff.py
@@ -2,12 +2,20 @@
 
 """
 from datetime import datetime, timedelta
+import json
 import os
+import time
+
+import pytest
 
 import dockerprettyps
+from dockerprettyps import errors
 
+from .data import docker_api_data
 from .data import docker_ps_data as test_ps_data
 from .data.cli_args import CliArgs
+from .data.fake_docker import install_fake_docker
+from .data.fake_engine import FakeEngine
 
 
 class TestDockerPrettyPs(object):
@@ -42,6 +50,355 @@ class TestDockerPrettyPs(object):
             assert container.get("status_date")
             assert container.get("running")
 
+    def test_iter_clean_output(self):
+        """
+        Tests the dockerprettyps.iter_clean_output() method yields each container as soon as it's line is read.
+
+        """
+        dir_path = os.path.dirname(os.path.realpath(__file__))
+        lines = open(os.path.join(dir_path, "data", "raw_docker_ps.txt"), "r").read().splitlines(True)
+        read = []
+
+        def read_lines():
+            for line in lines:
+                read.append(line)
+                yield line
+
+        containers = dockerprettyps.iter_clean_output(read_lines())
+        first = next(containers)
+        assert first.name == "pihole_pihole_1"
+        assert first.ports[0] == "0.0.0.0:53->53/udp"
+        # Only the header and the first container have been read so far.
+        assert len(read) == 2
+        assert len([first] + list(containers)) == 16
+
+    def test_iter_raw_containers(self, tmp_path, monkeypatch):
+        """
+        Tests the dockerprettyps.iter_raw_containers() method yields docker's output a line at a time, raising
+        BadResponseDockerEngine when docker fails.
+
+        """
+        install_fake_docker(monkeypatch, tmp_path, "CONTAINER ID   IMAGE\nabc   nginx\n")
+        assert list(dockerprettyps.iter_raw_containers()) == ["CONTAINER ID   IMAGE\n", "abc   nginx\n"]
+        assert dockerprettyps.get_raw_containers() == "CONTAINER ID   IMAGE\nabc   nginx\n"
+
+        install_fake_docker(monkeypatch, tmp_path, "Cannot connect to the Docker daemon\n", ps_status=1)
+        with pytest.raises(errors.BadResponseDockerEngine):
+            list(dockerprettyps.iter_raw_containers())
+
+    def test_docker_timeout(self, tmp_path, monkeypatch):
+        """
+        Tests running docker gives up at the timeout, killing anything docker started which is still holding it's
+        output open, for the streamed and the buffered runs.
+
+        """
+        install_fake_docker(monkeypatch, tmp_path, "CONTAINER ID   IMAGE\n", ps_hang=30)
+        start = time.monotonic()
+        lines = []
+        with pytest.raises(errors.EngineTimeout):
+            for line in dockerprettyps.iter_raw_containers(timeout=0.5):
+                lines.append(line)
+        assert lines == ["CONTAINER ID   IMAGE\n"]
+
+        with pytest.raises(errors.EngineTimeout):
+            dockerprettyps._run_docker(["docker", "ps"], timeout=0.5)
+        assert time.monotonic() - start < 5
+
+    def test_iter_containers(self, tmp_path, monkeypatch):
+        """
+        Tests the dockerprettyps.iter_containers() method parses the docker cli's output as it's read, for the text
+        and JSON engines.
+
+        """
+        dir_path = os.path.dirname(os.path.realpath(__file__))
+        args = CliArgs()
+        for engine_name, fixture in [("text", "raw_docker_ps.txt"), ("cli", "json_docker_ps.txt")]:
+            with open(os.path.join(dir_path, "data", fixture), "r") as fixture_file:
+                install_fake_docker(monkeypatch, tmp_path, fixture_file.read())
+            args.engine = engine_name
+            containers = list(dockerprettyps.iter_containers(args))
+            assert containers[0].name == "pihole_pihole_1"
+            assert [c.color for c in containers[:2]] == [dockerprettyps.get_color(0), dockerprettyps.get_color(1)]
+
+    def test_get_containers(self, tmp_path, monkeypatch):
+        """
+        Tests the dockerprettyps.get_containers() method to make sure it reads containers from the engine API socket
+        when one is available.
+
+        """
+        socket_path = str(tmp_path / "docker.sock")
+        monkeypatch.setenv("DOCKER_HOST", "unix://%s" % socket_path)
+        routes = {
+            "/containers/json": docker_api_data.api_containers,
+            "/info": docker_api_data.api_info,
+        }
+        with FakeEngine(socket_path, routes) as fake:
+            args = CliArgs()
+            args.engine = "api"
+            args.all = True
+            containers, total, running = dockerprettyps.get_containers(args)
+            assert len(containers) == 3
+            assert containers[0]["name"] == "some-postgres"
+            assert (total, running) == (3, 2)
+            assert len(fake.requests) == 1
+
+            # Filtered requests are narrowed down by the daemon, and the totals come from /info.
+            args.all = False
+            args.search = ["postgres"]
+            fake.requests = []
+            containers, total, running = dockerprettyps.get_containers(args)
+            assert (total, running) == (5012, 7)
+            assert "filters=" in fake.requests[0]
+            assert fake.requests[1].endswith("/info")
+
+    def test_inspect_containers(self, tmp_path, monkeypatch):
+        """
+        Tests the dockerprettyps.inspect_containers() method to make sure containers get their exact dates from
+        docker inspect, leaving containers which have gone missing as they were.
+
+        """
+        socket_path = str(tmp_path / "docker.sock")
+        monkeypatch.setenv("DOCKER_HOST", "unix://%s" % socket_path)
+        containers = dockerprettyps.clean_api_output(docker_api_data.api_containers)
+        with FakeEngine(socket_path, docker_api_data.api_inspect) as fake:
+            args = CliArgs()
+            args.engine = "api"
+            inspected = dockerprettyps.inspect_containers(args, containers)
+            assert len(fake.requests) == 3
+
+        postgres, bad_actor, sshd = inspected
+        assert postgres.created_date == datetime.fromtimestamp(1534759200.123456)
+        assert postgres.started_date == datetime.fromtimestamp(1546077600.5)
+        assert postgres.status_date == postgres.started_date
+        assert postgres.finished_date is None
+
+        assert sshd.status_date == datetime.fromtimestamp(1547435200)
+        assert sshd.finished_date == sshd.status_date
+
+        assert bad_actor == containers[1]
+        assert containers[0].started_date is None
+
+    def test__parse_raw_inspect(self):
+        """
+        Tests the dockerprettyps._parse_raw_inspect() method reads the batched docker inspect output, skipping errors
+        for containers which have gone missing.
+
+        """
+        output = "\n".join([
+            "42df45bdc8b3d1e1|2018-08-20T10:00:00Z|2018-12-29T10:00:00Z|0001-01-01T00:00:00Z",
+            "Error: No such container: 1a31fcaccf59",
+            "",
+        ])
+        assert dockerprettyps._parse_raw_inspect(output) == {
+            "42df45bdc8b3": ("2018-08-20T10:00:00Z", "2018-12-29T10:00:00Z", "0001-01-01T00:00:00Z")}
+
+    def test_fetch_stats(self, tmp_path, monkeypatch):
+        """
+        Tests the dockerprettyps.fetch_stats() method samples each running container from the engine API, skipping any
+        which stopped since being listed, and that get_containers() adds the stats to their containers.
+
+        """
+        socket_path = str(tmp_path / "docker.sock")
+        monkeypatch.setenv("DOCKER_HOST", "unix://%s" % socket_path)
+        routes = {"/containers/json": docker_api_data.api_containers}
+        routes.update(docker_api_data.api_stats)
+        with FakeEngine(socket_path, routes) as fake:
+            args = CliArgs()
+            args.engine = "api"
+            stats = dockerprettyps.fetch_stats(args)
+            assert list(stats) == ["42df45bdc8b3"]
+            assert stats["42df45bdc8b3"]["cpu"] == "20.00%"
+            assert "status%22%3A+%5B%22running%22%5D" in fake.requests[0]
+            assert len(fake.requests) == 4
+
+            args.all = True
+            args.include = ["u", "e"]
+            containers, total, running = dockerprettyps.get_containers(args)
+            assert containers[0].stats["memory"] == "10MiB / 2GiB"
+            assert containers[1].stats is None
+
+    def test__parse_raw_stats(self):
+        """
+        Tests the dockerprettyps._parse_raw_stats() method reads docker stats JSON lines, keyed by short container ID.
+
+        """
+        output = "\n".join([
+            json.dumps({
+                "BlockIO": "4.1MB / 0B",
+                "CPUPerc": "20.00%",
+                "Container": "42df45bdc8b3",
+                "ID": "42df45bdc8b3",
+                "MemPerc": "0.49%",
+                "MemUsage": "10MiB / 2GiB",
+                "Name": "some-postgres",
+                "NetIO": "1.5kB / 0B",
+                "PIDs": "6"}),
+            "",
+        ])
+        assert dockerprettyps._parse_raw_stats(output) == {
+            "42df45bdc8b3": {
+                "cpu": "20.00%",
+                "memory": "10MiB / 2GiB",
+                "memory_percent": "0.49%",
+                "net": "1.5kB / 0B",
+                "block": "4.1MB / 0B"}}
+
+    def test_clean_api_stats(self):
+        """
+        Tests the dockerprettyps.clean_api_stats() method works out the same values as docker stats prints from the
+        engine API's raw stats.
+
+        """
+        stats = list(docker_api_data.api_stats.values())[0]
+        assert dockerprettyps.clean_api_stats(stats) == {
+            "cpu": "20.00%",
+            "memory": "10MiB / 2GiB",
+            "memory_percent": "0.49%",
+            "net": "1.5kB / 0B",
+            "block": "4.1MB / 0B"}
+
+        # A container's very first sample has nothing to compare with.
+        assert dockerprettyps.clean_api_stats({})["cpu"] == "0.00%"
+
+    def test__human_size(self):
+        """
+        Tests the dockerprettyps._human_size() method formats sizes like Docker does.
+
+        """
+        assert dockerprettyps._human_size(0, 1000, dockerprettyps.DECIMAL_SIZE_UNITS, 3) == "0B"
+        assert dockerprettyps._human_size(1450, 1000, dockerprettyps.DECIMAL_SIZE_UNITS, 3) == "1.45kB"
+        assert dockerprettyps._human_size(11010048, 1024, dockerprettyps.BINARY_SIZE_UNITS, 4) == "10.5MiB"
+        assert dockerprettyps._human_size(2087354106, 1024, dockerprettyps.BINARY_SIZE_UNITS, 4) == "1.944GiB"
+
+    def test__parse_rfc3339_date(self):
+        """
+        Tests the dockerprettyps._parse_rfc3339_date() method reads docker inspect's timestamps into local datetimes.
+
+        """
+        assert dockerprettyps._parse_rfc3339_date("2018-08-20T10:00:00.123456789Z") == \
+            datetime.fromtimestamp(1534759200.123456)
+        assert dockerprettyps._parse_rfc3339_date("2018-08-20T12:00:00+02:00") == datetime.fromtimestamp(1534759200)
+        assert dockerprettyps._parse_rfc3339_date("0001-01-01T00:00:00Z") is None
+        assert dockerprettyps._parse_rfc3339_date("") is None
+
+    def test__engine_filters(self):
+        """
+        Tests the dockerprettyps._engine_filters() method to make sure we ask the daemon for running containers by
+        default, and push search phrases down as name filters.
+
+        """
+        args = CliArgs()
+        assert dockerprettyps._engine_filters(args) == {"status": ["running", "restarting", "paused"]}
+
+        args.all = True
+        assert dockerprettyps._engine_filters(args) == {}
+
+        args.search = ["postgres", "bad"]
+        assert dockerprettyps._engine_filters(args) == {"name": ["postgres", "bad"]}
+
+    def test_clean_json_output(self):
+        """
+        Tests the dockerprettyps.clean_json_output() method to make sure it takes the JSON lines standard out from a
+        'docker ps --format "{{json .}}"' command and translates that into a usable set of docker container data.
+
+        """
+        dir_path = os.path.dirname(os.path.realpath(__file__))
+        data = open(os.path.join(dir_path, "data", "json_docker_ps.txt"), "r").read()
+
+        containers = dockerprettyps.clean_json_output(data)
+        assert isinstance(containers, list)
+        assert len(containers) == 4
+        for container in containers:
+            assert len(container["container_id"]) == 12
+            assert container.get("image")
+            assert container.get("created_date")
+            assert container.get("status_date")
+
+        airflow = containers[1]
+        assert airflow["name"] == "airflow_airflow_web_1"
+        assert airflow["command"] == "/entrypoint.sh airflow  webserver --port  8080"
+        assert airflow["ports"] == []
+        assert airflow["running"]
+        assert containers[0]["ports"][1] == "0.0.0.0:53->53/tcp"
+        assert containers[3]["command"] == "/bin/sh -c 'apk add  bash'"
+        assert not containers[3]["running"]
+
+    def test__parse_docker_date(self):
+        """
+        Tests the dockerprettyps._parse_docker_date() method to make sure we read the docker cli's absolute timestamps
+        into local datetimes.
+
+        """
+        the_date = dockerprettyps._parse_docker_date("2018-08-20 10:00:00 +0000 UTC")
+        assert isinstance(the_date, datetime)
+        assert the_date.tzinfo is None
+        assert the_date == datetime.fromtimestamp(1534759200)
+
+        the_date = dockerprettyps._parse_docker_date("2018-08-20 03:30:00 -0630 MDT")
+        assert the_date == datetime.fromtimestamp(1534759200)
+
+        a_minute_ago = datetime.now() - timedelta(minutes=1)
+        assert dockerprettyps._parse_docker_date("not a date") > a_minute_ago
+        assert dockerprettyps._parse_docker_date("2018-08-20 10:00:00 +00x0 UTC") > a_minute_ago
+        assert dockerprettyps._parse_docker_date("2018-13-20 10:00:00 +0000 UTC") > a_minute_ago
+
+    def test_clean_api_output(self):
+        """
+        Tests the dockerprettyps.clean_api_output() method to make sure it takes the JSON from the engine API and
+        translates it into the same container data clean_output() creates.
+
+        """
+        containers = dockerprettyps.clean_api_output(docker_api_data.api_containers)
+        assert isinstance(containers, list)
+        assert len(containers) == 3
+        postgres = containers[0]
+        assert postgres["container_id"] == "42df45bdc8b3"
+        assert postgres["name"] == "some-postgres"
+        assert postgres["image"] == "postgres:alpine"
+        assert postgres["command"] == "docker-entrypoint.sh postgres"
+        assert postgres["created"].endswith(" ago")
+        assert postgres["created_date"] == datetime.fromtimestamp(1547521600)
+        assert postgres["status"] == "Up 3 weeks"
+        assert postgres["running"]
+        assert postgres["ports"] == ["10.138.44.203:5432->5432/tcp"]
+        assert postgres["color"]
+        assert not containers[2]["running"]
+
+    def test__parse_api_ports(self):
+        """
+        Tests the dockerprettyps._parse_api_ports() method to make sure engine API ports are formatted like the cli.
+
+        """
+        ports = dockerprettyps._parse_api_ports(docker_api_data.api_containers[1]["Ports"])
+        assert ports == ["80/tcp", "0.0.0.0:8443->443/tcp"]
+        assert dockerprettyps._parse_api_ports([]) == []
+
+    def test__humanize_duration(self):
+        """
+        Tests the dockerprettyps._humanize_duration() method to make sure durations read like the docker cli's.
+
+        """
+        assert dockerprettyps._humanize_duration(0) == "Less than a second"
+        assert dockerprettyps._humanize_duration(1) == "1 second"
+        assert dockerprettyps._humanize_duration(30) == "30 seconds"
+        assert dockerprettyps._humanize_duration(61) == "About a minute"
+        assert dockerprettyps._humanize_duration(60 * 12) == "12 minutes"
+        assert dockerprettyps._humanize_duration(60 * 65) == "About an hour"
+        assert dockerprettyps._humanize_duration(3600 * 20) == "20 hours"
+        assert dockerprettyps._humanize_duration(86400 * 5) == "5 days"
+        assert dockerprettyps._humanize_duration(86400 * 21) == "3 weeks"
+        assert dockerprettyps._humanize_duration(86400 * 150) == "5 months"
+        assert dockerprettyps._humanize_duration(86400 * 365 * 3) == "3 years"
+
+    def test__docker_cmd(self):
+        """
+        Tests the dockerprettyps._docker_cmd() method points the docker cli at hosts and contexts.
+
+        """
+        assert dockerprettyps._docker_cmd() == ["docker"]
+        assert dockerprettyps._docker_cmd("ssh://build-01") == ["docker", "--host", "ssh://build-01"]
+        assert dockerprettyps._docker_cmd("build-01") == ["docker", "--context", "build-01"]
+
     def test__parse_ports(self):
         """
         Tests the dockerprettyps._parse_ports() method ensure that we break apart ports properly as a trimmed list.
@@ -80,6 +437,30 @@ class TestDockerPrettyPs(object):
         assert the_date_days < datetime.now()
         assert the_date_days > datetime.now() - timedelta(days=6)
 
+        # Every one of Docker's humanized units, counted back from a single reference time.
+        now = datetime(2019, 1, 19, 3, 6, 40)
+        cases = {
+            "Up Less than a second": timedelta(0),
+            "Up 1 second": timedelta(seconds=1),
+            "Up About a minute": timedelta(minutes=1),
+            "Up About an hour (healthy)": timedelta(hours=1),
+            "Up 20 hours (health: starting)": timedelta(hours=20),
+            "Up 3 weeks (unhealthy)": timedelta(weeks=3),
+            "Up 2 hours (Paused)": timedelta(hours=2),
+            "Exited (0) 5 months ago": timedelta(days=150),
+            "Exited (137) 2 years ago": timedelta(days=730),
+            "Restarting (1) 11 seconds ago": timedelta(seconds=11),
+            "Created": timedelta(0),
+        }
+        for val, offset in cases.items():
+            assert dockerprettyps._parse_ps_date(val, now) == now - offset
+
+        # Repeated strings are served from the memo.
+        dockerprettyps._ps_date_offset.cache_clear()
+        dockerprettyps._parse_ps_date("Up 4 days", now)
+        dockerprettyps._parse_ps_date("Up 4 days", now)
+        assert dockerprettyps._ps_date_offset.cache_info().hits == 1
+
     def test__clean_status(self):
         """
         Tests the dockerprettyps._clean_status() method to see if a the output from a container signifies if the
@@ -98,13 +479,16 @@ class TestDockerPrettyPs(object):
         containers = test_ps_data.ps_containers
         colorless_containers = []
         for c in containers:
-            c.pop('color')
-            colorless_containers.append(c)
+            colorless_containers.append(c.replace(color=""))
 
         color_containers = dockerprettyps.get_container_colors(colorless_containers)
         for c in color_containers:
-            assert 'color' in c
-            assert isinstance(c['color'], str)
+            assert c.color
+            assert isinstance(c.color, str)
+
+        # The containers passed in are left untouched.
+        for c in colorless_containers:
+            assert c.color == ""
 
     def test_get_color(self):
         """
@@ -113,6 +497,10 @@ class TestDockerPrettyPs(object):
         """
         assert dockerprettyps.get_color(1) == "\033[94m"
         assert dockerprettyps.get_color(200) == "\033[92m"
+        assert dockerprettyps.get_color(0) == "\033[95m"
+        assert dockerprettyps.get_color(6) == "\033[95m"
+        assert dockerprettyps.get_color(7) == "\033[94m"
+        assert dockerprettyps.get_color(10 ** 9) == "\033[96m"
 
     def test__get_num_running_containers(self):
         """
@@ -147,6 +535,27 @@ class TestDockerPrettyPs(object):
         filtered = dockerprettyps.filter_containers(test_ps_data.ps_containers, args)
         assert len(filtered) == 6
 
+        args.where = "image~alpine-sshd"
+        filtered = dockerprettyps.filter_containers(test_ps_data.ps_containers, args)
+        assert [c.name for c in filtered] == ["alpine-sshd", "alpine-sshd2"]
+
+        args.all = False
+        args.search = ["sshd", "postgres"]
+        filtered = dockerprettyps.filter_containers(test_ps_data.ps_containers, args)
+        assert [c.name for c in filtered] == ["alpine-sshd"]
+
+    def test_iter_filter_containers(self):
+        """
+        Tests the dockerprettyps.iter_filter_containers() method yields containers in their original order as they
+        pass the filters.
+
+        """
+        args = CliArgs()
+        args.search = ["alpine", "nginx"]
+        filtered = dockerprettyps.iter_filter_containers(iter(test_ps_data.ps_containers), args)
+        assert next(filtered).name == "nginx-proxy"
+        assert [c.name for c in filtered] == ["alpine-sshd"]
+
     def test_order_containers(self):
         """
         Tests the dockerprettyps.order_containers() method to make sure we order containers as you would expect.
@@ -156,6 +565,8 @@ class TestDockerPrettyPs(object):
         self.order_containers_reverse()
         self.order_containers_by_name()
         self.order_containers_by_create_date()
+        self.order_containers_limited()
+        self.order_containers_multi_key()
 
     def order_containers_standard(self):
         """
@@ -203,6 +614,53 @@ class TestDockerPrettyPs(object):
             position_last_date = reverse_order[len(ordered) - 1]["created_date"]
             assert position_first_date > position_last_date
 
+    def order_containers_limited(self):
+        """
+        Tests that dockerprettyps.order_containers() with a limit and offset picks out the same containers as a full
+        ordering would.
+
+        """
+        for order in ["", "name", "created"]:
+            for reverse in [False, True]:
+                args = CliArgs()
+                args.order = order
+                args.reverse = reverse
+                full_order = dockerprettyps.order_containers(test_ps_data.ps_containers, args)
+                for limit, offset in [(0, 0), (2, 0), (2, 3), (4, 4), (10, 0)]:
+                    args.limit = limit
+                    args.offset = offset
+                    ordered = dockerprettyps.order_containers(test_ps_data.ps_containers, args)
+                    assert ordered == full_order[offset:offset + limit]
+
+        args = CliArgs()
+        args.offset = 4
+        assert len(dockerprettyps.order_containers(test_ps_data.ps_containers, args)) == 2
+
+    def order_containers_multi_key(self):
+        """
+        Tests that dockerprettyps.order_containers() orders by several keys, each in it's own direction.
+
+        """
+        containers = [
+            test_ps_data.ps_containers[5],
+            test_ps_data.ps_containers[3].replace(status="Up 3 weeks (unhealthy)"),
+            test_ps_data.ps_containers[2],
+            test_ps_data.ps_containers[4].replace(status="Up 4 months (healthy)")]
+
+        args = CliArgs()
+        args.order = "running,-created,name"
+        ordered = dockerprettyps.order_containers(containers, args)
+        assert [c.name for c in ordered] == ["alpine-sshd", "nginx-proxy", "some-postgres", "alpine-sshd2"]
+
+        args.order = "health,-ports,-name"
+        ordered = dockerprettyps.order_containers(containers, args)
+        assert [c.name for c in ordered] == ["some-postgres", "alpine-sshd", "nginx-proxy", "alpine-sshd2"]
+
+        args.order = "image,-name"
+        args.reverse = True
+        ordered = dockerprettyps.order_containers(containers, args)
+        assert [c.name for c in ordered] == ["some-postgres", "nginx-proxy", "alpine-sshd", "alpine-sshd2"]
+
     def order_containers_by_name(self):
         """
         Tests that dockerprettyps.order_containers() will order containers by name.
@@ -233,6 +691,46 @@ class TestDockerPrettyPs(object):
             assert position_first_name == "alpine-sshd"
             assert position_last_name == "some-postgres"
 
+    def test_parse_order(self):
+        """
+        Tests the dockerprettyps.parse_order() method reads the keys and directions of an --order value.
+
+        """
+        assert dockerprettyps.parse_order("") == (("status", False),)
+        assert dockerprettyps.parse_order("container") == (("name", False),)
+        assert dockerprettyps.parse_order("running, -created,name") == (
+            ("running", False), ("created", True), ("name", False))
+        assert dockerprettyps.parse_order("running:asc,created:desc,name") == (
+            ("running", False), ("created", True), ("name", False))
+
+        with pytest.raises(errors.InvalidOrder):
+            dockerprettyps.parse_order("running,size")
+        with pytest.raises(errors.InvalidOrder):
+            dockerprettyps.parse_order("created:down")
+
+    def test__parsed_args_order(self):
+        """
+        Tests the dockerprettyps._parsed_args() method reads descending --order keys, given with a :desc suffix or a -
+        prefix after an =.
+
+        """
+        for argv in [["-o", "created:desc"], ["--order", "created:desc"], ["-o=-created"], ["--order=-created"]]:
+            args = dockerprettyps._parsed_args(argv)
+            assert dockerprettyps.parse_order(args.order) == (("created", True),)
+
+    def test_order_key(self):
+        """
+        Tests the dockerprettyps.order_key() method creates one sort key per container, covering every key.
+
+        """
+        container = test_ps_data.ps_containers[2]
+        key = dockerprettyps.order_key((("name", False),))
+        assert key(container) == "nginx-proxy"
+
+        key = dockerprettyps.order_key((("running", False), ("ports", True), ("name", True)))
+        assert key(container)[:2] == (0, -2)
+        assert key(container) < key(container.replace(name="alpine-sshd"))
+
     def test_print_format(self):
         """
         Tests the dockerprettyps.print_format() method, primarily checking that the method doesnt fail, since it mostly
@@ -241,6 +739,182 @@ class TestDockerPrettyPs(object):
         """
         assert dockerprettyps.print_format(test_ps_data.ps_containers, 6, 5, CliArgs())
 
+    def test_format_output(self):
+        """
+        Tests the dockerprettyps.format_output() method builds the whole output, header, containers and footer, as one
+        string.
+
+        """
+        output = dockerprettyps.format_output(test_ps_data.ps_containers, 6, 5, CliArgs())
+        assert output.startswith("All currently running docker containers\n\n")
+        assert output.endswith("Total containers:\t6\nTotal running:\t\t5\n")
+        assert "some-postgres" in output
+
+    def test_pretty_fmt_container_lines(self):
+        """
+        Tests the dockerprettyps.pretty_fmt_container_lines() method lines up every container's values in one column.
+
+        """
+        args = CliArgs()
+        args.include = ["n", "p"]
+        lines = dockerprettyps.pretty_fmt_container_lines(test_ps_data.ps_containers, args)
+        assert len(lines) == 6 * 4 + 1
+        value_columns = set()
+        for line in lines:
+            if "Container ID:" in line:
+                value_columns.add(line.index(dockerprettyps.ENDC) + len(dockerprettyps.ENDC))
+        assert len(value_columns) == 1
+
+    def test_table_lines(self):
+        """
+        Tests the dockerprettyps.table_lines() method creates a title row and one row per container, with every
+        column lined up, and fits the rows to a max width.
+
+        """
+        args = CliArgs()
+        args.include = ["n", "p"]
+        lines = dockerprettyps.table_lines(test_ps_data.ps_containers, args)
+        assert len(lines) == 7
+        assert "NAME" in lines[0]
+        assert "CONTAINER ID" in lines[0]
+        id_column = lines[0].index("CONTAINER ID")
+        plain_row = lines[3].replace(test_ps_data.ps_containers[2].color, "").replace(dockerprettyps.ENDC, "")
+        assert plain_row.startswith("nginx-proxy ")
+        assert plain_row.index("d4129f2a0d3b") == id_column - len(dockerprettyps.BOLD)
+        assert plain_row.endswith("0.0.0.0:80->80/tcp, 0.0.0.0:443->443/tcp")
+
+        lines = dockerprettyps.table_lines(test_ps_data.ps_containers, args, max_width=50)
+        for line in lines[1:]:
+            plain_row = line
+            for container in test_ps_data.ps_containers:
+                plain_row = plain_row.replace(container.color, "")
+            assert len(plain_row.replace(dockerprettyps.ENDC, "")) <= 50
+        assert lines[3].endswith("d4129~")
+
+    def test_format_table(self):
+        """
+        Tests the dockerprettyps.format_table() method builds the whole table output, header, table and footer, as one
+        string.
+
+        """
+        output = dockerprettyps.format_table(test_ps_data.ps_containers, 6, 5, CliArgs(), max_width=80)
+        lines = output.splitlines()
+        assert lines[0] == "All currently running docker containers"
+        assert "NAME" in lines[2]
+        assert len(lines) == 2 + 7 + 3
+
+    def test_table_columns(self):
+        """
+        Tests the dockerprettyps.table_columns() method picks columns from the includes, only showing state with
+        --all and host when there are many hosts.
+
+        """
+        args = CliArgs()
+        columns = dockerprettyps.table_columns(test_ps_data.ps_containers, args)
+        assert [letter for letter, title in columns] == ["name", "n", "i", "m", "c", "s", "p"]
+
+        args.all = True
+        args.slim = True
+        assert dockerprettyps.table_columns(test_ps_data.ps_containers, args) == [("name", "NAME")]
+
+        args.slim = False
+        args.include = ["r"]
+        containers = [test_ps_data.ps_containers[0].replace(host="ssh://a")]
+        columns = dockerprettyps.table_columns(containers, args)
+        assert columns == [("name", "NAME"), ("host", "HOST"), ("r", "STATE")]
+
+    def test_table_cell(self):
+        """
+        Tests the dockerprettyps.table_cell() method gets the plain text value for each column.
+
+        """
+        container = test_ps_data.ps_containers[2]
+        assert dockerprettyps.table_cell(container, "name") == "nginx-proxy"
+        assert dockerprettyps.table_cell(container, "n") == "d4129f2a0d3b"
+        assert dockerprettyps.table_cell(container, "r") == "[ON]"
+        assert dockerprettyps.table_cell(container, "p") == "0.0.0.0:80->80/tcp, 0.0.0.0:443->443/tcp"
+        assert dockerprettyps.table_cell(container, "host") == ""
+
+    def test__fit_table_widths(self):
+        """
+        Tests the dockerprettyps._fit_table_widths() method shrinks columns from the right to fit a max width.
+
+        """
+        assert dockerprettyps._fit_table_widths([10, 10, 10]) == [10, 10, 10]
+        assert dockerprettyps._fit_table_widths([10, 10, 10], 34) == [10, 10, 10]
+        assert dockerprettyps._fit_table_widths([10, 10, 10], 30) == [10, 10, 6]
+        assert dockerprettyps._fit_table_widths([10, 10, 10], 25) == [10, 10, 0]
+        assert dockerprettyps._fit_table_widths([10, 10, 10], 8) == [8, 0, 0]
+
+    def test_get_col_width(self):
+        """
+        Tests the dockerprettyps.get_col_width() method finds the longest label being displayed.
+
+        """
+        contents = [
+            {"display_name": "a", "data": [["\tStatus:", "Up"], ["", "80/tcp"]]},
+            {"display_name": "b", "data": [["\tContainer ID:", "1a31fcaccf59"]]},
+            {"display_name": "c", "data": []},
+        ]
+        assert dockerprettyps.get_col_width(contents) == len("\tContainer ID:")
+        assert dockerprettyps.get_col_width([]) == 0
+
+    def test_container_lines(self):
+        """
+        Tests the dockerprettyps.container_lines() method lays out a container's block, with continuation rows lined
+        up under the values.
+
+        """
+        content = {"display_name": "web", "data": [["\tPorts:", "80/tcp"], ["", "443/tcp"]]}
+        assert dockerprettyps.container_lines(content, 10) == [
+            "web",
+            "\tPorts:    80/tcp",
+            "          443/tcp",
+            ""]
+        assert dockerprettyps.container_lines({"display_name": "web", "data": []}) == ["web"]
+
+    def test_header_lines(self):
+        """
+        Tests the dockerprettyps.header_lines() method describes what is being displayed.
+
+        """
+        assert dockerprettyps.header_lines(CliArgs()) == ["All currently running docker containers", ""]
+        args = CliArgs()
+        args.all = True
+        assert dockerprettyps.header_lines(args) == ["All docker containers", ""]
+        args.all = False
+        args.search = ["web", "db"]
+        assert dockerprettyps.header_lines(args)[0] == 'Currently running containers with: "web", "db" '
+
+    def test_get_selected_includes(self):
+        """
+        Tests the dockerprettyps.get_selected_includes() method, defaulting to everything unless slim or includes
+        are asked for.
+
+        """
+        assert dockerprettyps.get_selected_includes(CliArgs()) == ["r", "s", "c", "p", "n", "i", "m"]
+        args = CliArgs()
+        args.slim = True
+        assert dockerprettyps.get_selected_includes(args) == []
+        args.include = ["c", "p"]
+        assert dockerprettyps.get_selected_includes(args) == ["c", "p"]
+
+    def test_footer_lines(self):
+        """
+        Tests the dockerprettyps.footer_lines() method, making sure we report totals and any unreachable hosts.
+
+        """
+        lines = dockerprettyps.footer_lines(5, 6, 5, CliArgs())
+        assert lines == ["", "Total containers:\t6", "Total running:\t\t5"]
+
+        lines = dockerprettyps.footer_lines(5, 6, 5, CliArgs(), [("build-01", "timed out")])
+        assert lines[-1] == dockerprettyps.RED + "Unreachable hosts:" + dockerprettyps.ENDC + "\tbuild-01 (timed out)"
+
+        args = CliArgs()
+        args.search = ["sshd"]
+        lines = dockerprettyps.footer_lines(1, 6, 5, args, num_matched=2)
+        assert lines[-2:] == ["Containers in search:\t2", "Showing:\t\t1 of 2"]
+
     def test_container_display_name(self):
         """
         Tests the dockerprettyps.container_display_name() method to see if we create the right console formatting for a
@@ -317,6 +991,22 @@ class TestDockerPrettyPs(object):
         assert dockerprettyps._handle_column_ports(args, test_container, selected_args) == \
             [['\x1b[1m\tPorts:\x1b[0m', '10.138.44.203:5432->5432/tcp']]
 
+    def test__handle_column_stats(self):
+        """
+        Tests the dockerprettyps._handle_column_stats() method picks the included resource usage rows, left blank for
+        containers without stats.
+
+        """
+        stats = {"cpu": "20.00%", "memory": "10MiB / 2GiB", "memory_percent": "0.49%", "net": "1.5kB / 0B",
+                 "block": "4.1MB / 0B"}
+        container = test_ps_data.ps_containers[3].replace(stats=stats)
+        rows = dockerprettyps._handle_column_stats(container, ["u", "e", "t", "b"])
+        assert [row[1] for row in rows] == ["20.00%", "10MiB / 2GiB (0.49%)", "1.5kB / 0B", "4.1MB / 0B"]
+
+        rows = dockerprettyps._handle_column_stats(test_ps_data.ps_containers[3], ["c", "e"])
+        assert rows == [[dockerprettyps.BOLD + "\tMemory:" + dockerprettyps.ENDC, ""]]
+        assert dockerprettyps._handle_column_stats(container, ["c", "p"]) == []
+
     def test__handle_column_created(self):
         """
         Tests the dockerprettyps._handle_column_created() method, to make sure we convert the shell output to a format
@@ -347,6 +1037,73 @@ class TestDockerPrettyPs(object):
         the_json = dockerprettyps.give_json(containers, CliArgs())
         assert the_json
 
+    def test_format_json(self):
+        """
+        Tests the dockerprettyps.format_json() method creates the JSON document of the containers.
+
+        """
+        the_json = json.loads(dockerprettyps.format_json(test_ps_data.ps_containers))
+        assert the_json["total_containers"] == 6
+        assert the_json["containers"][3]["name"] == "some-postgres"
+        assert "color" not in the_json["containers"][3]
+
+    def test_give_ndjson(self, capsys):
+        """
+        Tests the dockerprettyps.give_ndjson() method writes one compact JSON object per container line, followed by a
+        summary line.
+
+        """
+        containers = test_ps_data.ps_containers
+        assert dockerprettyps.give_ndjson(iter(containers), 6, 5, CliArgs())
+        lines = capsys.readouterr().out.splitlines()
+        assert len(lines) == 7
+        assert " " not in lines[0].split('"command"')[0]
+        assert json.loads(lines[0])["name"] == containers[0].name
+        assert json.loads(lines[-1]) == {
+            "summary": {"containers": 6, "total_containers": 6, "total_running_containers": 5}}
+
+    def test_stream_ndjson(self, tmp_path, monkeypatch, capsys):
+        """
+        Tests the dockerprettyps.stream_ndjson() method writes containers straight from docker, counting the totals as
+        they pass when it reads every container, and asking docker for them when it doesn't.
+
+        """
+        dir_path = os.path.dirname(os.path.realpath(__file__))
+        with open(os.path.join(dir_path, "data", "raw_docker_ps.txt"), "r") as raw_file:
+            install_fake_docker(monkeypatch, tmp_path, raw_file.read(), info="20 9 1")
+        args = CliArgs()
+        args.engine = "text"
+        args.ndjson = True
+        args.all = True
+        assert dockerprettyps._streams(args)
+
+        dockerprettyps.stream_ndjson(args)
+        lines = capsys.readouterr().out.splitlines()
+        assert len(lines) == 17
+        assert json.loads(lines[0])["name"] == "pihole_pihole_1"
+        assert json.loads(lines[-1])["summary"]["total_containers"] == 16
+
+        args.limit = 2
+        dockerprettyps.stream_ndjson(args)
+        lines = capsys.readouterr().out.splitlines()
+        assert len(lines) == 3
+        assert json.loads(lines[-1]) == {
+            "summary": {"containers": 2, "total_containers": 20, "total_running_containers": 10}}
+
+        args.order = "name"
+        assert not dockerprettyps._streams(args)
+
+    def test__json_container(self):
+        """
+        Tests the dockerprettyps._json_container() method, making a JSON friendly dict of a container.
+
+        """
+        container = dockerprettyps._json_container(test_ps_data.ps_containers[0])
+        assert isinstance(container["status_date"], str)
+        assert "color" not in container
+        assert "host" not in container
+        assert json.dumps(container)
+
     def test__json_container_dates(self):
         """
         Tests the dockerprettyps._json_container_dates() method, to ensure that we convert python datetimes to json
@@ -356,6 +1113,12 @@ class TestDockerPrettyPs(object):
         containers = test_ps_data.ps_containers
         json_dated_containers = dockerprettyps._json_container_dates(containers)
         for container in json_dated_containers:
+            assert isinstance(container, dict)
             assert isinstance(container["status_date"], str)
+            assert isinstance(container["created_date"], str)
+
+        # The containers passed in are left untouched.
+        for container in containers:
+            assert isinstance(container.status_date, datetime)
 
 # End File docker-pretty-ps/tests/test_dockerprettyps.py
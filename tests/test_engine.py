@@ -0,0 +1,88 @@
+"""Unit Tests for docker-pretty-ps engine API client
+
+"""
+import os
+
+import pytest
+
+from dockerprettyps import engine
+from dockerprettyps import errors
+
+from .data import docker_api_data
+from .data.fake_engine import FakeEngine
+
+
+class TestEngine(object):
+
+    def test_containers(self, tmp_path):
+        """
+        Tests the dockerprettyps.engine.EngineClient.containers() method against a fake engine socket, making sure we
+        request all containers and decode the JSON response.
+
+        """
+        socket_path = str(tmp_path / "docker.sock")
+        with FakeEngine(socket_path, {"/containers/json": docker_api_data.api_containers}) as fake:
+            client = engine.EngineClient(socket_path)
+            containers = client.containers()
+            assert containers == docker_api_data.api_containers
+            assert fake.requests == ["/%s/containers/json?all=1" % engine.API_VERSION]
+
+    def test_get_bad_response(self, tmp_path):
+        """
+        Tests that dockerprettyps.engine.EngineClient.get() raises BadResponseDockerEngine on a non 200 response.
+
+        """
+        socket_path = str(tmp_path / "docker.sock")
+        with FakeEngine(socket_path, {}):
+            client = engine.EngineClient(socket_path)
+            with pytest.raises(errors.BadResponseDockerEngine):
+                client.get("/nothing-here")
+
+    def test_get_unavailable(self, tmp_path):
+        """
+        Tests that dockerprettyps.engine.EngineClient.get() raises EngineUnavailable when there is no socket.
+
+        """
+        client = engine.EngineClient(str(tmp_path / "missing.sock"))
+        with pytest.raises(errors.EngineUnavailable):
+            client.containers()
+
+    def test_from_host(self, monkeypatch):
+        """
+        Tests the dockerprettyps.engine.EngineClient.from_host() method, making clients for unix and plain tcp hosts
+        and refusing hosts only the docker cli can talk to.
+
+        """
+        monkeypatch.delenv("DOCKER_HOST", raising=False)
+        monkeypatch.delenv("DOCKER_TLS_VERIFY", raising=False)
+        assert engine.EngineClient.from_host().socket_path == engine.DEFAULT_SOCKET
+        assert engine.EngineClient.from_host("unix:///tmp/docker.sock").socket_path == "/tmp/docker.sock"
+
+        client = engine.EngineClient.from_host("tcp://10.0.0.1:2375", timeout=3)
+        assert client.address == "10.0.0.1:2375"
+        assert client.timeout == 3
+
+        with pytest.raises(errors.EngineUnavailable):
+            engine.EngineClient.from_host("ssh://user@build-01")
+        with pytest.raises(errors.EngineUnavailable):
+            engine.EngineClient.from_host("build-01-context")
+
+        monkeypatch.setenv("DOCKER_TLS_VERIFY", "1")
+        with pytest.raises(errors.EngineUnavailable):
+            engine.EngineClient.from_host("tcp://10.0.0.1:2376")
+
+    def test_socket_path_from_env(self, monkeypatch):
+        """
+        Tests the dockerprettyps.engine.socket_path_from_env() method, respecting unix:// DOCKER_HOST values.
+
+        """
+        monkeypatch.delenv("DOCKER_HOST", raising=False)
+        assert engine.socket_path_from_env() == engine.DEFAULT_SOCKET
+
+        monkeypatch.setenv("DOCKER_HOST", "unix:///tmp/docker.sock")
+        assert engine.socket_path_from_env() == os.path.join("/tmp", "docker.sock")
+
+        monkeypatch.setenv("DOCKER_HOST", "tcp://10.0.0.1:2375")
+        assert engine.socket_path_from_env() is None
+
+# End File docker-pretty-ps/tests/test_engine.py
@@ -0,0 +1,63 @@
+"""Unit Tests for docker-pretty-ps multi host fan out
+
+"""
+import socket
+
+from dockerprettyps import errors
+from dockerprettyps import hosts
+
+from .data import docker_api_data
+from .data.cli_args import CliArgs
+from .data.fake_engine import FakeEngine
+
+
+class TestHosts(object):
+
+    def test_fetch_hosts(self, tmp_path):
+        """
+        Tests the dockerprettyps.hosts.fetch_hosts() method, merging containers from many hosts and reporting the
+        hosts which are dead or too slow without them holding up the others.
+
+        """
+        host_a = str(tmp_path / "a.sock")
+        host_b = str(tmp_path / "b.sock")
+        slow_host = str(tmp_path / "slow.sock")
+        routes = {"/containers/json": docker_api_data.api_containers}
+
+        # A socket which accepts connections but never answers.
+        slow = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        slow.bind(slow_host)
+        slow.listen(5)
+
+        args = CliArgs()
+        args.all = True
+        args.engine = "api"
+        args.timeout = 0.2
+        args.hosts = [
+            "unix://%s" % host_a,
+            "unix://%s" % slow_host,
+            "unix://%s" % str(tmp_path / "dead.sock"),
+            "unix://%s" % host_b,
+        ]
+        try:
+            with FakeEngine(host_a, routes), FakeEngine(host_b, routes):
+                containers, total, running, unreachable = hosts.fetch_hosts(args)
+        finally:
+            slow.close()
+
+        assert len(containers) == 6
+        assert (total, running) == (6, 4)
+        assert [c["host"] for c in containers[:4]] == [args.hosts[0]] * 3 + [args.hosts[3]]
+        assert unreachable == [(args.hosts[1], "timed out"), (args.hosts[2], "unavailable")]
+
+    def test__unreachable_reason(self):
+        """
+        Tests the dockerprettyps.hosts._unreachable_reason() method gives short reasons for the footer.
+
+        """
+        assert hosts._unreachable_reason(errors.EngineTimeout()) == "timed out"
+        assert hosts._unreachable_reason(errors.BadResponseDockerEngine()) == "bad response"
+        assert hosts._unreachable_reason(FileNotFoundError()) == "docker cli not found"
+        assert hosts._unreachable_reason(ValueError("nope")) == "nope"
+
+# End File docker-pretty-ps/tests/test_hosts.py
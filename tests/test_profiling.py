@@ -0,0 +1,149 @@
+"""Unit Tests for docker-pretty-ps --profile
+
+"""
+import json
+import pstats
+
+import dockerprettyps
+from dockerprettyps import profiling
+
+from benchmarks import fixtures
+from .data import docker_api_data
+from .data.cli_args import CliArgs
+from .data.fake_docker import install_fake_docker
+from .data.fake_engine import FakeEngine
+
+
+class TestProfiling(object):
+
+    def test_stage(self):
+        """
+        Tests dockerprettyps.profiling.Profiler.stage() totals each stage's time and calls, noting how deeply nested
+        it ran.
+
+        """
+        profiler = profiling.Profiler()
+        with profiler.stage("fetch"):
+            with profiler.stage("parse"):
+                pass
+            with profiler.stage("parse"):
+                pass
+        profiler.count("rows_parsed", 10)
+        profiler.count("rows_parsed", 5)
+
+        assert list(profiler.stages) == ["fetch", "parse"]
+        assert profiler.stages["fetch"][1:] == [1, 0]
+        assert profiler.stages["parse"][1:] == [2, 1]
+        assert profiler.stages["fetch"][0] >= profiler.stages["parse"][0]
+        assert profiler.counters == {"rows_parsed": 15}
+
+        timed = profiler.timed("dates", len)
+        assert timed("abc") == 3
+        assert profiler.stages["dates"][1:] == [1, 0]
+
+    def test_as_dict(self):
+        """
+        Tests dockerprettyps.profiling.Profiler.as_dict() gives the stages in the order they started, with the
+        counters.
+
+        """
+        profiler = profiling.Profiler()
+        with profiler.stage("render"):
+            pass
+        profiler.count("bytes_written", 120)
+        profiler.finish()
+
+        profile = profiler.as_dict()
+        assert profile["total_seconds"] >= 0
+        assert [stage["name"] for stage in profile["stages"]] == ["render"]
+        assert profile["stages"][0]["calls"] == 1
+        assert profile["counters"] == {"bytes_written": 120}
+
+    def test_report(self):
+        """
+        Tests dockerprettyps.profiling.Profiler.report() indents nested stages under the stages they ran in.
+
+        """
+        profiler = profiling.Profiler()
+        with profiler.stage("fetch"):
+            with profiler.stage("docker"):
+                pass
+        profiler.count("rows_parsed", 3)
+
+        lines = profiler.report().splitlines()
+        assert lines[0] == "Profile:"
+        assert lines[1].startswith("    fetch ")
+        assert lines[1].endswith("1 call")
+        assert lines[2].startswith("        docker ")
+        assert lines[3].startswith("    total ")
+        assert lines[4].split() == ["rows_parsed", "3"]
+
+    def test_inactive(self):
+        """
+        Tests the dockerprettyps.profiling module functions do nothing without an active profiler.
+
+        """
+        assert profiling.stage("parse") is profiling.NULL_STAGE
+        with profiling.stage("parse"):
+            profiling.count("rows_parsed")
+        assert profiling.timed("dates", len) is len
+
+    def test_run_profile(self, tmp_path, monkeypatch, capsys):
+        """
+        Tests dockerprettyps.run() with --profile writes the breakdown of the run's stages to stderr, as text, JSON
+        and a cProfile dump.
+
+        """
+        docker_socket = str(tmp_path / "docker.sock")
+        monkeypatch.setenv("DOCKER_HOST", "unix://%s" % docker_socket)
+        routes = {"/containers/json": docker_api_data.api_containers}
+        args = CliArgs()
+        args.all = True
+        args.engine = "api"
+
+        with FakeEngine(docker_socket, routes):
+            args.profile = True
+            dockerprettyps.run(args)
+            captured = capsys.readouterr()
+            assert "some-postgres" in captured.out
+            assert captured.err.startswith("Profile:\n")
+            for stage in ["fetch", "engine", "parse", "filter", "order", "render", "write", "bytes_read"]:
+                assert "    %s " % stage in captured.err
+
+            args.profile = False
+            args.profile_json = True
+            args.profile_dump = str(tmp_path / "run.prof")
+            dockerprettyps.run(args)
+            profile = json.loads(capsys.readouterr().err)
+            assert profile["counters"]["rows_parsed"] == len(docker_api_data.api_containers)
+            assert profile["counters"]["rows_shown"] == len(docker_api_data.api_containers)
+            assert pstats.Stats(args.profile_dump).total_calls > 0
+
+        assert profiling.stage("parse") is profiling.NULL_STAGE
+
+    def test_run_profile_cli(self, tmp_path, monkeypatch, capsys):
+        """
+        Tests dockerprettyps.run() with --profile splits the streamed docker cli's output into the time reading from
+        docker and the time parsing it, for the text and the JSON output.
+
+        """
+        bin_dir = tmp_path / "bin"
+        bin_dir.mkdir()
+        args = CliArgs()
+        args.all = True
+        args.profile_json = True
+
+        outputs = [("text", fixtures.generate_ps_output(20)), ("cli", fixtures.generate_json_output(20))]
+        for engine, ps_output in outputs:
+            install_fake_docker(monkeypatch, bin_dir, ps_output, info="20 10 0")
+            args.engine = engine
+            dockerprettyps.run(args)
+            profile = json.loads(capsys.readouterr().err)
+            stages = {stage["name"]: stage for stage in profile["stages"]}
+            assert stages["docker"]["calls"] > 20
+            assert stages["parse"]["calls"] == 20
+            assert stages["docker"]["depth"] == stages["parse"]["depth"] == stages["containers"]["depth"] + 1
+            assert stages["dates"]["depth"] == stages["parse"]["depth"] + 1
+            assert profile["counters"]["rows_parsed"] == 20
+
+# End File docker-pretty-ps/tests/test_profiling.py
@@ -0,0 +1,103 @@
+"""Unit Tests for the docker-pretty-ps library API
+
+"""
+import json
+
+import pytest
+
+from dockerprettyps import ContainerQuery
+from dockerprettyps import errors
+
+from .data import docker_api_data
+from .data import docker_ps_data as test_ps_data
+from .data.cli_args import CliArgs
+from .data.fake_engine import FakeEngine
+
+SNAPSHOT = (test_ps_data.ps_containers, 6, 5, [])
+
+
+class TestQuery(object):
+
+    def test_options(self):
+        """
+        Tests dockerprettyps.query.ContainerQuery takes options like the CLI's, checking them up front.
+
+        """
+        query = ContainerQuery(search="post,sshd", include="nc", hosts="build-01, build-02")
+        assert query.options.search == ["post", "sshd"]
+        assert query.options.include == ["n", "c"]
+        assert query.options.hosts == ["build-01", "build-02"]
+        assert query.options.order == ""
+
+        with pytest.raises(TypeError):
+            ContainerQuery(colour=True)
+        with pytest.raises(errors.InvalidWhere):
+            ContainerQuery(where="size>2")
+        with pytest.raises(errors.InvalidOrder):
+            ContainerQuery(order="size")
+
+    def test_from_args(self):
+        """
+        Tests dockerprettyps.query.ContainerQuery.from_args() creates a query matching the CLI args.
+
+        """
+        args = CliArgs()
+        args.search = ["postgres"]
+        args.all = True
+        query = ContainerQuery.from_args(args)
+        assert query.options.search == ["postgres"]
+        assert query.options.all
+
+    def test_run(self):
+        """
+        Tests dockerprettyps.query.ContainerQuery.run() filters and orders a snapshot, keeping the totals.
+
+        """
+        query = ContainerQuery(all=True, where="image~alpine-sshd", order="-name")
+        result = query.run(SNAPSHOT)
+        assert [c.name for c in result.containers] == ["alpine-sshd2", "alpine-sshd"]
+        assert (result.total_containers, result.total_running_containers, result.num_matched) == (6, 5, 2)
+
+        query = ContainerQuery(order="name", limit=2, offset=1)
+        result = query.run(SNAPSHOT)
+        assert [c.name for c in result.containers] == [
+            "badactorservices_bad-actor-services-data_1", "badactorservices_bad-actor-services_1"]
+        assert result.num_matched == 5
+
+    def test_run_fetches(self, tmp_path, monkeypatch):
+        """
+        Tests dockerprettyps.query.ContainerQuery.run() fetches from Docker when not given a snapshot.
+
+        """
+        socket_path = str(tmp_path / "docker.sock")
+        monkeypatch.setenv("DOCKER_HOST", "unix://%s" % socket_path)
+        routes = {
+            "/containers/json": docker_api_data.api_containers,
+            "/info": docker_api_data.api_info,
+        }
+        with FakeEngine(socket_path, routes):
+            result = ContainerQuery(engine="api", search="postgres").run()
+            assert [c.name for c in result.containers] == ["some-postgres"]
+            assert result.total_containers == 5012
+
+    def test_render(self):
+        """
+        Tests dockerprettyps.query.ContainerQuery.render() returns the CLI's output as a string.
+
+        """
+        query = ContainerQuery(search="postgres", include="n")
+        result = query.run(SNAPSHOT)
+
+        pretty = query.render(result)
+        assert pretty.startswith('Currently running containers with: "postgres"')
+        assert "42df45bdc8b3" in pretty
+
+        table = query.render(result, "table", max_width=40)
+        assert "CONTAINER ID" in table
+
+        assert json.loads(query.render(result, "json"))["total_containers"] == 1
+
+        with pytest.raises(ValueError):
+            query.render(result, "yaml")
+
+# End File docker-pretty-ps/tests/test_query.py
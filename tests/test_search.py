@@ -0,0 +1,64 @@
+"""Unit Tests for docker-pretty-ps search
+
+"""
+from dockerprettyps import search
+
+
+class TestSearch(object):
+
+    def test_matches(self):
+        """
+        Tests dockerprettyps.search.SearchIndex.matches() finds names with any of the phrases in them.
+
+        """
+        index = search.SearchIndex(["post", "nginx"])
+        assert index.matches("some-postgres")
+        assert index.matches("nginx-proxy")
+        assert not index.matches("alpine-sshd")
+
+        # Phrases are plain text, not regex.
+        assert not search.SearchIndex(["a.c"]).matches("abc")
+        assert search.SearchIndex(["a.c"]).matches("a.c")
+
+        # An empty phrase matches everything, like the old substring check did.
+        assert search.SearchIndex(["nope", ""]).matches("alpine-sshd")
+
+    def test_spans(self):
+        """
+        Tests dockerprettyps.search.SearchIndex.spans() finds every match, merging overlapping ones.
+
+        """
+        index = search.SearchIndex(["post", "gres"])
+        assert index.spans("some-postgres") == [(5, 13)]
+        assert index.spans("alpine-sshd") == []
+
+        index = search.SearchIndex(["ss", "sshd"])
+        assert index.spans("alpine-sshd-sshd2") == [(7, 11), (12, 16)]
+
+        index = search.SearchIndex(["ab", "bc"])
+        assert index.spans("xabcx") == [(1, 4)]
+
+        index = search.SearchIndex(["a"])
+        assert index.spans("banana") == [(1, 2), (3, 4), (5, 6)]
+
+    def test_spans_cache(self, monkeypatch):
+        """
+        Tests dockerprettyps.search.SearchIndex.spans() remembers the spans of only the most recent names.
+
+        """
+        monkeypatch.setattr("dockerprettyps.search.MAX_CACHED_SPANS", 3)
+        index = search.SearchIndex(["web"])
+        for i in range(10):
+            assert index.spans("web-%s" % i) == [(0, 3)]
+        assert list(index._spans) == ["web-7", "web-8", "web-9"]
+
+    def test_search_index(self):
+        """
+        Tests dockerprettyps.search.search_index() compiles phrases only once.
+
+        """
+        index = search.search_index(("post", "nginx"))
+        assert search.search_index(("post", "nginx")) is index
+        assert search.search_index(("post",)) is not index
+
+# End File docker-pretty-ps/tests/test_search.py
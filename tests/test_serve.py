@@ -0,0 +1,167 @@
+"""Unit Tests for docker-pretty-ps --serve daemon
+
+"""
+import os
+import signal
+import subprocess
+import sys
+import threading
+
+from dockerprettyps import client
+from dockerprettyps import serve
+
+from .data import docker_api_data
+from .data.cli_args import CliArgs
+from .data.fake_engine import FakeEngine
+
+# Runs the --serve daemon, against a Docker which isn't there.
+RUN_SERVER_CODE = """
+import sys
+import dockerprettyps
+sys.argv = ["docker-pretty-ps", "--serve", "--socket", sys.argv[1]]
+dockerprettyps.run_cli()
+"""
+
+
+class TestServe(object):
+
+    def test_query_server(self, tmp_path, monkeypatch, capsys):
+        """
+        Tests dockerprettyps.serve.QueryServer answers clients from a warm snapshot, until an event marks it stale.
+
+        """
+        docker_socket = str(tmp_path / "docker.sock")
+        serve_socket = str(tmp_path / "serve.sock")
+        monkeypatch.setenv("DOCKER_HOST", "unix://%s" % docker_socket)
+        routes = {
+            "/containers/json": docker_api_data.api_containers,
+            "/info": docker_api_data.api_info,
+        }
+        args = CliArgs()
+        args.socket = serve_socket
+        with FakeEngine(docker_socket, routes) as fake:
+            server = serve.QueryServer(serve_socket, args)
+            thread = threading.Thread(target=server.serve_forever, kwargs={"poll_interval": 0.05})
+            thread.daemon = True
+            thread.start()
+            try:
+                argv = ["-a", "-e", "api", "-s", "--socket", serve_socket]
+                assert client.run_client(argv, args) == 0
+                output = capsys.readouterr().out
+                assert output.startswith("All docker containers\n")
+                assert "some-postgres" in output
+
+                assert client.run_client(argv, args) == 0
+                assert capsys.readouterr().out == output
+                assert len(fake.requests) == 1
+
+                # Docker events mark the snapshots as stale.
+                server.generation += 1
+                assert client.run_client(argv, args) == 0
+                assert len(fake.requests) == 2
+
+                # Errors are printed and exited with, just like running directly.
+                assert client.run_client(["-o", "size", "--socket", serve_socket], args) == 1
+                assert "Invalid --order" in capsys.readouterr().out
+            finally:
+                server.shutdown()
+                server.server_close()
+
+    def test_run_server_terminated(self, tmp_path):
+        """
+        Tests dockerprettyps.serve.run_server() removes it's socket when the daemon is stopped with a SIGTERM.
+
+        """
+        serve_socket = str(tmp_path / "serve.sock")
+        env = dict(os.environ, DOCKER_HOST="unix://%s" % (tmp_path / "docker.sock"))
+        daemon = subprocess.Popen(
+            [sys.executable, "-c", RUN_SERVER_CODE, serve_socket],
+            stdout=subprocess.PIPE,
+            env=env)
+        try:
+            assert daemon.stdout.readline().decode("utf-8") == "Serving on %s\n" % serve_socket
+            assert os.path.exists(serve_socket)
+            daemon.send_signal(signal.SIGTERM)
+            assert daemon.wait(timeout=10) == 0
+        finally:
+            if daemon.poll() is None:
+                daemon.kill()
+            daemon.stdout.close()
+        assert not os.path.exists(serve_socket)
+
+    def test__trusted_socket(self, tmp_path, monkeypatch):
+        """
+        Tests dockerprettyps.client._trusted_socket() only trusts sockets we own which no one else can write to.
+
+        """
+        serve_socket = str(tmp_path / "serve.sock")
+        assert not client._trusted_socket(serve_socket)
+
+        server = serve.QueryServer(serve_socket, CliArgs())
+        try:
+            assert client._trusted_socket(serve_socket)
+
+            os.chmod(serve_socket, 0o620)
+            assert not client._trusted_socket(serve_socket)
+            os.chmod(serve_socket, 0o602)
+            assert not client._trusted_socket(serve_socket)
+            os.chmod(serve_socket, 0o644)
+            assert client._trusted_socket(serve_socket)
+
+            monkeypatch.setattr("os.getuid", lambda: os.stat(serve_socket).st_uid + 1)
+            assert not client._trusted_socket(serve_socket)
+        finally:
+            server.server_close()
+
+    def test_default_socket_path(self, tmp_path, monkeypatch):
+        """
+        Tests dockerprettyps.client.default_socket_path() finds the socket from the environment or the temp directory,
+        and that without a user ID to name it by, ie on Windows, there's no daemon to check for.
+
+        """
+        monkeypatch.setenv("DOCKER_PRETTY_PS_SOCKET", "/run/pretty.sock")
+        assert client.default_socket_path() == "/run/pretty.sock"
+
+        monkeypatch.delenv("DOCKER_PRETTY_PS_SOCKET")
+        monkeypatch.setenv("XDG_RUNTIME_DIR", "/run/user/1000")
+        assert client.default_socket_path() == "/run/user/1000/docker-pretty-ps.sock"
+
+        monkeypatch.delenv("XDG_RUNTIME_DIR")
+        monkeypatch.setenv("TMPDIR", str(tmp_path))
+        monkeypatch.setattr("tempfile.tempdir", None)
+        assert client.default_socket_path() == str(tmp_path / ("docker-pretty-ps-%s.sock" % os.getuid()))
+
+        monkeypatch.delattr("os.getuid")
+        assert client.default_socket_path() is None
+        assert client.run_client([], CliArgs()) is None
+
+    def test_answer_other_docker(self, tmp_path, monkeypatch):
+        """
+        Tests dockerprettyps.serve.QueryServer.answer() leaves clients pointed at another Docker, or watching, to run
+        their query themselves.
+
+        """
+        monkeypatch.delenv("DOCKER_CONTEXT", raising=False)
+        server = serve.QueryServer(str(tmp_path / "serve.sock"), CliArgs())
+        try:
+            assert server.answer({"argv": [], "env": {"DOCKER_CONTEXT": "build-01"}}) == {"status": None}
+            assert server.answer({"argv": ["-w"], "env": {}}) == {"status": None}
+        finally:
+            server.server_close()
+
+    def test_run_client_without_daemon(self, tmp_path):
+        """
+        Tests dockerprettyps.client.run_client() falls back to running directly when no daemon is listening.
+
+        """
+        args = CliArgs()
+        args.socket = str(tmp_path / "missing.sock")
+        assert client.run_client([], args) is None
+
+        # A socket left behind by a daemon which is gone.
+        stale = serve.QueryServer(str(tmp_path / "stale.sock"), args)
+        stale.server_close()
+        args.socket = str(tmp_path / "stale.sock")
+        assert client.run_client([], args) is None
+
+# End File docker-pretty-ps/tests/test_serve.py
@@ -0,0 +1,120 @@
+"""Unit Tests for docker-pretty-ps start up
+
+"""
+import os
+import subprocess
+import sys
+
+import dockerprettyps
+from dockerprettyps import lazy
+
+# The most `python -X importtime -c "import dockerprettyps"` may report for the package, in milliseconds, see the
+# README's "Start up time" section.
+IMPORT_BUDGET_MS = 100
+
+# Modules which are only imported by the runs that need them.
+DEFERRED_MODULES = [
+    "argparse",
+    "asyncio",
+    "concurrent.futures",
+    "cProfile",
+    "dockerprettyps.aio",
+    "dockerprettyps.cache",
+    "dockerprettyps.diff",
+    "dockerprettyps.engine",
+    "dockerprettyps.hosts",
+    "dockerprettyps.serve",
+    "dockerprettyps.watch",
+    "dockerprettyps.where",
+    "hashlib",
+    "http.client",
+    "json",
+    "shutil",
+    "socketserver",
+    "subprocess",
+]
+
+# Runs run_cli() with -s and no --serve daemon, stopping short of fetching, and prints the deferred modules it imported.
+RUN_CLI_CODE = """
+import sys
+deferred = sys.argv[1:]
+import dockerprettyps
+dockerprettyps.run = lambda args: None
+sys.argv = ["docker-pretty-ps", "-s"]
+dockerprettyps.run_cli()
+print(",".join(sorted(set(deferred) & set(sys.modules))))
+"""
+
+
+def import_times(code):
+    """
+    Runs python code with -X importtime, getting the cumulative import time of each module it imports.
+
+    """
+    output = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        check=True).stderr.decode("utf-8")
+    times = {}
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        pieces = line[len("import time:"):].split("|")
+        if pieces[1].strip().isdigit():
+            times[pieces[2].strip()] = int(pieces[1])
+    return times
+
+
+class TestStartup(object):
+
+    def test_import_budget(self):
+        """
+        Tests importing dockerprettyps stays within it's import time budget, without importing the modules only some
+        runs need, and that the fast arg scan doesn't import argparse.
+
+        """
+        # The quickest of a few runs, so a busy machine doesn't fail the budget.
+        runs = [import_times("import dockerprettyps; dockerprettyps._fast_args(['-s'])") for _ in range(3)]
+        assert min(times["dockerprettyps"] for times in runs) / 1000 < IMPORT_BUDGET_MS
+        times = runs[0]
+        for module in DEFERRED_MODULES:
+            assert module not in times
+
+    def test_run_cli_imports(self, tmp_path):
+        """
+        Tests dockerprettyps.run_cli() reads -s and checks for a --serve daemon without importing any of the deferred
+        modules.
+
+        """
+        env = dict(os.environ, DOCKER_PRETTY_PS_SOCKET=str(tmp_path / "missing.sock"))
+        output = subprocess.run(
+            [sys.executable, "-c", RUN_CLI_CODE] + DEFERRED_MODULES,
+            stdout=subprocess.PIPE,
+            env=env,
+            check=True).stdout.decode("utf-8")
+        assert output == "\n"
+
+    def test__fast_args(self):
+        """
+        Tests dockerprettyps._fast_args() reads the common args the same as _parsed_args(), leaving anything else to
+        it.
+
+        """
+        for argv in [[], ["-s"], ["--slim"], ["-a", "-s"], ["--all"]]:
+            assert vars(dockerprettyps._fast_args(argv)) == vars(dockerprettyps._parsed_args(argv))
+
+        for argv in [["web"], ["-as"], ["-s", "-i", "p"], ["--table"], ["-h"]]:
+            assert dockerprettyps._fast_args(argv) is None
+
+    def test_lazy_module(self):
+        """
+        Tests dockerprettyps.lazy.LazyModule only imports it's module once an attribute is used.
+
+        """
+        module = lazy.LazyModule("dockerprettyps.errors")
+        assert module._module is None
+        assert module.InvalidWhere is dockerprettyps.errors.InvalidWhere
+        assert module._module is dockerprettyps.errors
+
+# End File docker-pretty-ps/tests/test_startup.py
@@ -0,0 +1,85 @@
+"""Unit Tests for docker-pretty-ps watch mode
+
+"""
+import io
+
+from dockerprettyps import watch
+
+from .data import docker_api_data
+from .data.cli_args import CliArgs
+from .data.fake_engine import FakeEngine
+
+
+class TestWatch(object):
+
+    def test_watcher(self, tmp_path, monkeypatch):
+        """
+        Tests the dockerprettyps.watch.Watcher, making sure events patch just the containers they are about and that
+        renders only rewrite what changed.
+
+        """
+        socket_path = str(tmp_path / "docker.sock")
+        monkeypatch.setenv("DOCKER_HOST", "unix://%s" % socket_path)
+        monkeypatch.setenv("LINES", "200")
+        args = CliArgs()
+        args.all = True
+        args.engine = "api"
+        out = io.StringIO()
+        with FakeEngine(socket_path, {"/containers/json": docker_api_data.api_containers}) as fake:
+            watcher = watch.Watcher(args, out)
+            watcher.load()
+            assert len(watcher.containers) == 3
+            assert (watcher.total_containers, watcher.total_running_containers) == (3, 2)
+
+            watcher.render()
+            first_render = out.getvalue()
+            assert first_render.startswith(watch.CLEAR_SCREEN)
+            assert "some-postgres" in first_render
+
+            # Nothing changed, nothing is written.
+            out.truncate(0)
+            out.seek(0)
+            watcher.render()
+            assert out.getvalue() == ""
+
+            # A health event only re-fetches and re-renders the one container.
+            fake.requests = []
+            event = docker_api_data.api_events[1]
+            assert watcher.handle_event(event)
+            assert len(fake.requests) == 1
+            assert "1a31fcaccf59" not in watcher.blocks
+            assert "42df45bdc8b3" in watcher.blocks
+
+            destroy = dict(event, Action="destroy", timeNano=0)
+            assert watcher.handle_event(destroy)
+            assert "1a31fcaccf59" not in watcher.containers
+            watcher.render()
+            assert "badactorservices" not in "".join(watcher.screen)
+
+            assert not watcher.handle_event({"Type": "container", "Action": "exec_start"})
+
+    def test_watch_events(self, tmp_path, monkeypatch):
+        """
+        Tests the dockerprettyps.watch.watch_events() method reads the engine's event stream.
+
+        """
+        socket_path = str(tmp_path / "docker.sock")
+        monkeypatch.setenv("DOCKER_HOST", "unix://%s" % socket_path)
+        args = CliArgs()
+        args.engine = "api"
+        with FakeEngine(socket_path, {}, {"/events": docker_api_data.api_events}) as fake:
+            events = list(watch.watch_events(args, 1547521600))
+            assert events == docker_api_data.api_events
+            assert "since=1547521600" in fake.requests[0]
+
+    def test_screen_diff(self):
+        """
+        Tests the dockerprettyps.watch.screen_diff() method only rewrites lines which changed.
+
+        """
+        assert watch.screen_diff(["a", "b"], ["a", "b"]) == ""
+        assert watch.screen_diff(["a", "b"], ["a", "c"]) == "\033[2;1Hc" + watch.CLEAR_LINE
+        assert watch.screen_diff(["a", "b", "c"], ["a"]) == "\033[2;1H" + watch.CLEAR_BELOW
+        assert watch.screen_diff([], ["a"]) == "\033[1;1Ha" + watch.CLEAR_LINE
+
+# End File docker-pretty-ps/tests/test_watch.py
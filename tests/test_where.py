@@ -0,0 +1,80 @@
+"""Unit Tests for docker-pretty-ps --where expressions
+
+"""
+from datetime import datetime
+
+import pytest
+
+from dockerprettyps import errors
+from dockerprettyps import where
+
+from .data import docker_ps_data as test_ps_data
+
+NOW = datetime(2019, 1, 19, 3, 6, 40)
+
+
+def matching_names(expression, containers=None):
+    """
+    Gets the names of the fixture containers matching an expression.
+
+    """
+    predicate = where.compile_where(expression, NOW)
+    return [c.name for c in (containers or test_ps_data.ps_containers) if predicate(c)]
+
+
+class TestWhere(object):
+
+    def test_tokenize(self):
+        """
+        Tests dockerprettyps.where.tokenize() splits expressions into fields, operators, values and parentheses.
+
+        """
+        assert where.tokenize("image~postgres and age>=2d") == [
+            ("word", "image"), ("op", "~"), ("word", "postgres"),
+            ("word", "and"),
+            ("word", "age"), ("op", ">="), ("word", "2d")]
+        assert where.tokenize('not (status="Up 4 days")') == [
+            ("word", "not"), ("(", "("), ("word", "status"), ("op", "="), ("text", "Up 4 days"), (")", ")")]
+
+    def test_compile_where(self):
+        """
+        Tests dockerprettyps.where.compile_where() creates predicates for each field type, joined with and, or and not.
+
+        """
+        assert matching_names("image~postgres") == ["some-postgres"]
+        assert matching_names("image=danielguerra/alpine-sshd and running=false") == ["alpine-sshd2"]
+        assert matching_names("name=nginx-proxy or port=5432") == ["nginx-proxy", "some-postgres"]
+        assert matching_names("port=22 and not name~2") == ["alpine-sshd"]
+        assert matching_names("not (port>100 or port=80)") == ["badactorservices_bad-actor-services-data_1"]
+        assert matching_names("age>15d") == ["alpine-sshd2"]
+        assert matching_names("age<1w and image!~bad and port!=443") == ["some-postgres", "alpine-sshd"]
+        assert len(matching_names("status='Up 4 days'")) == 3
+
+        containers = [
+            test_ps_data.ps_containers[3].replace(status="Up 3 weeks (unhealthy)"),
+            test_ps_data.ps_containers[4].replace(status="Up 4 months (healthy)"),
+            test_ps_data.ps_containers[0]]
+        assert matching_names("health=unhealthy and image~postgres and port=5432", containers) == ["some-postgres"]
+        assert matching_names("health=none", containers) == ["badactorservices_bad-actor-services_1"]
+
+    def test_compile_where_invalid(self):
+        """
+        Tests dockerprettyps.where.compile_where() raises InvalidWhere for expressions it can't use.
+
+        """
+        for expression in ["", "size>2", "name", "name=", "(name=a", "name=a b", "port=http", "age=2d", "age>2y",
+                           "running=maybe", "image>a"]:
+            with pytest.raises(errors.InvalidWhere):
+                where.compile_where(expression)
+
+    def test_port_ranges(self):
+        """
+        Tests dockerprettyps.where.port_ranges() finds the public and private ports in Docker's port formats.
+
+        """
+        assert where.port_ranges("80/tcp") == ((80, 80),)
+        assert where.port_ranges("10.138.44.203:5432->5432/tcp") == ((5432, 5432), (5432, 5432))
+        assert where.port_ranges(":::8080->80/tcp") == ((8080, 8080), (80, 80))
+        assert where.port_ranges("0.0.0.0:8000-8001->8000-8001/tcp") == ((8000, 8001), (8000, 8001))
+
+# End File docker-pretty-ps/tests/test_where.py